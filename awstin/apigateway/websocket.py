@@ -1,5 +1,7 @@
 import boto3
 
+from awstin.tracing import trace
+
 
 class Websocket:
     """
@@ -16,6 +18,7 @@ class Websocket:
         endpoint_url = f"https://{domain_name}"
         if stage:
             endpoint_url += f"/{stage}"
+        self.endpoint_url = endpoint_url
         self.api_client = boto3.client(
             "apigatewaymanagementapi",
             endpoint_url=endpoint_url,
@@ -25,7 +28,15 @@ class Websocket:
         """
         Send a message to the user
         """
-        self.api_client.post_to_connection(
-            Data=message,
-            ConnectionId=connection_id,
-        )
+        with trace(
+            "apigateway.post_to_connection",
+            **{
+                "rpc.system": "aws-api",
+                "rpc.service": "ApiGatewayManagementApi",
+                "server.address": self.endpoint_url,
+            },
+        ):
+            self.api_client.post_to_connection(
+                Data=message,
+                ConnectionId=connection_id,
+            )
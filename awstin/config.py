@@ -4,8 +4,26 @@ from botocore.client import Config
 
 from awstin.constants import AWS_REGION
 
+#: Default number of worker threads awstin uses for concurrent requests (e.g.
+#: parallel scans and query fan-out)
+DEFAULT_CONCURRENCY = 16
 
-def aws_config(timeout=5.0, max_retries=3, endpoint=None):
+#: Default size of connection pools, so that awstin's own workers never wait
+#: on a connection. Worker pools are nested at most two deep: query fan-out
+#: feeding the batch gets of prefetched references, or delete_where's reads
+#: feeding its deletes. A further worker backfills index reads.
+DEFAULT_MAX_POOL_CONNECTIONS = 2 * DEFAULT_CONCURRENCY + 1
+
+
+def aws_config(
+    timeout=5.0,
+    max_retries=3,
+    endpoint=None,
+    max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+    tcp_keepalive=False,
+    read_timeout=60.0,
+    retry_mode=None,
+):
     """
     Create kwargs used to configure a boto3 client or resource.
 
@@ -18,6 +36,20 @@ def aws_config(timeout=5.0, max_retries=3, endpoint=None):
     endpoint : str or None, optional
         Endpoint for the AWS service for testing. If not provided, the
         AWS_REGION environment variable will be used to specify the AWS region
+    max_pool_connections : int, optional
+        Maximum number of connections kept in the connection pool (default
+        ``DEFAULT_MAX_POOL_CONNECTIONS``)
+    tcp_keepalive : bool, optional
+        Whether to enable TCP keepalive on pooled connections (default False)
+    read_timeout : float, optional
+        Timeout for reading from a connection (default 60.0)
+    retry_mode : str, optional
+        botocore retry mode, one of "legacy", "standard" or "adaptive". By
+        default, botocore's configured mode is used: "legacy", unless set by
+        the AWS_RETRY_MODE environment variable or the AWS config file.
+        "standard" retries more errors with jittered backoff, and "adaptive"
+        additionally rate limits the client when the service throttles
+        requests.
 
     Returns
     -------
@@ -28,7 +60,15 @@ def aws_config(timeout=5.0, max_retries=3, endpoint=None):
     ------
     EnvironmentError
         If the AWS_REGION environment variable is required but is not set
+    ValueError
+        If the retry mode is not recognized
     """
+    retries = {"max_attempts": max_retries}
+    if retry_mode is not None:
+        if retry_mode not in ("legacy", "standard", "adaptive"):
+            raise ValueError(f"Unknown retry mode {retry_mode!r}")
+        retries["mode"] = retry_mode
+
     region_name = os.environ.get(AWS_REGION)
     if endpoint:
         kwargs = {"endpoint_url": endpoint}
@@ -42,7 +82,10 @@ def aws_config(timeout=5.0, max_retries=3, endpoint=None):
 
     config = Config(
         connect_timeout=timeout,
-        retries={"max_attempts": max_retries},
+        read_timeout=read_timeout,
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=tcp_keepalive,
+        retries=retries,
     )
 
     return {"config": config, **kwargs}
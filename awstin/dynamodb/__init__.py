@@ -1,4 +1,48 @@
-__all__ = ["DynamoDB", "Table", "DynamoModel", "Attr", "Key", "NOT_SET", "list_append"]
+__all__ = [
+    "DynamoDB",
+    "Table",
+    "DynamoModel",
+    "Attr",
+    "Key",
+    "Reference",
+    "NOT_SET",
+    "list_append",
+    "param",
+    "compile_condition",
+    "CapacityRateLimiter",
+    "MetricsRegistry",
+    "SlowOperationLogger",
+    "ContentHashFilter",
+    "BufferedTable",
+    "CounterAggregator",
+    "PolymorphicModel",
+    "TransactWrite",
+    "TransactionCanceled",
+    "ConditionCheckFailed",
+    "UnprocessedRequests",
+]
 
-from .orm import NOT_SET, Attr, DynamoModel, Key, list_append  # noqa
+from .buffered import BufferedTable  # noqa
+from .conditions import compile_condition  # noqa
+from .counters import CounterAggregator  # noqa
+from .errors import (  # noqa
+    ConditionCheckFailed,
+    TransactionCanceled,
+    UnprocessedRequests,
+)
+from .hashing import ContentHashFilter  # noqa
+from .metrics import MetricsRegistry  # noqa
+from .orm import (  # noqa
+    NOT_SET,
+    Attr,
+    DynamoModel,
+    Key,
+    Reference,
+    list_append,
+    param,
+)
+from .polymorphic import PolymorphicModel  # noqa
+from .ratelimit import CapacityRateLimiter  # noqa
+from .slowlog import SlowOperationLogger  # noqa
 from .table import DynamoDB, Table  # noqa
+from .transactions import TransactWrite  # noqa
@@ -0,0 +1,157 @@
+import datetime
+import re
+from decimal import Decimal
+
+#: Label format of each time bucket granularity
+BUCKET_FORMATS = {
+    "minute": "%Y-%m-%dT%H:%M",
+    "hour": "%Y-%m-%dT%H",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+}
+
+# ISO 8601 date or date and time, with an optional UTC offset or "Z"
+_ISO_FORMAT = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?"
+    r"(Z|[+-]\d{2}:?\d{2})?)?"
+)
+
+_STEPS = {
+    "minute": datetime.timedelta(minutes=1),
+    "hour": datetime.timedelta(hours=1),
+    "day": datetime.timedelta(days=1),
+}
+
+
+def parse_iso_datetime(value):
+    """
+    Parse an ISO 8601 date or date and time, such as
+    ``"2021-03-04T05:06:07.5Z"`` or ``"2021-03-04 05:06+02:00"``. Unlike
+    ``datetime.datetime.fromisoformat``, this is available on every supported
+    Python version and accepts a trailing "Z" for UTC.
+
+    Parameters
+    ----------
+    value : str
+        ISO 8601 string
+
+    Returns
+    -------
+    datetime.datetime
+        Naive if the string has no UTC offset
+    """
+    match = _ISO_FORMAT.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"Invalid ISO 8601 time {value!r}")
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+
+    tzinfo = None
+    if offset == "Z":
+        tzinfo = datetime.timezone.utc
+    elif offset is not None:
+        sign = -1 if offset[0] == "-" else 1
+        digits = offset[1:].replace(":", "")
+        tzinfo = datetime.timezone(
+            sign * datetime.timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+        )
+
+    return datetime.datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        int((fraction or "0").ljust(6, "0")),
+        tzinfo=tzinfo,
+    )
+
+
+def to_datetime(value):
+    """
+    UTC datetime of a time attribute value
+
+    Parameters
+    ----------
+    value : int or float or Decimal or str or datetime.datetime
+        Seconds since the epoch, or an ISO 8601 string. Times without a
+        timezone are taken as UTC.
+
+    Returns
+    -------
+    datetime.datetime
+    """
+    if isinstance(value, (int, float, Decimal)):
+        return datetime.datetime.fromtimestamp(float(value), tz=datetime.timezone.utc)
+    if isinstance(value, str):
+        value = parse_iso_datetime(value)
+    if not isinstance(value, datetime.datetime):
+        raise TypeError(f"Can't bucket time value {value!r}")
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+
+def _bucket_start(moment, granularity):
+    if granularity == "minute":
+        return moment.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_bucket(moment, granularity):
+    if granularity in _STEPS:
+        return moment + _STEPS[granularity]
+    if moment.month == 12:
+        return moment.replace(year=moment.year + 1, month=1)
+    return moment.replace(month=moment.month + 1)
+
+
+def bucket_label(value, granularity):
+    """
+    Label of the time bucket containing a time
+
+    Parameters
+    ----------
+    value : int or float or Decimal or str or datetime.datetime
+        Time, see ``to_datetime``
+    granularity : str
+        "minute", "hour", "day" or "month"
+
+    Returns
+    -------
+    str
+    """
+    return to_datetime(value).strftime(BUCKET_FORMATS[granularity])
+
+
+def bucket_labels(start, end, granularity):
+    """
+    Labels of the time buckets covering a time range, in time order
+
+    Parameters
+    ----------
+    start, end : int or float or Decimal or str or datetime.datetime
+        Start and end of the range (inclusive), see ``to_datetime``
+    granularity : str
+        "minute", "hour", "day" or "month"
+
+    Returns
+    -------
+    list of str
+    """
+    start = to_datetime(start)
+    end = to_datetime(end)
+    if start > end:
+        return []
+
+    moment = _bucket_start(start, granularity)
+    labels = []
+    while moment <= end:
+        labels.append(moment.strftime(BUCKET_FORMATS[granularity]))
+        moment = _next_bucket(moment, granularity)
+    return labels
@@ -0,0 +1,182 @@
+import atexit
+import logging
+import threading
+import weakref
+
+from awstin.dynamodb.table import BATCH_WRITE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Buffers that aren't closed, flushed at interpreter exit. Held weakly, so
+# buffers that are never closed don't live as long as the process.
+_open_buffers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_buffers():
+    for buffer in list(_open_buffers):
+        try:
+            buffer.flush()
+        except Exception:
+            logger.exception(
+                "Flush of buffered writes to %s at exit failed", buffer.table.name
+            )
+
+
+class BufferedTable:
+    """
+    Write-behind buffer in front of a :class:`awstin.dynamodb.Table`.
+
+    Puts and deletes are collected in memory and written with BatchWriteItem.
+    Only the last write to each primary key is kept, so repeated writes to the
+    same keys cost a single write per flush. The buffer is flushed once it
+    holds ``max_items`` keys, once its oldest write is ``max_age`` seconds
+    old, on ``flush()``, on leaving a ``with`` block and at interpreter exit.
+
+    Buffers aren't kept alive to be flushed at exit, so writes to a buffer
+    that is dropped without being closed are lost. Writes are not durable
+    until flushed, and a failed flush raises in the
+    thread that triggered it. The buffer is thread-safe.
+    """
+
+    def __init__(self, table, max_items=BATCH_WRITE_SIZE, max_age=1.0):
+        """
+        Parameters
+        ----------
+        table : Table
+            Table to write to
+        max_items : int, optional
+            Number of buffered keys triggering a flush (default 25, one
+            BatchWriteItem request)
+        max_age : float or None, optional
+            Seconds after the first buffered write at which the buffer is
+            flushed in the background (default 1.0). None disables age-based
+            flushes.
+        """
+        self.table = table
+        self.max_items = max_items
+        self.max_age = max_age
+
+        self._key_names = table._primary_key_names()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffer = {}
+        self._timer = None
+        self._closed = False
+
+        _open_buffers.add(self)
+
+    def put_item(self, item):
+        """
+        Buffer a put, replacing any buffered write to the same key
+
+        Parameters
+        ----------
+        item : DynamoModel
+            The item to put in the table
+        """
+        data = item.serialize()
+        key = tuple(data[name] for name in self._key_names)
+        self._add(key, {"PutRequest": {"Item": data}})
+
+    def delete_item(self, key):
+        """
+        Buffer a delete, replacing any buffered write to the same key. Items
+        with a write-sharded partition key are deleted from every shard they
+        may be stored in.
+
+        Parameters
+        ----------
+        key : Any
+            Primary key of the entry to delete, specified as a hash key value,
+            composite key tuple, or a dict
+        """
+        for stored_key in self.table._read_keys(self.table._get_primary_key(key)):
+            key = tuple(stored_key[name] for name in self._key_names)
+            self._add(key, {"DeleteRequest": {"Key": stored_key}})
+
+    def _add(self, key, request):
+        if self._closed:
+            raise ValueError("Write to a closed BufferedTable")
+
+        with self._lock:
+            self._buffer.pop(key, None)
+            self._buffer[key] = request
+            full = len(self._buffer) >= self.max_items
+            if not full and self._timer is None and self.max_age is not None:
+                self._timer = threading.Timer(self.max_age, self._flush_expired)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            self.flush()
+
+    def __len__(self):
+        """
+        Number of keys with buffered writes
+        """
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self):
+        """
+        Write all buffered writes to the table
+
+        Returns
+        -------
+        int
+            Number of writes made
+        """
+        # One flush at a time, so writes to a key are applied in order
+        with self._flush_lock:
+            with self._lock:
+                buffer = self._buffer
+                self._buffer = {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            requests = list(buffer.items())
+            record = self.table._operation_record("flush")
+            try:
+                for start in range(0, len(requests), BATCH_WRITE_SIZE):
+                    chunk = requests[start : start + BATCH_WRITE_SIZE]
+                    try:
+                        self.table._batch_write(
+                            [request for _, request in chunk], record
+                        )
+                    except BaseException:
+                        self._requeue(requests[start:])
+                        raise
+            finally:
+                self.table._finish(record)
+
+        return len(requests)
+
+    def _requeue(self, requests):
+        # Keep unwritten requests, unless a newer write to the key was buffered
+        with self._lock:
+            for key, request in requests:
+                self._buffer.setdefault(key, request)
+
+    def _flush_expired(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(
+                "Background flush of buffered writes to %s failed", self.table.name
+            )
+
+    def close(self):
+        """
+        Flush buffered writes and stop accepting new ones
+        """
+        self._closed = True
+        _open_buffers.discard(self)
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,273 @@
+import re
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+
+from awstin.dynamodb.orm import (
+    bind_parameters,
+    parse_attribute_path,
+    serialize_value,
+    split_parameters,
+)
+
+# Placeholder prefixes of a compiled condition. Conditions are compiled as
+# the first condition of a request, and renumbered when added to a request
+# after others, so placeholders stay short and don't clash.
+_NAME_PREFIX = "#c{}n"
+_VALUE_PREFIX = ":c{}v"
+
+_PLACEHOLDER_NUMBER = re.compile(r"[#:]c(\d+)[nv]")
+
+
+def _renumber(text, number):
+    """
+    Placeholders of a compiled condition in text, renumbered for the given
+    condition of a request
+    """
+    return text.replace(_NAME_PREFIX.format(0), _NAME_PREFIX.format(number)).replace(
+        _VALUE_PREFIX.format(0), _VALUE_PREFIX.format(number)
+    )
+
+
+def _next_condition_number(request_kwargs):
+    """
+    Number of the next compiled condition added to request kwargs
+    """
+    numbers = [
+        int(match.group(1))
+        for key in ("ExpressionAttributeNames", "ExpressionAttributeValues")
+        for placeholder in request_kwargs.get(key, {})
+        for match in [_PLACEHOLDER_NUMBER.match(placeholder)]
+        if match is not None
+    ]
+    return max(numbers) + 1 if numbers else 0
+
+
+class CompiledCondition:
+    """
+    A condition rendered once into expression text and placeholder maps.
+
+    Created by ``compile_condition``. Values may be ``param`` placeholders,
+    bound per call with ``bind``. A compiled condition can be passed to
+    :class:`awstin.dynamodb.Table` methods anywhere a condition is accepted.
+    """
+
+    def __init__(self, condition):
+        """
+        Parameters
+        ----------
+        condition : ConditionBase
+            Condition built with awstin's query syntax
+        """
+        if not isinstance(condition, ConditionBase):
+            raise TypeError(f"Expected a condition, got {condition!r}")
+
+        self._name_prefix = _NAME_PREFIX.format(0)
+        self._value_prefix = _VALUE_PREFIX.format(0)
+        self._name_placeholders = {}
+
+        #: Attribute name placeholder map
+        self.attribute_names = {}
+        attribute_values = {}
+
+        #: Expression text
+        self.expression = self._render(condition, attribute_values)
+
+        self._constant_values, self._parameter_placeholders = split_parameters(
+            attribute_values
+        )
+
+        #: Names of the parameters that must be bound
+        self.parameters = frozenset(name for _, name in self._parameter_placeholders)
+
+    def _render(self, condition, attribute_values):
+        expression = condition.get_expression()
+        rendered = [
+            self._render_component(value, attribute_values, condition)
+            for value in expression["values"]
+        ]
+        return expression["format"].format(*rendered, operator=expression["operator"])
+
+    def _render_component(self, value, attribute_values, condition):
+        if isinstance(value, ConditionBase):
+            return self._render(value, attribute_values)
+        elif isinstance(value, AttributeBase):
+            return self._render_name(value.name)
+        elif condition.has_grouped_values:
+            placeholders = [self._render_value(v, attribute_values) for v in value]
+            return "(" + ", ".join(placeholders) + ")"
+        else:
+            return self._render_value(value, attribute_values)
+
+    def _render_name(self, attribute_name):
+        rendered = ""
+        for segment in parse_attribute_path(attribute_name):
+            if isinstance(segment, int):
+                rendered += f"[{segment}]"
+                continue
+
+            placeholder = self._name_placeholders.get(segment)
+            if placeholder is None:
+                placeholder = self._name_prefix + str(len(self._name_placeholders))
+                self._name_placeholders[segment] = placeholder
+                self.attribute_names[placeholder] = segment
+            rendered += "." + placeholder if rendered else placeholder
+        return rendered
+
+    def _render_value(self, value, attribute_values):
+        placeholder = self._value_prefix + str(len(attribute_values))
+        attribute_values[placeholder] = serialize_value(value)
+        return placeholder
+
+    def bind(self, **values):
+        """
+        Bind values to the parameters of the condition
+
+        Parameters
+        ----------
+        **values : dict of (str, Any)
+            Value of each parameter
+
+        Returns
+        -------
+        BoundCondition
+
+        Raises
+        ------
+        ValueError
+            If a parameter has no value, or a value is given for an unknown
+            parameter
+        """
+        return BoundCondition(
+            self,
+            bind_parameters(
+                self._constant_values,
+                self._parameter_placeholders,
+                self.parameters,
+                values,
+            ),
+        )
+
+    def __str__(self):
+        return self.expression
+
+
+class BoundCondition:
+    """
+    A compiled condition with values bound to its parameters
+    """
+
+    def __init__(self, compiled_condition, attribute_values):
+        """
+        Parameters
+        ----------
+        compiled_condition : CompiledCondition
+            The compiled condition
+        attribute_values : dict of (str, Any)
+            Value placeholder map
+        """
+        self.compiled_condition = compiled_condition
+        self.attribute_values = attribute_values
+
+    @property
+    def expression(self):
+        """
+        Expression text
+        """
+        return self.compiled_condition.expression
+
+    @property
+    def attribute_names(self):
+        """
+        Attribute name placeholder map
+        """
+        return self.compiled_condition.attribute_names
+
+    def _numbered(self, number):
+        """
+        Expression text and placeholder maps, with the placeholders of the
+        given condition of a request
+        """
+        if number == 0:
+            return self.expression, self.attribute_names, self.attribute_values
+        return (
+            _renumber(self.expression, number),
+            {_renumber(k, number): v for k, v in self.attribute_names.items()},
+            {_renumber(k, number): v for k, v in self.attribute_values.items()},
+        )
+
+    def __str__(self):
+        return self.expression
+
+
+def compile_condition(condition):
+    """
+    Render a condition built with awstin's query syntax once, for use in many
+    requests.
+
+    Values may be left as ``param`` placeholders and bound per call, e.g.
+
+    ``by_year = compile_condition(Movie.year == param("year"))``
+
+    ``table.query(by_year.bind(year=1985))``
+
+    Parameters
+    ----------
+    condition : ConditionBase
+        A key condition, filter or condition expression
+
+    Returns
+    -------
+    CompiledCondition
+    """
+    return CompiledCondition(condition)
+
+
+def add_expressions(request_kwargs, **expressions):
+    """
+    Add condition expressions to request kwargs, expanding compiled
+    conditions into expression text and placeholders. Conditions are compiled
+    rather than left to boto3, which renders them with a builder shared by
+    every request of a client and so isn't safe to use from several threads.
+    The placeholders of each condition are numbered in the order conditions
+    are added to the request.
+
+    Parameters
+    ----------
+    request_kwargs : dict
+        Request kwargs, modified in place. Placeholder maps already present
+        are copied rather than modified.
+    **expressions : dict of (str, Any)
+        Expressions by request parameter name, e.g. FilterExpression. None
+        values are skipped.
+
+    Raises
+    ------
+    ValueError
+        If a compiled condition has unbound parameters
+    """
+    number = _next_condition_number(request_kwargs)
+    for name, expression in expressions.items():
+        if expression is None:
+            continue
+
+        if isinstance(expression, ConditionBase):
+            expression = CompiledCondition(expression)
+        if isinstance(expression, CompiledCondition):
+            expression = expression.bind()
+
+        if isinstance(expression, BoundCondition):
+            text, attribute_names, attribute_values = expression._numbered(number)
+            number += 1
+            request_kwargs[name] = text
+            if attribute_names:
+                request_kwargs["ExpressionAttributeNames"] = {
+                    **request_kwargs.get("ExpressionAttributeNames", {}),
+                    **attribute_names,
+                }
+            if attribute_values:
+                request_kwargs["ExpressionAttributeValues"] = {
+                    **request_kwargs.get("ExpressionAttributeValues", {}),
+                    **attribute_values,
+                }
+        else:
+            request_kwargs[name] = expression
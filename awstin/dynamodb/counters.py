@@ -0,0 +1,278 @@
+import atexit
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+from awstin.config import DEFAULT_CONCURRENCY
+from awstin.dynamodb.orm import combine_operators
+from awstin.dynamodb.ratelimit import WRITE
+from awstin.dynamodb.utils import to_decimal
+
+logger = logging.getLogger(__name__)
+
+# Aggregators that aren't closed, flushed at interpreter exit. Held weakly, so
+# aggregators that are never closed don't live as long as the process.
+_open_aggregators = weakref.WeakSet()
+
+# Errors of updates that DynamoDB rejected without applying them, so their
+# deltas can be flushed again
+_REJECTED_ERRORS = frozenset(
+    [
+        "ConditionalCheckFailedException",
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "ThrottlingException",
+        "TransactionConflictException",
+    ]
+)
+
+
+@atexit.register
+def _flush_open_aggregators():
+    for aggregator in list(_open_aggregators):
+        try:
+            aggregator.flush()
+        except Exception:
+            logger.exception(
+                "Flush of counters on %s at exit failed", aggregator.table.name
+            )
+
+
+def _rejected(error):
+    """
+    Whether an update failed with an error meaning it wasn't applied
+    """
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") in _REJECTED_ERRORS
+    )
+
+
+class CounterAggregator:
+    """
+    Client-side aggregation of counter increments.
+
+    Deltas passed to ``add`` are summed in memory per (key, attribute), and
+    flushed as one UpdateItem per key with an ADD clause per attribute. The
+    aggregator is flushed once ``max_keys`` keys have pending deltas, every
+    ``flush_interval`` seconds while deltas are pending, on ``flush()``, on
+    leaving a ``with`` block and at interpreter exit.
+
+    For tables with a write-sharded partition key, each flush writes a key's
+    deltas to one of its shards; read totals with ``Table.counter_value``.
+
+    Deltas are lost if the process dies before they are flushed, or the
+    aggregator is dropped without being closed. Deltas of
+    updates that were throttled or otherwise rejected are kept pending for
+    the next flush. Deltas of updates that failed in any other way are
+    dropped and logged, as they were either invalid or may already have been
+    applied. The aggregator is thread-safe.
+    """
+
+    def __init__(
+        self,
+        table,
+        flush_interval=1.0,
+        max_keys=1000,
+        concurrency=DEFAULT_CONCURRENCY,
+    ):
+        """
+        Parameters
+        ----------
+        table : Table
+            Table holding the counters
+        flush_interval : float or None, optional
+            Seconds after the first pending delta at which deltas are flushed
+            in the background (default 1.0). None disables interval flushes.
+        max_keys : int, optional
+            Maximum number of keys with pending deltas (default 1000). Adding
+            to a new key beyond this flushes first.
+        concurrency : int, optional
+            Number of UpdateItem requests made in parallel by a flush (default
+            ``DEFAULT_CONCURRENCY``)
+        """
+        self.table = table
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+        self.concurrency = concurrency
+
+        self._key_names = table._primary_key_names()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # {key values: (primary key, {attribute path: (attribute, delta)})}
+        self._pending = {}
+        self._timer = None
+        self._closed = False
+
+        _open_aggregators.add(self)
+
+    def add(self, key, attribute, delta=1):
+        """
+        Add to a counter
+
+        Parameters
+        ----------
+        key : Any
+            Primary key of the item, specified as a hash key value, composite
+            key tuple, or a dict
+        attribute : Attr
+            Counter attribute of the data model, e.g. ``Movie.views``
+        delta : int or float, optional
+            Amount to add (default 1)
+        """
+        if self._closed:
+            raise ValueError("Add to a closed CounterAggregator")
+
+        primary_key = self.table._get_primary_key(key)
+        key = tuple(primary_key[name] for name in self._key_names)
+        delta = to_decimal(delta)
+
+        while True:
+            with self._lock:
+                if key in self._pending or len(self._pending) < self.max_keys:
+                    counters = self._pending.setdefault(key, (primary_key, {}))[1]
+                    path = attribute._path
+                    if path in counters:
+                        counters[path] = (attribute, counters[path][1] + delta)
+                    else:
+                        counters[path] = (attribute, delta)
+                    self._start_timer()
+                    return
+            self.flush()
+
+    def _start_timer(self):
+        if self._timer is None and self.flush_interval is not None:
+            self._timer = threading.Timer(self.flush_interval, self._flush_expired)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def __len__(self):
+        """
+        Number of keys with pending deltas
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Write all pending deltas to the table
+
+        Returns
+        -------
+        int
+            Number of UpdateItem requests made
+
+        Raises
+        ------
+        Exception
+            The first error raised by an update. Deltas of updates throttled
+            or rejected by DynamoDB are kept pending, and others are dropped.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            updates = [
+                (key, primary_key, counters)
+                for key, (primary_key, counters) in pending.items()
+                if any(delta != 0 for _, delta in counters.values())
+            ]
+            if not updates:
+                return 0
+
+            record = self.table._operation_record("flush_counters")
+            errors = []
+            try:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.concurrency, len(updates))
+                ) as executor:
+                    futures = [
+                        executor.submit(self._update, primary_key, counters, record)
+                        for _, primary_key, counters in updates
+                    ]
+                for (key, primary_key, counters), future in zip(updates, futures):
+                    error = future.exception()
+                    if error is not None:
+                        # Throttled or rejected updates weren't applied, so
+                        # can be retried. Other errors are either permanent,
+                        # e.g. adding to a string, or may have been applied,
+                        # e.g. timeouts and internal errors, so retrying them
+                        # would fail forever or count twice.
+                        if _rejected(error):
+                            self._requeue(key, primary_key, counters)
+                        else:
+                            logger.error(
+                                "Dropped counter deltas of %r on %s: %s",
+                                primary_key,
+                                self.table.name,
+                                error,
+                            )
+                        errors.append(error)
+            finally:
+                self.table._finish(record)
+
+        if errors:
+            raise errors[0]
+        return len(updates)
+
+    def _update(self, primary_key, counters, record):
+        update_expression = combine_operators(
+            [
+                attribute.add(delta)
+                for attribute, delta in counters.values()
+                if delta != 0
+            ]
+        ).serialize()
+        self.table._request(
+            "update_item",
+            WRITE,
+            record,
+            Key=self.table._write_key(primary_key, update_expression),
+            **update_expression,
+        )
+
+    def _requeue(self, key, primary_key, counters):
+        with self._lock:
+            if key not in self._pending and len(self._pending) >= self.max_keys:
+                logger.error(
+                    "Dropped counter deltas of %r on %s: too many pending keys",
+                    primary_key,
+                    self.table.name,
+                )
+                return
+            pending = self._pending.setdefault(key, (primary_key, {}))[1]
+            for path, (attribute, delta) in counters.items():
+                if path in pending:
+                    pending[path] = (attribute, pending[path][1] + delta)
+                else:
+                    pending[path] = (attribute, delta)
+            self._start_timer()
+
+    def _flush_expired(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(
+                "Background flush of counters on %s failed", self.table.name
+            )
+
+    def close(self):
+        """
+        Flush pending deltas and stop accepting new ones
+        """
+        self._closed = True
+        _open_aggregators.discard(self)
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,97 @@
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+_deserializer = TypeDeserializer()
+
+
+def deserialize_error_item(model, item):
+    """
+    Deserialize an item returned with an error, which boto3 leaves in
+    DynamoDB's low-level format, into a data model
+
+    Parameters
+    ----------
+    model : DynamoModel
+        Data model of the item
+    item : dict or None
+        Item in DynamoDB's low-level format
+
+    Returns
+    -------
+    DynamoModel or None
+    """
+    if item is None:
+        return None
+    return model.deserialize(
+        {name: _deserializer.deserialize(value) for name, value in item.items()}
+    )
+
+
+class ConditionCheckFailed(ClientError):
+    """
+    The condition of a write wasn't satisfied.
+
+    A ``botocore.exceptions.ClientError`` raised in place of returning
+    ``None`` or ``False`` when ``return_values_on_condition_check_failure``
+    is given, with the item as stored when the condition failed as ``item``.
+    """
+
+    def __init__(self, error, item):
+        super().__init__(error.response, error.operation_name)
+        #: Item as stored, deserialized into its data model, or None if not
+        #: requested or there was no item
+        self.item = item
+
+
+class CancellationReason:
+    """
+    Why one action of a canceled transaction failed
+    """
+
+    def __init__(self, code, message, item):
+        #: DynamoDB's code for the failure, e.g. "ConditionalCheckFailed".
+        #: "None" for actions that didn't cause the cancellation.
+        self.code = code
+        #: DynamoDB's description of the failure, if any
+        self.message = message
+        #: Item as stored when its condition failed, deserialized into its data
+        #: model, or None
+        self.item = item
+
+    def __repr__(self):
+        return f"CancellationReason({self.code!r}, {self.message!r}, {self.item!r})"
+
+
+class TransactionCanceled(ClientError):
+    """
+    A transaction was canceled, e.g. because a condition wasn't satisfied.
+
+    A ``botocore.exceptions.ClientError`` with a ``reasons`` list holding a
+    :class:`CancellationReason` for each action of the transaction, in the
+    order the actions were added.
+    """
+
+    def __init__(self, error, reasons):
+        super().__init__(error.response, error.operation_name)
+        self.reasons = reasons
+
+
+class UnprocessedRequests(Exception):
+    """
+    A batch request still had unprocessed requests after the most attempts
+    allowed, e.g. because the table stayed throttled.
+
+    The requests that were never processed are ``unprocessed``, in the form
+    they're sent in: ``RequestItems`` of BatchWriteItem or BatchGetItem, or
+    the statements of BatchExecuteStatement. Requests that were processed
+    before giving up are not retried, so only these need to be sent again.
+    """
+
+    def __init__(self, operation, unprocessed, attempts):
+        super().__init__(
+            f"{operation} left requests unprocessed after {attempts} attempts"
+        )
+        #: Name of the batch operation, e.g. "batch_write_item"
+        self.operation = operation
+        #: The requests left unprocessed
+        self.unprocessed = unprocessed
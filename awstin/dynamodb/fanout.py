@@ -0,0 +1,159 @@
+import collections
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.dynamodb.types import Binary
+
+from awstin.config import DEFAULT_CONCURRENCY
+
+
+class PrefetchedPages:
+    """
+    Items of one paginated request, fetching each page in the background
+    while the previous one is consumed.
+
+    Pages are fetched one at a time per request, so a slow consumer holds at
+    most two pages in memory, and fetches never block a worker waiting for
+    the consumer.
+    """
+
+    def __init__(self, fetch, executor):
+        """
+        Parameters
+        ----------
+        fetch : callable
+            Called with the ``ExclusiveStartKey`` of a page (None for the
+            first page), returning the DynamoDB response
+        executor : concurrent.futures.Executor
+            Executor fetching pages
+        """
+        self._fetch = fetch
+        self._executor = executor
+        self._future = executor.submit(fetch, None)
+
+    def __iter__(self):
+        while self._future is not None:
+            response = self._future.result()
+            last_key = response.get("LastEvaluatedKey")
+            if last_key is not None:
+                self._future = self._executor.submit(self._fetch, last_key)
+            else:
+                self._future = None
+            yield from response["Items"]
+
+    def cancel(self):
+        """
+        Cancel the next page fetch, if it hasn't started
+        """
+        if self._future is not None:
+            self._future.cancel()
+
+
+def sort_value(value):
+    """
+    Orderable form of a DynamoDB key value
+    """
+    if isinstance(value, Binary):
+        return value.value
+    return value
+
+
+def _chained(fetches, executor, window, streams):
+    """
+    Items of each request in turn, keeping up to ``window`` requests started.
+    Started requests are added to ``streams``.
+    """
+    fetches = iter(fetches)
+    started = collections.deque()
+    for fetch in itertools.islice(fetches, window):
+        started.append(PrefetchedPages(fetch, executor))
+        streams.append(started[-1])
+
+    while started:
+        yield from started.popleft()
+        fetch = next(fetches, None)
+        if fetch is not None:
+            started.append(PrefetchedPages(fetch, executor))
+            streams.append(started[-1])
+
+
+def fan_out(fetches, sort_key=None, limit=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Run paginated requests concurrently, yielding their items.
+
+    Parameters
+    ----------
+    fetches : list of callable
+        Page fetch functions, see ``PrefetchedPages``
+    sort_key : str, optional
+        Attribute the items of each request are sorted by. If given, items are
+        merged into a single sorted stream. Otherwise the items of each
+        request are yielded in turn, with up to ``concurrency`` requests
+        started ahead of the one being consumed.
+    limit : int, optional
+        Maximum number of items to yield. Outstanding requests are cancelled
+        once reached.
+    concurrency : int, optional
+        Maximum number of requests in flight (default ``DEFAULT_CONCURRENCY``)
+
+    Yields
+    ------
+    dict
+        Raw DynamoDB items
+    """
+    if not fetches:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(fetches))) as executor:
+        streams = []
+        try:
+            if sort_key is None:
+                items = _chained(fetches, executor, concurrency, streams)
+            else:
+                streams.extend(PrefetchedPages(fetch, executor) for fetch in fetches)
+                items = heapq.merge(
+                    *streams,
+                    key=lambda item: sort_value(item[sort_key]),
+                )
+            if limit is not None:
+                items = itertools.islice(items, limit)
+            yield from items
+        finally:
+            for stream in streams:
+                stream.cancel()
+
+
+def pipelined(items, process, chunk_size):
+    """
+    Process items in chunks in the background, reading the next chunk while
+    the previous one is processed.
+
+    Parameters
+    ----------
+    items : iterable
+        Items to process
+    process : callable
+        Called with a list of up to ``chunk_size`` items, returning an
+        iterable of results
+    chunk_size : int
+        Maximum number of items per chunk
+
+    Yields
+    ------
+    Any
+        Results of each chunk, in order
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = None
+        while True:
+            chunk = list(itertools.islice(items, chunk_size))
+            if not chunk:
+                break
+            future = executor.submit(process, chunk)
+            if pending is not None:
+                yield from pending.result()
+            pending = future
+        if pending is not None:
+            yield from pending.result()
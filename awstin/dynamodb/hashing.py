@@ -0,0 +1,178 @@
+import base64
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+
+from boto3.dynamodb.types import Binary
+
+
+def _canonical(value):
+    # Type-tagged, order-independent form of a serialized DynamoDB value
+    if isinstance(value, bool):
+        return ["BOOL", value]
+    if isinstance(value, (int, float, Decimal)):
+        return ["N", str(Decimal(str(value)).normalize())]
+    if isinstance(value, str):
+        return ["S", value]
+    if isinstance(value, Binary):
+        value = value.value
+    if isinstance(value, (bytes, bytearray)):
+        return ["B", base64.b64encode(bytes(value)).decode()]
+    if value is None:
+        return ["NULL"]
+    if isinstance(value, (list, tuple)):
+        return ["L", [_canonical(v) for v in value]]
+    if isinstance(value, (set, frozenset)):
+        return ["SET", sorted(_dumps(_canonical(v)) for v in value)]
+    if isinstance(value, dict):
+        return ["M", sorted([str(k), _canonical(v)] for k, v in value.items())]
+    raise TypeError(f"Can't hash value of type {type(value)!r}")
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def content_hash(data):
+    """
+    Stable hash of a serialized item.
+
+    The hash doesn't depend on the order of map keys or set elements, or on
+    how numbers are written, e.g. ``1``, ``1.0`` and ``Decimal("1.00")`` hash
+    the same.
+
+    Parameters
+    ----------
+    data : dict of (str, Any)
+        Serialized item, as returned by ``DynamoModel.serialize``
+
+    Returns
+    -------
+    str
+        Hex digest
+    """
+    encoded = _dumps(_canonical(data)).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class ContentHashFilter:
+    """
+    Opt-in suppression of writes that wouldn't change the stored item.
+
+    Pass to ``Table.put_item`` or ``Table.put_items`` as ``skip_unchanged``.
+    Each item is hashed with ``content_hash`` and skipped if unchanged, by
+    one or both of:
+
+    - A local store of the hashes of items written through this filter,
+      keyed by primary key. Unchanged items are skipped without a request.
+    - A hash attribute stored on the items. ``put_item`` writes the hash with
+      a condition that it differs from the stored one. A failed condition
+      still consumes write capacity, but unchanged items aren't rewritten, so
+      streams and indexes see no write. Batch writes can't be conditional, so
+      they only store the attribute.
+
+    The filter is thread-safe and counts the writes made and skipped.
+    """
+
+    def __init__(self, hash_attribute=None, local=True, max_keys=100000):
+        """
+        Parameters
+        ----------
+        hash_attribute : str, optional
+            Name of an item attribute to store the hash in. Not stored if not
+            given.
+        local : bool, optional
+            Whether to keep hashes of written items locally (default True)
+        max_keys : int, optional
+            Maximum number of hashes kept locally. The least recently used
+            are dropped first. Default 100000.
+        """
+        if not local and hash_attribute is None:
+            raise ValueError("Either local or hash_attribute must be used")
+
+        self.hash_attribute = hash_attribute
+        self.local = local
+        self.max_keys = max_keys
+
+        #: Number of writes made
+        self.written = 0
+        #: Number of writes skipped because the item was unchanged
+        self.skipped = 0
+
+        self._lock = threading.Lock()
+        self._hashes = OrderedDict()
+
+    def content_hash(self, data):
+        """
+        Hash of a serialized item, excluding the hash attribute
+
+        Parameters
+        ----------
+        data : dict of (str, Any)
+            Serialized item
+
+        Returns
+        -------
+        str
+        """
+        if self.hash_attribute in data:
+            data = {k: v for k, v in data.items() if k != self.hash_attribute}
+        return content_hash(data)
+
+    def unchanged(self, key, digest):
+        """
+        Whether an item with the given hash is known to be stored already. If
+        so, the write is counted as skipped.
+
+        Parameters
+        ----------
+        key : tuple
+            Primary key values of the item
+        digest : str
+            Hash of the item
+
+        Returns
+        -------
+        bool
+        """
+        if not self.local:
+            return False
+        with self._lock:
+            if self._hashes.get(key) == digest:
+                self._hashes.move_to_end(key)
+                self.skipped += 1
+                return True
+        return False
+
+    def record(self, key, digest, skipped=False):
+        """
+        Record the hash of a stored item
+
+        Parameters
+        ----------
+        key : tuple
+            Primary key values of the item
+        digest : str
+            Hash of the item
+        skipped : bool, optional
+            Whether the write was skipped rather than made (default False)
+        """
+        with self._lock:
+            if skipped:
+                self.skipped += 1
+            else:
+                self.written += 1
+            if self.local:
+                self._hashes[key] = digest
+                self._hashes.move_to_end(key)
+                while len(self._hashes) > self.max_keys:
+                    self._hashes.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget all locally stored hashes
+        """
+        with self._lock:
+            self._hashes.clear()
@@ -0,0 +1,310 @@
+import bisect
+import threading
+from collections import namedtuple
+
+from awstin.dynamodb.ratelimit import READ
+
+#: Upper bounds (in seconds) of the latency histogram buckets. Latencies above
+#: the last bound are counted in a final overflow bucket.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+#: Error codes counted as throttles
+THROTTLE_ERROR_CODES = frozenset(
+    [
+        "ProvisionedThroughputExceededException",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+    ]
+)
+
+#: A single recorded request, passed to registry listeners
+MetricsEvent = namedtuple(
+    "MetricsEvent",
+    [
+        "table",
+        "index",
+        "operation",
+        "capacity",
+        "latency",
+        "items",
+        "scanned_count",
+        "capacity_units",
+        "index_capacity_units",
+        "retries",
+        "bytes",
+        "error_code",
+    ],
+)
+
+
+class OperationMetrics:
+    """
+    Counters for one (table, index, operation) combination
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.throttles = 0
+        self.retries = 0
+        self.items = 0
+        self.scanned_count = 0
+        self.read_capacity_units = 0.0
+        self.write_capacity_units = 0.0
+        self.bytes = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add_capacity(self, capacity, units):
+        if capacity == READ:
+            self.read_capacity_units += units
+        else:
+            self.write_capacity_units += units
+
+    def add_latency(self, latency):
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def as_dict(self):
+        """
+        Serializable view of the counters
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "throttles": self.throttles,
+            "retries": self.retries,
+            "items": self.items,
+            "scanned_count": self.scanned_count,
+            "read_capacity_units": self.read_capacity_units,
+            "write_capacity_units": self.write_capacity_units,
+            "bytes": self.bytes,
+            "latency_total": self.latency_total,
+            "latency_max": self.latency_max,
+            "latency_histogram": dict(
+                zip(
+                    [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"],
+                    self.latency_histogram,
+                )
+            ),
+        }
+
+
+def _response_items(response):
+    if "Count" in response:
+        return response["Count"]
+    if "Items" in response:
+        return len(response["Items"])
+    if "Item" in response or "Attributes" in response:
+        return 1
+    return 0
+
+
+def _index_capacity_units(consumed_capacity):
+    result = {}
+    for entry in consumed_capacity:
+        for section in "GlobalSecondaryIndexes", "LocalSecondaryIndexes":
+            for index_name, index_capacity in entry.get(section, {}).items():
+                units = index_capacity.get("CapacityUnits", 0.0)
+                result[index_name] = result.get(index_name, 0.0) + units
+    return result
+
+
+class MetricsRegistry:
+    """
+    Opt-in collector of per-table, per-index and per-operation DynamoDB
+    metrics.
+
+    Pass a registry to :class:`awstin.dynamodb.DynamoDB` (or a single
+    :class:`awstin.dynamodb.Table`) to record every request made through it.
+    Tables with a registry request ``ReturnConsumedCapacity="INDEXES"`` so
+    capacity can be broken down by index.
+
+    Listeners added with ``add_listener`` are called with a
+    :class:`MetricsEvent` for every request, and ``snapshot`` returns the
+    accumulated counters, e.g. for emitting at the end of a Lambda invocation.
+    The registry is thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Register a callback called with a ``MetricsEvent`` per request
+
+        Parameters
+        ----------
+        listener : callable
+            Callback taking a single ``MetricsEvent``
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Remove a callback previously registered with ``add_listener``
+        """
+        self._listeners.remove(listener)
+
+    def record_response(self, table, index, operation, capacity, response, latency):
+        """
+        Record a successful request
+
+        Parameters
+        ----------
+        table : str
+            Table name
+        index : str or None
+            Index name, if the request was made against an index
+        operation : str
+            Operation name, e.g. "query"
+        capacity : str
+            Kind of capacity the operation consumes, ``READ`` or ``WRITE``
+        response : dict
+            The DynamoDB response
+        latency : float
+            Request latency in seconds
+        """
+        consumed = response.get("ConsumedCapacity") or []
+        if isinstance(consumed, dict):
+            consumed = [consumed]
+        metadata = response.get("ResponseMetadata", {})
+        headers = metadata.get("HTTPHeaders", {})
+
+        self.record(
+            MetricsEvent(
+                table=table,
+                index=index,
+                operation=operation,
+                capacity=capacity,
+                latency=latency,
+                items=_response_items(response),
+                scanned_count=response.get("ScannedCount", 0),
+                capacity_units=sum(e.get("CapacityUnits", 0.0) for e in consumed),
+                index_capacity_units=_index_capacity_units(consumed),
+                retries=metadata.get("RetryAttempts", 0),
+                bytes=int(headers.get("content-length", 0)),
+                error_code=None,
+            )
+        )
+
+    def record_error(self, table, index, operation, capacity, error, latency):
+        """
+        Record a failed request
+
+        Parameters
+        ----------
+        table : str
+            Table name
+        index : str or None
+            Index name, if the request was made against an index
+        operation : str
+            Operation name, e.g. "query"
+        capacity : str
+            Kind of capacity the operation consumes, ``READ`` or ``WRITE``
+        error : botocore.exceptions.ClientError
+            The error raised by the request
+        latency : float
+            Request latency in seconds
+        """
+        response = getattr(error, "response", {})
+        self.record(
+            MetricsEvent(
+                table=table,
+                index=index,
+                operation=operation,
+                capacity=capacity,
+                latency=latency,
+                items=0,
+                scanned_count=0,
+                capacity_units=0.0,
+                index_capacity_units={},
+                retries=response.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+                bytes=0,
+                error_code=response.get("Error", {}).get("Code", "Unknown"),
+            )
+        )
+
+    def record(self, event):
+        """
+        Add a ``MetricsEvent`` to the counters and notify listeners
+
+        Parameters
+        ----------
+        event : MetricsEvent
+            The request to record
+        """
+        with self._lock:
+            counters = self._counters(event.table, event.index, event.operation)
+            counters.calls += 1
+            counters.retries += event.retries
+            counters.items += event.items
+            counters.scanned_count += event.scanned_count
+            counters.bytes += event.bytes
+            counters.add_capacity(event.capacity, event.capacity_units)
+            counters.add_latency(event.latency)
+            if event.error_code is not None:
+                counters.errors += 1
+                if event.error_code in THROTTLE_ERROR_CODES:
+                    counters.throttles += 1
+
+            # Capacity consumed on indexes by this request, e.g. GSI writes
+            for index_name, units in event.index_capacity_units.items():
+                if index_name != event.index:
+                    index_counters = self._counters(
+                        event.table, index_name, event.operation
+                    )
+                    index_counters.add_capacity(event.capacity, units)
+
+        for listener in list(self._listeners):
+            listener(event)
+
+    def _counters(self, table, index, operation):
+        key = (table, index, operation)
+        if key not in self._operations:
+            self._operations[key] = OperationMetrics()
+        return self._operations[key]
+
+    def snapshot(self, reset=False):
+        """
+        Accumulated counters
+
+        Parameters
+        ----------
+        reset : bool, optional
+            Clear the counters after taking the snapshot (default False)
+
+        Returns
+        -------
+        list of dict
+            One entry per (table, index, operation) with "table", "index" and
+            "operation" keys alongside the counters
+        """
+        with self._lock:
+            result = [
+                {
+                    "table": table,
+                    "index": index,
+                    "operation": operation,
+                    **counters.as_dict(),
+                }
+                for (table, index, operation), counters in self._operations.items()
+            ]
+            if reset:
+                self._operations = {}
+        return result
+
+    def reset(self):
+        """
+        Clear all counters
+        """
+        with self._lock:
+            self._operations = {}
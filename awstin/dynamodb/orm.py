@@ -1,11 +1,14 @@
+import copy
+import functools
 import uuid
 from abc import ABC, abstractmethod
-from collections import defaultdict
 from typing import Union
 
 from boto3.dynamodb.conditions import Attr as BotoAttr
 from boto3.dynamodb.conditions import Key as BotoKey
 
+from awstin.dynamodb.buckets import BUCKET_FORMATS, bucket_label
+from awstin.dynamodb.hashing import content_hash
 from awstin.dynamodb.utils import from_decimal, to_decimal
 
 
@@ -23,6 +26,51 @@ class NotSet:
 
 NOT_SET = NotSet()
 
+#: Separator between the value and the shard or time bucket of sharded and
+#: bucketed keys
+KEY_SUFFIX_SEPARATOR = "#"
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_attribute_path(attribute_name):
+    """
+    Split an attribute path into its segments, e.g. ``"info.ratings[3]"``
+    into ``("info", "ratings", 3)``.
+
+    Parameters
+    ----------
+    attribute_name : str
+        Attribute path
+
+    Returns
+    -------
+    tuple of (str or int)
+        Attribute names as str and list indexes as int
+    """
+    segments = []
+    for section in attribute_name.split("."):
+        name, *indexes = section.split("[")
+        if name:
+            segments.append(name)
+        for index in indexes:
+            index = index.rstrip("]")
+            segments.append(int(index) if index.isdigit() else index)
+    return tuple(segments)
+
+
+@functools.lru_cache(maxsize=1024)
+def _nested_attribute(attribute_type, segments, attribute_name):
+    """
+    A nested attribute of a data model attribute. Recently used nested
+    attributes are reused, so repeated nested access doesn't rebuild or
+    reparse the path, while nested access with many distinct keys doesn't
+    grow without bound.
+    """
+    child = BaseAttribute.__new__(attribute_type)
+    BaseAttribute.__init__(child, attribute_name=attribute_name)
+    child._segments = segments
+    return child
+
 
 class BaseAttribute:
     def __init__(self, attribute_name: Union[str, None] = None):
@@ -39,6 +87,9 @@ class BaseAttribute:
         # Set by Model
         self._name_on_model = None
 
+        # Path segments of nested attributes
+        self._segments = None
+
     @property
     def _awstin_name(self):
         if self._attribute_name is not None:
@@ -46,6 +97,18 @@ class BaseAttribute:
         else:
             return self._name_on_model
 
+    @property
+    def _path(self):
+        """
+        Segments of the attribute path, see ``parse_attribute_path``
+        """
+        if self._segments is not None:
+            return self._segments
+        return parse_attribute_path(self._awstin_name)
+
+    def _child(self, segment, attribute_name):
+        return _nested_attribute(type(self), self._path + (segment,), attribute_name)
+
     def __getattr__(self, name):
         """
         Support for nested mapping queries
@@ -53,13 +116,13 @@ class BaseAttribute:
         try:
             return super().__getattr__(name)
         except AttributeError:
-            return type(self)(attribute_name=f"{self._awstin_name}.{name}")
+            return self._child(name, f"{self._awstin_name}.{name}")
 
     def __getitem__(self, index):
         """
         Support for nested container queries
         """
-        return type(self)(attribute_name=f"{self._awstin_name}[{index}]")
+        return self._child(index, f"{self._awstin_name}[{index}]")
 
     # --- Query and scan filter expressions ---
 
@@ -238,6 +301,100 @@ class Key(BaseAttribute):
 
     _query_type = BotoKey
 
+    # Write sharding and time bucketing, see __init__
+    _shards = None
+    _shard_by = None
+    _bucket = None
+    _bucket_by = None
+
+    def __init__(
+        self,
+        attribute_name: Union[str, None] = None,
+        shards: Union[int, None] = None,
+        shard_by: Union[str, None] = None,
+        bucket: Union[str, None] = None,
+        bucket_by: Union[str, None] = None,
+    ):
+        """
+        Parameters
+        ----------
+        attribute_name : str, optional
+            Name of the property in the DynamoDB table. Defaults to the name of
+            the attribute on the DynamoModel class.
+        shards : int, optional
+            Spread writes to a hot partition key over this many partitions by
+            storing the value with a suffix, e.g. "value#3". The table's
+            partition key must be a string. Reads and queries on the value
+            fan out to all shards and merge the results.
+        shard_by : str, optional
+            Name of a model attribute, usually the sort key, whose value
+            picks the shard of an item. Items then always have the same shard,
+            so gets by full primary key read a single shard. Without it, keys
+            are sharded randomly, which is only for counters: each ADD update
+            goes to a random shard, and whole items can't be put or read by
+            primary key.
+        bucket : str, optional
+            Split a partition key into time buckets by storing the value with
+            the bucket of the item's ``bucket_by`` time as a suffix, e.g.
+            "value#2021-03-04" for "day" buckets. One of "minute", "hour",
+            "day" or "month". The table's partition key must be a string.
+        bucket_by : str, optional
+            Name of the model attribute holding the item's time, usually the
+            sort key. Times are seconds since the epoch or ISO 8601 strings,
+            in UTC unless they have a timezone.
+        """
+        super().__init__(attribute_name=attribute_name)
+        if shards is not None and shards < 1:
+            raise ValueError("shards must be at least 1")
+        if shard_by is not None and shards is None:
+            raise ValueError("shard_by requires shards")
+        if bucket is not None and bucket not in BUCKET_FORMATS:
+            raise ValueError(f"bucket must be one of {sorted(BUCKET_FORMATS)}")
+        if (bucket is None) != (bucket_by is None):
+            raise ValueError("bucket and bucket_by must be given together")
+        if bucket is not None and shards is not None:
+            raise ValueError("A key can't be both sharded and bucketed")
+        self._shards = shards
+        self._shard_by = shard_by
+        self._bucket = bucket
+        self._bucket_by = bucket_by
+
+    @property
+    def _suffixed(self):
+        """
+        Whether the key is stored with a shard or time bucket suffix
+        """
+        return self._shards is not None or self._bucket is not None
+
+    def _stored_value(self, value, suffix):
+        """
+        Stored value of a sharded or bucketed key
+        """
+        return f"{value}{KEY_SUFFIX_SEPARATOR}{suffix}"
+
+    def _split_stored(self, stored_value):
+        """
+        Logical value and suffix of a stored sharded or bucketed key value. The
+        suffix is None if the value has none.
+        """
+        if isinstance(stored_value, str):
+            value, separator, suffix = stored_value.rpartition(KEY_SUFFIX_SEPARATOR)
+            if separator:
+                return value, suffix
+        return stored_value, None
+
+    def _hash_shard(self, shard_by_value):
+        """
+        Shard of an item given the value of its ``shard_by`` attribute
+        """
+        return int(content_hash(shard_by_value), 16) % self._shards
+
+    def _bucket_label(self, bucket_by_value):
+        """
+        Time bucket of an item given the value of its ``bucket_by`` attribute
+        """
+        return bucket_label(bucket_by_value, self._bucket)
+
 
 class Attr(BaseAttribute):
     """
@@ -247,6 +404,42 @@ class Attr(BaseAttribute):
     _query_type = BotoAttr
 
 
+class Reference(Attr):
+    """
+    Non-key attribute holding the primary key of an item of another data
+    model.
+
+    The key is stored in the shorthand of ``Table`` item access: the value of
+    the partition key, or a ``[partition key, sort key]`` list. Referenced
+    items can be loaded in batches with the ``prefetch_related`` option of
+    ``Table.query`` and ``Table.scan``, and read with ``DynamoModel.related``.
+    """
+
+    def __init__(self, model, attribute_name: Union[str, None] = None):
+        """
+        Parameters
+        ----------
+        model : DynamoModel
+            Data model of the referenced items
+        attribute_name : str, optional
+            Name of the property in the DynamoDB table. Defaults to the name of
+            the attribute on the DynamoModel class.
+        """
+        super().__init__(attribute_name=attribute_name)
+        self._referenced_model = model
+
+    def _key_values(self, value, key_names):
+        """
+        Values of the referenced item's primary key, in the order of
+        ``key_names``, given the stored reference
+        """
+        if isinstance(value, dict):
+            return tuple(value[name] for name in key_names)
+        if isinstance(value, (list, tuple)):
+            return tuple(value)
+        return (value,)
+
+
 def size_query(self, *args, **kwargs):
     return BotoAttr(self._awstin_name).size()
 
@@ -272,6 +465,33 @@ class DynamoModelMeta(type):
         }
         return result
 
+    def _key_attributes(self):
+        """
+        Key attributes of the model, as a dict of DynamoDB name to model
+        attribute name
+        """
+        return {
+            dynamo_name: model_name
+            for dynamo_name, model_name in self._dynamodb_attributes().items()
+            if isinstance(getattr(self, model_name), Key)
+        }
+
+    def _suffixed_keys(self):
+        """
+        Write-sharded and time-bucketed key attributes of the model, as a dict
+        of DynamoDB name to Key. Computed once per model, as it's needed for
+        every item serialized.
+        """
+        result = self.__dict__.get("_suffixed_keys_")
+        if result is None:
+            result = {}
+            for dynamo_name, model_name in self._dynamodb_attributes().items():
+                attr = getattr(self, model_name)
+                if isinstance(attr, Key) and attr._suffixed:
+                    result[dynamo_name] = attr
+            self._suffixed_keys_ = result
+        return result
+
     def _get_kwargs(self):
         """
         Kwargs that should be passed to query, scan, get_item
@@ -321,6 +541,17 @@ class DynamoModel(metaclass=DynamoModelMeta):
     attribute
     """
 
+    # Serialized attribute values as last loaded from or saved to the table,
+    # for tracking changes. None for models created locally.
+    _loaded_ = None
+
+    # Shards of sharded keys by model attribute name, once known
+    _shards_ = None
+
+    # Items referenced by Reference attributes by model attribute name, once
+    # prefetched
+    _related_ = None
+
     def __init__(self, **kwargs):
         """
         Parameters
@@ -362,16 +593,25 @@ class DynamoModel(metaclass=DynamoModelMeta):
         for attr in model_attrs.values():
             setattr(result, attr, NOT_SET)
 
+        # Stored values are kept to track changes. The model's containers are
+        # converted copies of them, so can be modified in place.
+        loaded = {}
         for db_attr, value in data.items():
             if db_attr in model_attrs.keys():
-                if type(value) in [list, set, tuple]:
-                    value = type(value)(from_decimal(v) for v in value)
-                elif type(value) is dict:
-                    value = {from_decimal(k): from_decimal(v) for k, v in value.items()}
-                else:
-                    value = from_decimal(value)
-                setattr(result, model_attrs[db_attr], value)
-
+                loaded[db_attr] = value
+                setattr(result, model_attrs[db_attr], _deserialize_attribute(value))
+
+        for db_attr, key in cls._suffixed_keys().items():
+            model_name = model_attrs[db_attr]
+            value, suffix = key._split_stored(getattr(result, model_name))
+            if suffix is not None:
+                setattr(result, model_name, value)
+                if key._shards is not None and suffix.isdigit():
+                    if result._shards_ is None:
+                        result._shards_ = {}
+                    result._shards_[model_name] = int(suffix)
+
+        result._loaded_ = loaded
         return result
 
     def serialize(self):
@@ -391,19 +631,229 @@ class DynamoModel(metaclass=DynamoModelMeta):
         for dynamo_name, model_name in model_attrs.items():
             value = getattr(self, model_name)
             if value is not NOT_SET:
-                if type(value) in [list, set, tuple]:
-                    value = type(value)(to_decimal(v) for v in value)
-                elif type(value) is dict:
-                    value = {to_decimal(k): to_decimal(v) for k, v in value.items()}
-                else:
-                    value = to_decimal(value)
-                result[dynamo_name] = value
+                result[dynamo_name] = _serialize_attribute(value)
+
+        for dynamo_name, key in type(self)._suffixed_keys().items():
+            if dynamo_name in result:
+                suffix = self._key_suffix(model_attrs[dynamo_name], key)
+                result[dynamo_name] = key._stored_value(result[dynamo_name], suffix)
 
         return result
 
+    def _key_suffix(self, model_name, key):
+        """
+        Shard or time bucket of a sharded or bucketed key of this item. Items
+        of randomly sharded keys only have a shard once read from the table.
+
+        Raises
+        ------
+        ValueError
+            If the attribute picking the suffix isn't set, or the item's key is
+            sharded randomly and the item wasn't read from the table
+        """
+        if key._bucket is not None:
+            value = getattr(self, key._bucket_by)
+            if value is NOT_SET:
+                raise ValueError(
+                    f"{key._bucket_by!r} must be set to pick the time bucket of "
+                    f"{model_name!r}"
+                )
+            return key._bucket_label(value)
+
+        if key._shard_by is not None:
+            value = getattr(self, key._shard_by)
+            if value is NOT_SET:
+                raise ValueError(
+                    f"{key._shard_by!r} must be set to pick the shard of "
+                    f"{model_name!r}"
+                )
+            return key._hash_shard(_serialize_attribute(value))
+
+        # Writing a new item to a random shard would leave any other copy of
+        # it in another shard
+        if self._shards_ is None or model_name not in self._shards_:
+            raise ValueError(
+                f"{model_name!r} is sharded randomly, so items can only be "
+                "written with ADD updates. Declare it with shard_by to write "
+                "whole items."
+            )
+        return self._shards_[model_name]
+
+    def changed_attributes(self):
+        """
+        Attributes changed since the model was loaded from or saved to a
+        table, including attributes that have been unset.
+
+        Changes are found by comparing each attribute with the value loaded
+        from DynamoDB, of which the model holds a copy, so both reassigned and
+        modified values are detected.
+
+        Returns
+        -------
+        dict of (str, Any)
+            Serialized new value by model attribute name. Removed attributes
+            have the value ``NOT_SET``. For models not loaded from a table,
+            every set attribute.
+        """
+        model_attrs = type(self)._dynamodb_attributes()
+        loaded = self._loaded_ if self._loaded_ is not None else {}
+        current = self.serialize()
+
+        result = {}
+        for dynamo_name, model_name in model_attrs.items():
+            if dynamo_name not in current:
+                if dynamo_name in loaded:
+                    result[model_name] = NOT_SET
+            elif (
+                dynamo_name not in loaded or loaded[dynamo_name] != current[dynamo_name]
+            ):
+                result[model_name] = current[dynamo_name]
+
+        return result
+
+    def related(self, attribute):
+        """
+        Item referenced by a Reference attribute, loaded with the
+        ``prefetch_related`` option of ``Table.query`` or ``Table.scan``
+
+        Parameters
+        ----------
+        attribute : Reference or str
+            The reference, or its name on the model
+
+        Returns
+        -------
+        DynamoModel or None
+            The referenced item. None if the reference isn't set, or the item
+            doesn't exist.
+
+        Raises
+        ------
+        ValueError
+            If the referenced item wasn't prefetched
+        """
+        if isinstance(attribute, BaseAttribute):
+            attribute = attribute._name_on_model
+        if self._related_ is None or attribute not in self._related_:
+            raise ValueError(f"{attribute!r} wasn't prefetched")
+        return self._related_[attribute]
+
+    def _mark_saved(self):
+        """
+        Record the current attribute values as the stored state of the item
+        """
+        self._loaded_ = {
+            dynamo_name: _snapshot(value)
+            for dynamo_name, value in self.serialize().items()
+        }
+
+
+def _serialize_attribute(value):
+    if type(value) in [list, set, tuple]:
+        return type(value)(to_decimal(v) for v in value)
+    elif type(value) is dict:
+        return {to_decimal(k): to_decimal(v) for k, v in value.items()}
+    else:
+        return to_decimal(value)
+
+
+def _deserialize_attribute(value):
+    # Containers are rebuilt, which copies them, so only nested containers
+    # need copying to keep the loaded value intact
+    if type(value) in [list, set, tuple]:
+        return type(value)(_snapshot(from_decimal(v)) for v in value)
+    elif type(value) is dict:
+        return {from_decimal(k): _snapshot(from_decimal(v)) for k, v in value.items()}
+    else:
+        return from_decimal(value)
+
+
+def _snapshot(value):
+    # Only containers can be modified in place, so only they need copying
+    if isinstance(value, (list, set, dict)):
+        return copy.deepcopy(value)
+    return value
+
 
 # ---- Update Operators
 
+#: Maximum length of a DynamoDB expression string
+MAX_EXPRESSION_LENGTH = 4096
+
+#: Update actions, in the order they appear in an update expression
+UPDATE_ACTIONS = ("SET", "ADD", "DELETE", "REMOVE")
+
+
+class UpdateCompiler:
+    """
+    Accumulates the clauses and placeholders of an update expression in a
+    single pass over the operator tree.
+
+    Attribute names are given one placeholder each, however many times they
+    appear in the expression.
+    """
+
+    def __init__(self):
+        self.clauses = {action: [] for action in UPDATE_ACTIONS}
+        self.attribute_names = {}
+        self.attribute_values = {}
+
+        self._name_placeholders = {}
+
+    def add_clause(self, action, clause):
+        self.clauses[action].append(clause)
+
+    def name(self, attribute_name):
+        """
+        Placeholder for an attribute name
+        """
+        placeholder = self._name_placeholders.get(attribute_name)
+        if placeholder is None:
+            placeholder = "#u" + str(len(self._name_placeholders))
+            self._name_placeholders[attribute_name] = placeholder
+            self.attribute_names[placeholder] = attribute_name
+        return placeholder
+
+    def value(self, value):
+        """
+        Placeholder for an attribute value
+        """
+        placeholder = ":u" + str(len(self.attribute_values))
+        self.attribute_values[placeholder] = serialize_value(value)
+        return placeholder
+
+    def attribute(self, attr):
+        """
+        Expression text for an attribute path
+        """
+        serialized = ""
+        for segment in attr._path:
+            if isinstance(segment, int):
+                serialized += f"[{segment}]"
+            elif serialized:
+                serialized += "." + self.name(segment)
+            else:
+                serialized = self.name(segment)
+        return serialized
+
+    def operand(self, value):
+        """
+        Expression text for an operand of an update action
+        """
+        if isinstance(value, UpdateOperand):
+            return value.compile(self)
+        elif isinstance(value, BaseAttribute):
+            return self.attribute(value)
+        else:
+            return self.value(value)
+
+    def update_dict(self):
+        return {
+            **self.clauses,
+            "ExpressionAttributeNames": self.attribute_names,
+            "ExpressionAttributeValues": self.attribute_values,
+        }
+
 
 class UpdateOperator(ABC):
     """
@@ -417,14 +867,31 @@ class UpdateOperator(ABC):
         return CombineOperator(self, other)
 
     @abstractmethod
+    def compile(self, compiler):
+        """
+        Add this expression's clauses to an ``UpdateCompiler``
+        """
+
+    def operators(self):
+        """
+        The individual update actions making up this expression, in order
+
+        Returns
+        -------
+        list of UpdateOperator
+        """
+        return [self]
+
     def update_dict(self):
-        pass
+        compiler = UpdateCompiler()
+        self.compile(compiler)
+        return compiler.update_dict()
 
     @staticmethod
     def update_expression(update_dict):
         expressions = []
 
-        for operation in "SET", "ADD", "DELETE", "REMOVE":
+        for operation in UPDATE_ACTIONS:
             if update_dict.get(operation):
                 expressions.append(operation + " " + ", ".join(update_dict[operation]))
 
@@ -443,7 +910,79 @@ class UpdateOperator(ABC):
         -------
         dict
             Kwargs for update_item
+
+        Raises
+        ------
+        ValueError
+            If the expression has ``param`` placeholders. Use ``prepare`` and
+            bind values to them instead.
         """
+        result = self._serialize()
+        for value in result.get("ExpressionAttributeValues", {}).values():
+            if isinstance(value, Param):
+                raise ValueError(
+                    f"No value for {value!r}. Update expressions with parameters "
+                    "must be prepared and bound."
+                )
+        return result
+
+    def prepare(self):
+        """
+        Compile this update expression once, for use in many updates.
+
+        Values may be left as ``param`` placeholders and bound per call, e.g.
+
+        ``increment = Movie.rating.add(param("delta")).prepare()``
+
+        ``table.update_item(key, increment.bind(delta=1))``
+
+        Returns
+        -------
+        PreparedUpdate
+            The compiled update expression
+        """
+        return PreparedUpdate(self)
+
+    def split(self, max_length=MAX_EXPRESSION_LENGTH):
+        """
+        Split this expression into several expressions whose update
+        expression text fits within ``max_length``.
+
+        Each action is kept whole, so an action that is longer than the limit
+        by itself is returned alone.
+
+        Parameters
+        ----------
+        max_length : int, optional
+            Maximum length of each update expression (default 4096)
+
+        Returns
+        -------
+        list of UpdateOperator
+            Expressions applying the same actions, in order
+        """
+        groups = []
+        current = []
+        compiler = UpdateCompiler()
+        for operator in self.operators():
+            # Measure the text the part compiles to, as its placeholders get
+            # longer the more actions it has
+            operator.compile(compiler)
+            length = len(self.update_expression(compiler.clauses))
+
+            if current and length > max_length:
+                groups.append(current)
+                current = []
+                compiler = UpdateCompiler()
+                operator.compile(compiler)
+            current.append(operator)
+
+        if current:
+            groups.append(current)
+
+        return [combine_operators(group) for group in groups]
+
+    def _serialize(self):
         update_dict = self.update_dict()
         result = {
             "UpdateExpression": self.update_expression(update_dict),
@@ -457,6 +996,25 @@ class UpdateOperator(ABC):
         return result
 
 
+def combine_operators(operators):
+    """
+    Combine update expressions with ``&``
+
+    Parameters
+    ----------
+    operators : list of UpdateOperator
+        At least one update expression
+
+    Returns
+    -------
+    UpdateOperator
+    """
+    result = operators[0]
+    for operator in operators[1:]:
+        result = CombineOperator(result, operator)
+    return result
+
+
 class CombineOperator(UpdateOperator):
     """
     Combine two update expressions
@@ -466,27 +1024,24 @@ class CombineOperator(UpdateOperator):
         self.left = left
         self.right = right
 
-    def update_dict(self):
-        result = defaultdict(list)
-        ser_left = self.left.update_dict()
-        ser_right = self.right.update_dict()
-
-        items = list(ser_left.items()) + list(ser_right.items())
-        for key, values in items:
-            if key in ["SET", "ADD", "DELETE", "REMOVE"]:
-                result[key].extend(values)
-
-        result["ExpressionAttributeNames"] = dict(
-            **ser_left["ExpressionAttributeNames"],
-            **ser_right["ExpressionAttributeNames"],
-        )
-        result["ExpressionAttributeValues"] = dict(
-            **ser_left["ExpressionAttributeValues"],
-            **ser_right["ExpressionAttributeValues"],
-        )
-
+    def operators(self):
+        # Iterative walk so long chains of & neither recurse deeply nor
+        # re-merge intermediate results
+        result = []
+        stack = [self]
+        while stack:
+            operator = stack.pop()
+            if isinstance(operator, CombineOperator):
+                stack.append(operator.right)
+                stack.append(operator.left)
+            else:
+                result.append(operator)
         return result
 
+    def compile(self, compiler):
+        for operator in self.operators():
+            operator.compile(compiler)
+
 
 class SetOperator(UpdateOperator):
     """
@@ -497,24 +1052,10 @@ class SetOperator(UpdateOperator):
         self.attr = attr
         self.operand = operand
 
-    def update_dict(self):
-        serialized_attr = itemize_attr(self.attr)
-        serialized_operand = self.operand.serialize()
-
-        attribute_names = dict(
-            **serialized_operand["ExpressionAttributeNames"],
-            **serialized_attr["ExpressionAttributeNames"],
-        )
-        return {
-            "SET": [
-                f"{serialized_attr['UpdateExpression']} = "
-                + serialized_operand["UpdateExpression"]
-            ],
-            "ExpressionAttributeNames": attribute_names,
-            "ExpressionAttributeValues": serialized_operand[
-                "ExpressionAttributeValues"
-            ],
-        }
+    def compile(self, compiler):
+        attr = compiler.attribute(self.attr)
+        operand = self.operand.compile(compiler)
+        compiler.add_clause("SET", f"{attr} = {operand}")
 
 
 class AddOperator(UpdateOperator):
@@ -522,38 +1063,18 @@ class AddOperator(UpdateOperator):
         self.attr = attr
         self.operand = operand
 
-    def update_dict(self):
-        serialized_attr = itemize_attr(self.attr)
-        serialized_operand = self.operand.serialize()
-
-        attribute_names = dict(
-            **serialized_operand["ExpressionAttributeNames"],
-            **serialized_attr["ExpressionAttributeNames"],
-        )
-        return {
-            "ADD": [
-                f"{serialized_attr['UpdateExpression']} "
-                + serialized_operand["UpdateExpression"]
-            ],
-            "ExpressionAttributeNames": attribute_names,
-            "ExpressionAttributeValues": serialized_operand[
-                "ExpressionAttributeValues"
-            ],
-        }
+    def compile(self, compiler):
+        attr = compiler.attribute(self.attr)
+        operand = self.operand.compile(compiler)
+        compiler.add_clause("ADD", f"{attr} {operand}")
 
 
 class RemoveOperator(UpdateOperator):
     def __init__(self, attr):
         self.attr = attr
 
-    def update_dict(self):
-        serialized_attr = itemize_attr(self.attr)
-
-        return {
-            "REMOVE": [serialized_attr["UpdateExpression"]],
-            "ExpressionAttributeNames": serialized_attr["ExpressionAttributeNames"],
-            "ExpressionAttributeValues": {},
-        }
+    def compile(self, compiler):
+        compiler.add_clause("REMOVE", compiler.attribute(self.attr))
 
 
 class DeleteOperator(UpdateOperator):
@@ -561,98 +1082,237 @@ class DeleteOperator(UpdateOperator):
         self.attr = attr
         self.operand = operand
 
-    def update_dict(self):
-        serialized_attr = itemize_attr(self.attr)
-        serialized_operand = self.operand.serialize()
+    def compile(self, compiler):
+        attr = compiler.attribute(self.attr)
+        operand = self.operand.compile(compiler)
+        compiler.add_clause("DELETE", f"{attr} {operand}")
+
 
-        attribute_names = dict(
-            **serialized_operand["ExpressionAttributeNames"],
-            **serialized_attr["ExpressionAttributeNames"],
+class PreparedUpdate:
+    """
+    An update expression compiled once, with values bound per call.
+
+    Created by ``UpdateOperator.prepare``. The expression text and attribute
+    name placeholders are built once and reused; only the values of ``param``
+    placeholders are serialized when the update is bound.
+    """
+
+    def __init__(self, update_operator):
+        """
+        Parameters
+        ----------
+        update_operator : UpdateOperator
+            The update expression to compile
+        """
+        serialized = update_operator._serialize()
+
+        self.update_expression = serialized["UpdateExpression"]
+        self.attribute_names = serialized.get("ExpressionAttributeNames", {})
+
+        self._constant_values, self._parameter_placeholders = split_parameters(
+            serialized.get("ExpressionAttributeValues", {})
+        )
+
+        #: Names of the parameters that must be bound
+        self.parameters = frozenset(name for _, name in self._parameter_placeholders)
+
+    def bind(self, **values):
+        """
+        Bind values to the parameters of the update
+
+        Parameters
+        ----------
+        **values : dict of (str, Any)
+            Value of each parameter
+
+        Returns
+        -------
+        BoundUpdate
+            Update that can be passed to ``Table.update_item``
+
+        Raises
+        ------
+        ValueError
+            If a parameter has no value, or a value is given for an unknown
+            parameter
+        """
+        return BoundUpdate(self, values)
+
+    def serialize(self, **values):
+        """
+        Produce kwargs to be passed to DynamoDB Table.update_item.
+
+        Parameters
+        ----------
+        **values : dict of (str, Any)
+            Value of each parameter
+
+        Returns
+        -------
+        dict
+            Kwargs for update_item
+
+        Raises
+        ------
+        ValueError
+            If a parameter has no value, or a value is given for an unknown
+            parameter
+        """
+        attribute_values = bind_parameters(
+            self._constant_values,
+            self._parameter_placeholders,
+            self.parameters,
+            values,
         )
-        return {
-            "DELETE": [
-                f"{serialized_attr['UpdateExpression']} "
-                + serialized_operand["UpdateExpression"]
-            ],
-            "ExpressionAttributeNames": attribute_names,
-            "ExpressionAttributeValues": serialized_operand[
-                "ExpressionAttributeValues"
-            ],
-        }
+
+        result = {"UpdateExpression": self.update_expression}
+        if self.attribute_names:
+            # Copied as boto3 adds condition placeholders to the map in place
+            result["ExpressionAttributeNames"] = dict(self.attribute_names)
+        if attribute_values:
+            result["ExpressionAttributeValues"] = attribute_values
+
+        return result
+
+
+class BoundUpdate:
+    """
+    A prepared update expression with values bound to its parameters
+    """
+
+    def __init__(self, prepared_update, values):
+        """
+        Parameters
+        ----------
+        prepared_update : PreparedUpdate
+            The compiled update expression
+        values : dict of (str, Any)
+            Value of each parameter
+        """
+        self.prepared_update = prepared_update
+        self.values = values
+        # Validate early rather than when the update is sent
+        self._serialized = prepared_update.serialize(**values)
+
+    def serialize(self):
+        """
+        Produce kwargs to be passed to DynamoDB Table.update_item.
+
+        Returns
+        -------
+        dict
+            Kwargs for update_item
+        """
+        return self._serialized
 
 
 # ---- Update Operands
 
 
-def serialize_operand(value):
-    name = str(uuid.uuid4())[:8]
+class Param:
+    """
+    A named placeholder for a value that is bound when a prepared expression
+    is used
+    """
 
-    if isinstance(value, UpdateOperand):
-        return value.serialize()
-    elif isinstance(value, BaseAttribute):
-        return itemize_attr(value)
-    elif type(value) in [list, set, tuple]:
-        name = ":" + name
+    def __init__(self, name):
+        """
+        Parameters
+        ----------
+        name : str
+            Name of the parameter
+        """
+        self.name = name
 
-        value = type(value)([to_decimal(v) for v in value])
+    def __repr__(self):
+        return f"param({self.name!r})"
 
-        return {
-            "UpdateExpression": name,
-            "ExpressionAttributeNames": {},
-            "ExpressionAttributeValues": {name: value},
-        }
-    else:
-        name = ":" + name
-        return {
-            "UpdateExpression": name,
-            "ExpressionAttributeNames": {},
-            "ExpressionAttributeValues": {name: to_decimal(value)},
-        }
 
+def param(name):
+    """
+    Placeholder for a value bound each time a prepared expression is used
+
+    Parameters
+    ----------
+    name : str
+        Name of the parameter
+    """
+    return Param(name)
 
-def itemize_attr(attr):
-    # Separate indexes
-    parts = []
 
-    current_section = ""
-    for letter in attr._awstin_name:
-        if letter == "[":
-            parts.append(current_section)
-            current_section = "["
-        elif letter == "]":
-            parts.append(current_section + "]")
-            current_section = ""
+def split_parameters(attribute_values):
+    """
+    Separate ``param`` placeholders from constant values in a placeholder map
+
+    Parameters
+    ----------
+    attribute_values : dict of (str, Any)
+        Value placeholder map
+
+    Returns
+    -------
+    constant_values : dict of (str, Any)
+        Placeholders of constant values
+    parameter_placeholders : list of (str, str)
+        Placeholder and parameter name of each ``param`` value
+    """
+    constant_values = {}
+    parameter_placeholders = []
+    for placeholder, value in attribute_values.items():
+        if isinstance(value, Param):
+            parameter_placeholders.append((placeholder, value.name))
         else:
-            current_section += letter
-    if current_section:
-        parts.append(current_section)
+            constant_values[placeholder] = value
+    return constant_values, parameter_placeholders
 
-    serialized = ""
-    name_map = {}
 
-    # Separate attributes
-    for part in parts:
-        if "[" in part and "]" in part:
-            serialized += part
-        else:
-            if part.startswith("."):
-                serialized += "."
-                part = part[1:]
-            sections = part.split(".")
-            serialized_sections = []
-
-            for section in sections:
-                name = "#" + str(uuid.uuid4())[:8]
-                name_map[name] = section
-                serialized_sections.append(name)
-            serialized += ".".join(serialized_sections)
-
-    result = {
-        "UpdateExpression": serialized,
-        "ExpressionAttributeNames": name_map,
-        "ExpressionAttributeValues": {},
-    }
-    return result
+def bind_parameters(constant_values, parameter_placeholders, parameters, values):
+    """
+    Build a value placeholder map from constants and bound parameter values
+
+    Parameters
+    ----------
+    constant_values : dict of (str, Any)
+        Placeholders of constant values
+    parameter_placeholders : list of (str, str)
+        Placeholder and parameter name of each ``param`` value
+    parameters : frozenset of str
+        Names of all parameters
+    values : dict of (str, Any)
+        Value of each parameter
+
+    Returns
+    -------
+    dict of (str, Any)
+        Value placeholder map
+
+    Raises
+    ------
+    ValueError
+        If a parameter has no value, or a value is given for an unknown
+        parameter
+    """
+    missing = parameters.difference(values)
+    if missing:
+        raise ValueError(f"Missing values for parameters {sorted(missing)!r}")
+    unknown = set(values).difference(parameters)
+    if unknown:
+        raise ValueError(f"Unknown parameters {sorted(unknown)!r}")
+
+    attribute_values = dict(constant_values)
+    for placeholder, name in parameter_placeholders:
+        attribute_values[placeholder] = serialize_value(values[name])
+    return attribute_values
+
+
+def serialize_value(value):
+    """
+    Convert a Python value for use in an expression, converting floats to
+    Decimal
+    """
+    if type(value) in [list, set, tuple]:
+        return type(value)([to_decimal(v) for v in value])
+    return to_decimal(value)
 
 
 class UpdateOperand:
@@ -663,8 +1323,12 @@ class UpdateOperand:
     def __init__(self, value):
         self.value = value
 
-    def serialize(self):
-        return serialize_operand(self.value)
+    def compile(self, compiler):
+        """
+        Expression text for this operand, adding its placeholders to an
+        ``UpdateCompiler``
+        """
+        return compiler.operand(self.value)
 
 
 class CombineOperand(UpdateOperand):
@@ -677,27 +1341,10 @@ class CombineOperand(UpdateOperand):
         self.right = right
         self.symbol = symbol
 
-    def serialize(self):
-        ser_left = serialize_operand(self.left)
-        ser_right = serialize_operand(self.right)
-
-        expression = (
-            f"{ser_left['UpdateExpression']} "
-            f"{self.symbol} "
-            f"{ser_right['UpdateExpression']}"
-        )
-
-        return {
-            "UpdateExpression": expression,
-            "ExpressionAttributeNames": dict(
-                **ser_left["ExpressionAttributeNames"],
-                **ser_right["ExpressionAttributeNames"],
-            ),
-            "ExpressionAttributeValues": dict(
-                **ser_left["ExpressionAttributeValues"],
-                **ser_right["ExpressionAttributeValues"],
-            ),
-        }
+    def compile(self, compiler):
+        left = compiler.operand(self.left)
+        right = compiler.operand(self.right)
+        return f"{left} {self.symbol} {right}"
 
 
 class IfNotExistsOperand(UpdateOperand):
@@ -709,26 +1356,10 @@ class IfNotExistsOperand(UpdateOperand):
         self.attr = attr
         self.value = value
 
-    def serialize(self):
-        ser_attr = serialize_operand(self.attr)
-        ser_value = serialize_operand(self.value)
-
-        expression = (
-            f"if_not_exists({ser_attr['UpdateExpression']}, "
-            f"{ser_value['UpdateExpression']})"
-        )
-
-        return {
-            "UpdateExpression": expression,
-            "ExpressionAttributeNames": dict(
-                **ser_attr["ExpressionAttributeNames"],
-                **ser_value["ExpressionAttributeNames"],
-            ),
-            "ExpressionAttributeValues": dict(
-                **ser_attr["ExpressionAttributeValues"],
-                **ser_value["ExpressionAttributeValues"],
-            ),
-        }
+    def compile(self, compiler):
+        attr = compiler.operand(self.attr)
+        value = compiler.operand(self.value)
+        return f"if_not_exists({attr}, {value})"
 
 
 class ListAppendOperand(UpdateOperand):
@@ -740,26 +1371,10 @@ class ListAppendOperand(UpdateOperand):
         self.left = left
         self.right = right
 
-    def serialize(self):
-        ser_left = serialize_operand(self.left)
-        ser_right = serialize_operand(self.right)
-
-        expression = (
-            f"list_append({ser_left['UpdateExpression']}, "
-            f"{ser_right['UpdateExpression']})"
-        )
-
-        return {
-            "UpdateExpression": expression,
-            "ExpressionAttributeNames": dict(
-                **ser_left["ExpressionAttributeNames"],
-                **ser_right["ExpressionAttributeNames"],
-            ),
-            "ExpressionAttributeValues": dict(
-                **ser_left["ExpressionAttributeValues"],
-                **ser_right["ExpressionAttributeValues"],
-            ),
-        }
+    def compile(self, compiler):
+        left = compiler.operand(self.left)
+        right = compiler.operand(self.right)
+        return f"list_append({left}, {right})"
 
 
 def list_append(left, right):
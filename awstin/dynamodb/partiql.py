@@ -0,0 +1,117 @@
+import functools
+import re
+
+from awstin.dynamodb.utils import to_decimal
+
+# Most statements in one BatchExecuteStatement request
+BATCH_STATEMENT_SIZE = 25
+
+# String literals and quoted identifiers, which may contain "?" or ":", and
+# parameter placeholders
+_TOKENS = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|\?|:([A-Za-z_]\w*)""")
+
+
+class PreparedStatement:
+    """
+    A PartiQL statement ready to be sent to DynamoDB, with named parameters
+    (``:name``) replaced by positional ones (``?``)
+    """
+
+    def __init__(self, statement):
+        """
+        Parameters
+        ----------
+        statement : str
+            PartiQL statement, with either positional or named parameters
+
+        Raises
+        ------
+        ValueError
+            If the statement mixes positional and named parameters
+        """
+        names = []
+        positional = 0
+
+        def replace(match):
+            nonlocal positional
+            token = match.group(0)
+            if match.group(1) is not None:
+                names.append(match.group(1))
+                return "?"
+            if token == "?":
+                positional += 1
+            return token
+
+        #: Statement text sent to DynamoDB
+        self.statement = _TOKENS.sub(replace, statement)
+        if names and positional:
+            raise ValueError(
+                "A statement can't have both positional and named parameters"
+            )
+        #: Names of the parameters, in order, or None for positional parameters
+        self.parameter_names = tuple(names) if names else None
+        self._parameter_count = len(names) or positional
+
+        #: Whether the statement only reads, i.e. is a SELECT
+        self.reads = statement.lstrip()[:6].upper() == "SELECT"
+
+    def parameters(self, params):
+        """
+        Values of the statement's parameters, in order
+
+        Parameters
+        ----------
+        params : list or dict or None
+            Values of positional parameters, or of named parameters by name
+
+        Returns
+        -------
+        list
+
+        Raises
+        ------
+        ValueError
+            If the parameters don't match the statement's
+        """
+        if self.parameter_names is not None:
+            if not isinstance(params, dict):
+                raise ValueError("Named parameters must be given as a dict")
+            missing = [name for name in self.parameter_names if name not in params]
+            if missing:
+                raise ValueError(f"Missing statement parameters: {missing}")
+            values = [params[name] for name in self.parameter_names]
+        else:
+            values = list(params or [])
+            if len(values) != self._parameter_count:
+                raise ValueError(
+                    f"Statement takes {self._parameter_count} parameters, "
+                    f"{len(values)} given"
+                )
+        return [to_decimal(value) for value in values]
+
+    def request(self, params):
+        """
+        ExecuteStatement request parameters for the statement
+        """
+        request = dict(Statement=self.statement)
+        parameters = self.parameters(params)
+        if parameters:
+            request["Parameters"] = parameters
+        return request
+
+
+@functools.lru_cache(maxsize=1024)
+def prepare_statement(statement):
+    """
+    Prepare a PartiQL statement, once per distinct statement text
+
+    Parameters
+    ----------
+    statement : str
+        PartiQL statement
+
+    Returns
+    -------
+    PreparedStatement
+    """
+    return PreparedStatement(statement)
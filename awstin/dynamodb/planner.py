@@ -0,0 +1,421 @@
+import functools
+import operator
+
+from boto3.dynamodb.conditions import (
+    And,
+    AttributeBase,
+    BeginsWith,
+    Between,
+    ConditionBase,
+    Equals,
+    GreaterThan,
+    GreaterThanEquals,
+    In,
+)
+from boto3.dynamodb.conditions import Key as BotoKey
+from boto3.dynamodb.conditions import LessThan, LessThanEquals
+
+from awstin.dynamodb.orm import parse_attribute_path
+
+# Conditions that can be used on a sort key in a key condition
+_SORT_KEY_CONDITIONS = (
+    Equals,
+    Between,
+    BeginsWith,
+    LessThan,
+    LessThanEquals,
+    GreaterThan,
+    GreaterThanEquals,
+)
+
+
+class _Target:
+    """
+    The table or one of its indexes, as a candidate to query
+    """
+
+    def __init__(self, index_name, key_names, projected, own):
+        # Index name, or None for the table
+        self.index_name = index_name
+        # Partition key and sort key (if any)
+        self.key_names = key_names
+        # Projected attribute names, or None if all attributes are projected
+        self.projected = projected
+        # Whether this is the table or index the data model represents
+        self.own = own
+
+    @property
+    def label(self):
+        if self.index_name is None:
+            return "table"
+        return f"index {self.index_name!r}"
+
+
+def _targets(table):
+    """
+    The table and indexes a Table's data model can be read from
+    """
+    index_name = getattr(table.data_model, "_index_name_", None)
+
+    if index_name is not None:
+        return [
+            _Target(
+                index_name,
+                table._model_key_names(),
+                table._projected_attributes(index_name),
+                own=True,
+            )
+        ]
+
+    targets = [_Target(None, table._primary_key_names(), None, own=True)]
+    for index in table._index_descriptions():
+        if index.get("IndexStatus", "ACTIVE") != "ACTIVE":
+            continue
+        targets.append(
+            _Target(
+                index["IndexName"],
+                table._index_key_names(index["IndexName"]),
+                table._projected_attributes(index["IndexName"]),
+                own=False,
+            )
+        )
+    return targets
+
+
+def _conjuncts(condition):
+    """
+    The conditions that must all hold for a condition to hold
+    """
+    if isinstance(condition, And):
+        return [
+            conjunct
+            for value in condition.get_expression()["values"]
+            for conjunct in _conjuncts(value)
+        ]
+    return [condition]
+
+
+def _tested_name(condition):
+    """
+    Name of the attribute a comparison tests, or None
+    """
+    values = condition.get_expression()["values"]
+    if values and isinstance(values[0], AttributeBase):
+        return values[0].name
+    return None
+
+
+def _referenced_attributes(condition):
+    """
+    Names of the top-level attributes a condition refers to
+    """
+    names = set()
+    for value in condition.get_expression()["values"]:
+        if isinstance(value, ConditionBase):
+            names |= _referenced_attributes(value)
+        elif isinstance(value, AttributeBase):
+            names.add(parse_attribute_path(value.name)[0])
+    return names
+
+
+def _as_key_condition(condition, name):
+    values = condition.get_expression()["values"]
+    return type(condition)(BotoKey(name), *values[1:])
+
+
+class QueryPlan:
+    """
+    How :meth:`awstin.dynamodb.Table.find` reads the items matching a
+    condition: a query on the table or the best-matching index, or a scan.
+
+    Iterating the plan runs it, yielding the matching items. ``explain()``
+    describes the choice made.
+    """
+
+    def __init__(self, table, condition, segments=None, backfill=False):
+        """
+        Parameters
+        ----------
+        table : Table
+            Table to read
+        condition : Query
+            Condition constructed with awstin's query syntax
+        segments : int, optional
+            Number of segments to scan in parallel, if the condition can't be
+            queried
+        backfill : bool, optional
+            Whether indexes that don't project all of the data model's
+            attributes may be read, fetching the missing attributes from the
+            table (default False)
+        """
+        if not isinstance(condition, ConditionBase):
+            raise TypeError(f"Expected a condition, got {condition!r}")
+
+        self.table = table
+        self.condition = condition
+        self.segments = segments
+        self.backfill = backfill
+
+        #: "query" or "scan"
+        self.operation = "scan"
+        #: Index read, or None for the table
+        self.index_name = getattr(table.data_model, "_index_name_", None)
+        #: Key condition of the query
+        self.key_condition = None
+        #: Filter applied to the items read
+        self.filter_expression = condition
+
+        self._key_conditions = None
+        self._target = None
+        self._considered = []
+
+        self._choose()
+
+    def _choose(self):
+        conjuncts = _conjuncts(self.condition)
+        model_attributes = set()
+        if not self.backfill:
+            model_attributes = {
+                parse_attribute_path(name)[0]
+                for name in self.table.data_model._dynamodb_attributes()
+            }
+        suffixed = self.table._suffixed_partition_key()
+
+        best = None
+        best_rank = None
+        for target in _targets(self.table):
+            match = self._match(target, conjuncts, model_attributes, suffixed)
+            if isinstance(match, str):
+                self._considered.append((target, match))
+                continue
+            rank = (match[0], target.own)
+            self._considered.append((target, None))
+            if best_rank is None or rank > best_rank:
+                best, best_rank = (target, match), rank
+
+        if best is not None:
+            target, (_, key_conditions, residual) = best
+            self.operation = "query"
+            self.index_name = target.index_name
+            self._target = target
+            self._key_conditions = key_conditions
+            self.key_condition = functools.reduce(operator.and_, key_conditions)
+            self.filter_expression = (
+                functools.reduce(operator.and_, residual) if residual else None
+            )
+
+        if (
+            suffixed is not None
+            and suffixed[1]._bucket is not None
+            and self.filter_expression is not None
+            and suffixed[0] in _referenced_attributes(self.filter_expression)
+        ):
+            # The stored values have a time bucket suffix, so a filter on the
+            # logical value can't match
+            message = (
+                f"Can't filter on the time-bucketed key {suffixed[0]!r}, only "
+                "query its time buckets"
+            )
+            reason = next(reason for target, reason in self._considered if target.own)
+            if reason is not None:
+                message += f", which needs a time range: {reason}"
+            raise ValueError(message)
+
+        if self.operation == "query":
+            # Filters on a write-sharded key test each shard's stored value
+            self.filter_expression = self.table._stored_filter(self.filter_expression)
+        else:
+            # Scans rewrite their filter, so only check it can be rewritten
+            self.table._stored_filter(self.condition)
+
+    def _match(self, target, conjuncts, model_attributes, suffixed):
+        """
+        How well a condition can be queried on a table or index, as (sort key
+        rank, key conditions, remaining conditions), or the reason it can't
+        """
+        partition_key, *sort_key = target.key_names
+        bucketed = (
+            target.own and suffixed is not None and suffixed[1]._bucket is not None
+        )
+
+        partition_test = next(
+            (
+                conjunct
+                for conjunct in conjuncts
+                if isinstance(conjunct, (Equals, In))
+                and _tested_name(conjunct) == partition_key
+            ),
+            None,
+        )
+        if partition_test is None:
+            return f"no equality condition on partition key {partition_key!r}"
+
+        key_tests = [partition_test]
+        key_conditions = [_as_key_condition(partition_test, partition_key)]
+        sort_rank = 0
+        if bucketed:
+            time_range = self._time_range(sort_key, conjuncts, suffixed)
+            if isinstance(time_range, str):
+                return time_range
+            range_tests, range_condition = time_range
+            key_tests.extend(range_tests)
+            key_conditions.append(range_condition)
+            sort_rank = 2 if isinstance(range_condition, Equals) else 1
+        elif sort_key:
+            sort_tests = [
+                conjunct
+                for conjunct in conjuncts
+                if isinstance(conjunct, _SORT_KEY_CONDITIONS)
+                and _tested_name(conjunct) == sort_key[0]
+            ]
+            if sort_tests:
+                sort_test = min(
+                    sort_tests,
+                    key=lambda c: _SORT_KEY_CONDITIONS.index(type(c)),
+                )
+                key_tests.append(sort_test)
+                key_conditions.append(_as_key_condition(sort_test, sort_key[0]))
+                sort_rank = 2 if isinstance(sort_test, Equals) else 1
+
+        residual = [c for c in conjuncts if not any(c is t for t in key_tests)]
+
+        if target.projected is not None:
+            needed = set(model_attributes)
+            for conjunct in residual:
+                needed |= _referenced_attributes(conjunct)
+            missing = sorted(needed - target.projected)
+            if missing:
+                missing = ", ".join(repr(name) for name in missing)
+                return f"doesn't project {missing}"
+
+        return sort_rank, key_conditions, residual
+
+    def _time_range(self, sort_key, conjuncts, suffixed):
+        """
+        Tests of the sort key bounding the time range to query a
+        time-bucketed partition key over, and the key condition on the sort
+        key, or the reason there's none
+        """
+        name, key = suffixed
+        time_name = getattr(self.table.data_model, key._bucket_by)._awstin_name
+        if sort_key != [time_name]:
+            return (
+                f"partition key {name!r} is time-bucketed by "
+                f"{key._bucket_by!r}, which isn't the sort key"
+            )
+
+        tests = {}
+        for conjunct in conjuncts:
+            if _tested_name(conjunct) == time_name:
+                tests.setdefault(type(conjunct), conjunct)
+
+        for bounded in (Equals, Between):
+            if bounded in tests:
+                return [tests[bounded]], _as_key_condition(tests[bounded], time_name)
+        if GreaterThanEquals in tests and LessThanEquals in tests:
+            start = tests[GreaterThanEquals].get_expression()["values"][1]
+            end = tests[LessThanEquals].get_expression()["values"][1]
+            return (
+                [tests[GreaterThanEquals], tests[LessThanEquals]],
+                BotoKey(time_name).between(start, end),
+            )
+        return (
+            f"partition key {name!r} is time-bucketed, and there's no equality, "
+            f"between or >= and <= condition on {key._bucket_by!r} to pick the "
+            "time buckets to read"
+        )
+
+    def __iter__(self):
+        table = self.table
+        if self.operation == "scan":
+            return iter(
+                table.scan(
+                    self.filter_expression,
+                    segments=self.segments,
+                    backfill=self.backfill,
+                )
+            )
+        if self._target.own:
+            return iter(
+                table.query(
+                    self.key_condition,
+                    self.filter_expression,
+                    backfill=self.backfill,
+                )
+            )
+
+        return iter(
+            table._fan_out_query(
+                self._query_expressions(),
+                self.filter_expression,
+                index_name=self.index_name,
+                backfill=self.backfill,
+            )
+        )
+
+    def _query_expressions(self):
+        """
+        Key conditions of the queries to run: one per value of an ``in_``
+        condition on the partition key, and one per shard of a write-sharded
+        partition key
+        """
+        if self._target.own:
+            query_expressions = self.table._partition_queries(self.key_condition)
+            return query_expressions or [self.key_condition]
+
+        partition_condition, *sort_conditions = self._key_conditions
+        if isinstance(partition_condition, In):
+            attribute, values = partition_condition.get_expression()["values"]
+            partition_conditions = [attribute.eq(value) for value in values]
+        else:
+            partition_conditions = [partition_condition]
+        return [
+            functools.reduce(operator.and_, [condition, *sort_conditions])
+            for condition in partition_conditions
+        ]
+
+    def explain(self):
+        """
+        Describe how the items are read, and why
+
+        Returns
+        -------
+        str
+        """
+        if self.operation == "query":
+            key_names = ", ".join(
+                repr(name)
+                for name in self._target.key_names[: len(self._key_conditions)]
+            )
+            lines = [f"Query {self._target.label} on key {key_names}"]
+        else:
+            read = "table" if self.index_name is None else f"index {self.index_name!r}"
+            if self.segments is not None and self.segments > 1:
+                lines = [f"Parallel scan of {read} in {self.segments} segments"]
+            else:
+                lines = [f"Scan of {read}"]
+
+        if self.backfill:
+            missing = self.table._unprojected_attributes(self.index_name)
+            if missing:
+                missing = ", ".join(repr(name) for name in missing)
+                lines.append(f"Backfill {missing} from table")
+
+        if self.filter_expression is not None:
+            filtered = ", ".join(
+                repr(name)
+                for name in sorted(_referenced_attributes(self.filter_expression))
+            )
+            lines.append(f"Filter on {filtered}")
+
+        lines.append("Considered:")
+        for target, reason in self._considered:
+            if target is self._target:
+                reason = "chosen"
+            elif reason is None:
+                reason = "usable, but a worse match"
+            lines.append(f"  {target.label}: {reason}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"<QueryPlan {self.explain().splitlines()[0]!r}>"
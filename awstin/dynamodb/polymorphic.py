@@ -0,0 +1,154 @@
+import uuid
+
+from awstin.dynamodb.orm import NOT_SET
+
+
+class PolymorphicModel:
+    """
+    Several :class:`awstin.dynamodb.DynamoModel` subclasses stored in one
+    table, as in single-table designs.
+
+    Each item's type is told apart by a discriminator attribute, or by the
+    prefix of an attribute such as the sort key, e.g. ``"ORDER#2021-03-04"``.
+    A table bound to a polymorphic model with ``dynamodb[model]`` deserializes
+    every item it reads into the model its type maps to, so an item collection
+    of several types can be read with one query.
+
+    .. code-block:: python
+
+        entities = PolymorphicModel(
+            {"USER": User, "ORDER": Order},
+            discriminator="sk",
+            prefix_separator="#",
+        )
+        table = dynamodb[entities]
+
+    Items are written through the table with the models themselves.
+    """
+
+    def __init__(self, models, discriminator, prefix_separator=None, default=None):
+        """
+        Parameters
+        ----------
+        models : dict of (str, DynamoModel)
+            Model of each item type, by the value of the discriminator
+        discriminator : str
+            Name of the DynamoDB attribute identifying the type of an item
+        prefix_separator : str, optional
+            If given, the type of an item is the part of the discriminator
+            before the first separator, e.g. ``"#"``. Otherwise, the whole
+            value.
+        default : DynamoModel, optional
+            Model for items whose type isn't in ``models``. By default,
+            reading such an item raises ``ValueError``.
+
+        Raises
+        ------
+        ValueError
+            If the models don't share a table and index, or have
+            write-sharded or time-bucketed keys
+        """
+        all_models = list(models.values())
+        if default is not None:
+            all_models.append(default)
+        if not all_models:
+            raise ValueError("PolymorphicModel needs at least one model")
+
+        locations = {
+            (model._table_name_, getattr(model, "_index_name_", None))
+            for model in all_models
+        }
+        if len(locations) != 1:
+            raise ValueError("Polymorphic models must share a table and index")
+        if any(model._suffixed_keys() for model in all_models):
+            raise ValueError(
+                "Polymorphic models can't have write-sharded or time-bucketed keys"
+            )
+
+        ((self._table_name_, index_name),) = locations
+        if index_name is not None:
+            self._index_name_ = index_name
+
+        self.models = dict(models)
+        self.discriminator = discriminator
+        self.prefix_separator = prefix_separator
+        self.default = default
+
+        attributes = {}
+        for model in all_models:
+            attributes.update(model._dynamodb_attributes())
+        self._attributes = attributes
+        self._projected_names = list(dict.fromkeys([*attributes, discriminator]))
+
+    def __repr__(self):
+        models = ", ".join(
+            f"{value!r}: {model.__name__}" for value, model in self.models.items()
+        )
+        return f"PolymorphicModel({{{models}}}, {self.discriminator!r})"
+
+    def model_for(self, data):
+        """
+        Model of a serialized item
+
+        Parameters
+        ----------
+        data : dict of (str, Any)
+            Serialized item
+
+        Returns
+        -------
+        DynamoModel
+
+        Raises
+        ------
+        ValueError
+            If the item's type has no model and there's no default model
+        """
+        value = data.get(self.discriminator, NOT_SET)
+        if self.prefix_separator is not None and isinstance(value, str):
+            value = value.split(self.prefix_separator, 1)[0]
+        model = self.models.get(value, self.default)
+        if model is None:
+            raise ValueError(
+                f"No model for item with {self.discriminator!r} of {value!r}"
+            )
+        return model
+
+    def deserialize(self, data):
+        """
+        Deserialize JSON into the model of its type
+
+        Parameters
+        ----------
+        data : dict of (str, Any)
+            Serialized item
+
+        Returns
+        -------
+        DynamoModel
+            The deserialized data model
+        """
+        return self.model_for(data).deserialize(data)
+
+    # Data model interface used by Table
+
+    def _dynamodb_attributes(self):
+        return self._attributes
+
+    def _suffixed_keys(self):
+        return {}
+
+    def _get_kwargs(self):
+        kwargs = self._dynamo_projection()
+        if hasattr(self, "_index_name_"):
+            kwargs["IndexName"] = self._index_name_
+        return kwargs
+
+    def _dynamo_projection(self):
+        placeholders = {
+            "#" + str(uuid.uuid4())[:8]: name for name in self._projected_names
+        }
+        return dict(
+            ProjectionExpression=", ".join(placeholders.keys()),
+            ExpressionAttributeNames=placeholders,
+        )
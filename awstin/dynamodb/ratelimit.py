@@ -0,0 +1,218 @@
+import threading
+import time
+
+#: Capacity kind charged by read operations (get, query, scan)
+READ = "read"
+
+#: Capacity kind charged by write operations (put, update, delete)
+WRITE = "write"
+
+
+def consumed_capacity_units(consumed_capacity):
+    """
+    Total capacity units in a ``ConsumedCapacity`` response entry.
+
+    Parameters
+    ----------
+    consumed_capacity : dict or list of dict or None
+        ``ConsumedCapacity`` from a DynamoDB response. Batch operations return
+        a list with one entry per table.
+
+    Returns
+    -------
+    float or None
+        Total capacity units, or None if the response has no capacity info
+    """
+    if consumed_capacity is None:
+        return None
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+    return sum(entry.get("CapacityUnits", 0.0) for entry in consumed_capacity)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilling at a fixed rate.
+
+    The balance may go negative when a request is charged more units than
+    were available. Callers of ``acquire`` wait until the debt is repaid.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Parameters
+        ----------
+        rate : float
+            Tokens added per second
+        burst : float, optional
+            Maximum number of tokens held. Defaults to one second's worth
+        clock : callable, optional
+            Monotonic clock returning seconds
+        sleep : callable, optional
+            Function used to wait for tokens
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    @property
+    def tokens(self):
+        """
+        Currently available tokens
+        """
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self):
+        """
+        Block until the bucket holds a positive balance
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens > 0:
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            self._sleep(min(wait, 1.0))
+
+    def consume(self, tokens):
+        """
+        Charge tokens against the bucket without blocking
+
+        Parameters
+        ----------
+        tokens : float
+            Number of tokens to remove
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+
+class CapacityRateLimiter:
+    """
+    Client-side limiter for consumed read and write capacity units.
+
+    Attach to a :class:`awstin.dynamodb.Table` to keep a job within a fixed
+    share of the table's capacity, or to a :class:`awstin.dynamodb.DynamoDB`
+    client to also cover requests spanning tables: ``batch_get``,
+    ``batch_execute`` and transactions. Requests with a limiter ask for
+    ``ReturnConsumedCapacity`` and charge the units DynamoDB reports, so the
+    limiter tracks actual rather than estimated consumption. Writes rejected
+    by their condition are charged too, as they still consume capacity.
+
+    A limiter is thread-safe and may be shared by several tables and by the
+    worker threads of concurrent operations.
+    """
+
+    #: Units charged for a request whose response has no capacity information
+    default_units = 1.0
+
+    #: Errors of requests that DynamoDB evaluated, and so charged capacity for
+    charged_errors = frozenset(
+        ["ConditionalCheckFailedException", "TransactionCanceledException"]
+    )
+
+    def __init__(
+        self,
+        read_capacity=None,
+        write_capacity=None,
+        burst_seconds=1.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """
+        Parameters
+        ----------
+        read_capacity : float, optional
+            Read capacity units per second. Reads are unlimited if not given.
+        write_capacity : float, optional
+            Write capacity units per second. Writes are unlimited if not given.
+        burst_seconds : float, optional
+            Seconds of unused capacity that may be saved up for bursts
+            (default 1.0)
+        clock : callable, optional
+            Monotonic clock returning seconds
+        sleep : callable, optional
+            Function used to wait for capacity
+        """
+        self._buckets = {}
+        for kind, rate in ((READ, read_capacity), (WRITE, write_capacity)):
+            if rate is not None:
+                self._buckets[kind] = TokenBucket(
+                    rate,
+                    burst=rate * burst_seconds,
+                    clock=clock,
+                    sleep=sleep,
+                )
+
+    def limits(self, kind):
+        """
+        Whether this limiter restricts the given kind of capacity
+
+        Parameters
+        ----------
+        kind : str
+            ``READ`` or ``WRITE``
+        """
+        return kind in self._buckets
+
+    def acquire(self, kind):
+        """
+        Block until capacity of the given kind is available
+
+        Parameters
+        ----------
+        kind : str
+            ``READ`` or ``WRITE``
+        """
+        bucket = self._buckets.get(kind)
+        if bucket is not None:
+            bucket.acquire()
+
+    def consume(self, kind, consumed_capacity):
+        """
+        Charge the capacity reported by DynamoDB
+
+        Parameters
+        ----------
+        kind : str
+            ``READ`` or ``WRITE``
+        consumed_capacity : dict or list of dict or None
+            ``ConsumedCapacity`` from the DynamoDB response
+        """
+        bucket = self._buckets.get(kind)
+        if bucket is not None:
+            units = consumed_capacity_units(consumed_capacity)
+            bucket.consume(self.default_units if units is None else units)
+
+    def consume_error(self, kind, error):
+        """
+        Charge the capacity of a failed request. Writes rejected by their
+        condition and canceled transactions still consume capacity, while
+        throttled or invalid requests don't.
+
+        Parameters
+        ----------
+        kind : str
+            ``READ`` or ``WRITE``
+        error : botocore.exceptions.ClientError
+            The error of the request
+        """
+        if error.response.get("Error", {}).get("Code") in self.charged_errors:
+            self.consume(kind, error.response.get("ConsumedCapacity"))
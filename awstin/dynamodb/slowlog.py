@@ -0,0 +1,260 @@
+import logging
+import threading
+import time
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+
+from awstin.dynamodb.ratelimit import consumed_capacity_units
+
+#: Default logger for slow operations
+logger = logging.getLogger("awstin.dynamodb.slow")
+
+
+def render_expression(expression):
+    """
+    Human-readable text of a condition expression, with placeholders replaced
+    by attribute names and values
+
+    Parameters
+    ----------
+    expression : ConditionBase or str
+        A condition built with awstin's query syntax, or expression text
+
+    Returns
+    -------
+    str
+    """
+    if not isinstance(expression, ConditionBase):
+        return str(expression)
+
+    built = ConditionExpressionBuilder().build_expression(expression)
+    text = built.condition_expression
+    # Longest placeholders first so "#n1" does not clobber "#n10"
+    names = built.attribute_name_placeholders
+    for placeholder in sorted(names, key=len, reverse=True):
+        text = text.replace(placeholder, names[placeholder])
+    values = built.attribute_value_placeholders
+    for placeholder in sorted(values, key=len, reverse=True):
+        text = text.replace(placeholder, repr(values[placeholder]))
+    return text
+
+
+class OperationRecord:
+    """
+    Accumulated cost of one awstin table call, across all of its pages.
+
+    The record times the call from its creation until ``finish``.
+    """
+
+    def __init__(self, table, operation, index=None, expressions=None):
+        """
+        Parameters
+        ----------
+        table : str
+            Table name
+        operation : str
+            Operation name, e.g. "scan"
+        index : str, optional
+            Index name, if the call is made against an index
+        expressions : dict of (str, Any), optional
+            Expressions used by the call, e.g. {"FilterExpression": ...}
+        """
+        self.table = table
+        self.operation = operation
+        self.index = index
+        self.expressions = {
+            name: expression
+            for name, expression in (expressions or {}).items()
+            if expression is not None
+        }
+
+        self.pages = 0
+        self.items = 0
+        self.scanned_count = None
+        self.capacity_units = None
+        #: Seconds spent in DynamoDB requests, summed over requests made
+        #: concurrently
+        self.request_time = 0.0
+
+        self._started = time.monotonic()
+        self._finished = None
+
+        # Calls may make requests from several threads
+        self._lock = threading.Lock()
+
+    def finish(self):
+        """
+        Stop timing the call
+        """
+        self._finished = time.monotonic()
+
+    @property
+    def elapsed(self):
+        """
+        Wall-clock seconds the call took, or has taken so far if it isn't
+        finished
+        """
+        finished = self._finished if self._finished is not None else time.monotonic()
+        return finished - self._started
+
+    def add_response(self, response, latency):
+        """
+        Add a page of results to the record
+
+        Parameters
+        ----------
+        response : dict
+            The DynamoDB response
+        latency : float
+            Request latency in seconds
+        """
+        units = consumed_capacity_units(response.get("ConsumedCapacity"))
+
+        with self._lock:
+            self.pages += 1
+            self.request_time += latency
+
+            if "Count" in response:
+                self.items += response["Count"]
+            elif "Item" in response or "Attributes" in response:
+                self.items += 1
+
+            if "ScannedCount" in response:
+                self.scanned_count = (self.scanned_count or 0) + response[
+                    "ScannedCount"
+                ]
+
+            if units is not None:
+                self.capacity_units = (self.capacity_units or 0.0) + units
+
+    @property
+    def scan_ratio(self):
+        """
+        Items read per item returned, or None if not applicable
+        """
+        if self.scanned_count is None:
+            return None
+        return self.scanned_count / max(self.items, 1)
+
+
+class SlowOperationLogger:
+    """
+    Log awstin table calls that are slow or read far more items than they
+    return.
+
+    Pass to :class:`awstin.dynamodb.DynamoDB` (or a single
+    :class:`awstin.dynamodb.Table`). A call is logged once it completes, with
+    its operation, table and index, expression text, page count, consumed
+    capacity, wall-clock time and time spent in DynamoDB requests.
+
+    Calls returning items lazily, like scans, are timed until their results
+    are exhausted, including time the caller spends between items.
+    """
+
+    def __init__(
+        self,
+        latency_threshold=1.0,
+        scan_ratio_threshold=10.0,
+        min_scanned_count=100,
+        logger=logger,
+        level=logging.WARNING,
+    ):
+        """
+        Parameters
+        ----------
+        latency_threshold : float or None, optional
+            Log calls taking at least this many seconds of wall-clock time
+            (default 1.0). None disables the latency check.
+        scan_ratio_threshold : float or None, optional
+            Log queries and scans reading at least this many items per item
+            returned (default 10.0). None disables the ratio check.
+        min_scanned_count : int, optional
+            Only apply the ratio check to calls reading at least this many
+            items (default 100)
+        logger : logging.Logger, optional
+            Logger to write to (default "awstin.dynamodb.slow")
+        level : int, optional
+            Log level (default WARNING)
+        """
+        self.latency_threshold = latency_threshold
+        self.scan_ratio_threshold = scan_ratio_threshold
+        self.min_scanned_count = min_scanned_count
+        self.logger = logger
+        self.level = level
+
+    def reasons(self, record):
+        """
+        Reasons a completed call counts as slow
+
+        Parameters
+        ----------
+        record : OperationRecord
+            The completed call
+
+        Returns
+        -------
+        list of str
+            Empty if the call isn't slow
+        """
+        reasons = []
+        if (
+            self.latency_threshold is not None
+            and record.elapsed >= self.latency_threshold
+        ):
+            reasons.append("latency")
+        if (
+            self.scan_ratio_threshold is not None
+            and record.scan_ratio is not None
+            and record.scanned_count >= self.min_scanned_count
+            and record.scan_ratio >= self.scan_ratio_threshold
+        ):
+            reasons.append("scan_ratio")
+        return reasons
+
+    def observe(self, record):
+        """
+        Log a completed call if it's slow
+
+        Parameters
+        ----------
+        record : OperationRecord
+            The completed call
+        """
+        reasons = self.reasons(record)
+        if not reasons or not self.logger.isEnabledFor(self.level):
+            return
+
+        details = {
+            "operation": record.operation,
+            "table": record.table,
+            "index": record.index,
+            "reasons": reasons,
+            "pages": record.pages,
+            "items": record.items,
+            "scanned_count": record.scanned_count,
+            "capacity_units": record.capacity_units,
+            "elapsed": record.elapsed,
+            "request_time": record.request_time,
+            "expressions": {
+                name: render_expression(expression)
+                for name, expression in record.expressions.items()
+            },
+        }
+        self.logger.log(
+            self.level,
+            "Slow DynamoDB %s on %s%s (%s): %.3fs (%.3fs in requests) over %d "
+            "page(s), %d item(s) returned of %s scanned, %s capacity units, "
+            "expressions %r",
+            record.operation,
+            record.table,
+            f" index {record.index}" if record.index else "",
+            ", ".join(reasons),
+            record.elapsed,
+            record.request_time,
+            record.pages,
+            record.items,
+            record.scanned_count,
+            record.capacity_units,
+            details["expressions"],
+            extra={"awstin_slow_operation": details},
+        )
@@ -1,15 +1,154 @@
+import copy
+import functools
+import operator
 import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import boto3
+from boto3.dynamodb.conditions import (
+    And,
+)
+from boto3.dynamodb.conditions import Attr as BotoAttr
+from boto3.dynamodb.conditions import (
+    AttributeBase,
+    AttributeExists,
+    AttributeNotExists,
+    Between,
+    ConditionBase,
+    Equals,
+    In,
+)
+from boto3.dynamodb.conditions import Key as BotoKey
 from botocore.exceptions import ClientError
 
-from awstin.config import aws_config
+from awstin.config import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    aws_config,
+)
 from awstin.constants import TEST_DYNAMODB_ENDPOINT
-from awstin.dynamodb.utils import to_decimal
+from awstin.dynamodb.buckets import bucket_labels
+from awstin.dynamodb.conditions import add_expressions
+from awstin.dynamodb.errors import (
+    ConditionCheckFailed,
+    UnprocessedRequests,
+    deserialize_error_item,
+)
+from awstin.dynamodb.fanout import fan_out, pipelined, sort_value
+from awstin.dynamodb.orm import (
+    MAX_EXPRESSION_LENGTH,
+    NOT_SET,
+    UPDATE_ACTIONS,
+    Reference,
+    UpdateOperator,
+    combine_operators,
+    parse_attribute_path,
+)
+from awstin.dynamodb.planner import QueryPlan
+from awstin.dynamodb.ratelimit import READ, WRITE, consumed_capacity_units
+from awstin.dynamodb.slowlog import OperationRecord
+from awstin.dynamodb.utils import from_decimal, to_decimal
+from awstin.tracing import trace
 
 # Testing parameter to change table listing page size
 _PAGE_SIZE = 100
 
+# Maximum number of requests in a BatchWriteItem call
+BATCH_WRITE_SIZE = 25
+
+# Maximum number of keys in a BatchGetItem call
+BATCH_GET_SIZE = 100
+
+# Initial delay in seconds before retrying unprocessed batch requests
+_BATCH_RETRY_DELAY = 0.05
+
+# Most attempts at a batch request before giving up on its unprocessed requests
+MAX_BATCH_ATTEMPTS = 8
+
+# Maximum number of values of an IN comparison
+_MAX_IN_VALUES = 100
+
+# Operations of a table's requests that don't take its name as TableName
+_UNNAMED_OPERATIONS = frozenset(
+    ["batch_get_item", "batch_write_item", "execute_statement"]
+)
+
+# Errors of statements in a BatchExecuteStatement request that are retried
+_RETRIED_STATEMENT_ERRORS = frozenset(
+    [
+        "InternalServerError",
+        "ProvisionedThroughputExceeded",
+        "RequestLimitExceeded",
+        "ThrottlingError",
+    ]
+)
+
+# ReturnValues accepted by each write operation
+_RETURN_VALUES = {
+    "put_item": frozenset(["NONE", "ALL_OLD"]),
+    "update_item": frozenset(
+        ["NONE", "ALL_OLD", "UPDATED_OLD", "ALL_NEW", "UPDATED_NEW"]
+    ),
+    "delete_item": frozenset(["NONE", "ALL_OLD"]),
+}
+
+# Response keys recorded on request spans
+_SPAN_RESPONSE_ATTRIBUTES = [
+    ("Count", "aws.dynamodb.count"),
+    ("ScannedCount", "aws.dynamodb.scanned_count"),
+]
+
+
+def _key_names(key_schema):
+    return tuple(
+        entry["AttributeName"]
+        for key_type in ("HASH", "RANGE")
+        for entry in key_schema
+        if entry["KeyType"] == key_type
+    )
+
+
+def _only_adds(update):
+    """
+    Whether a serialized update expression is made only of ADD actions
+    """
+    expression = update["UpdateExpression"]
+    return not any(
+        expression.startswith(action + " ") or f" {action} " in expression
+        for action in UPDATE_ACTIONS
+        if action != "ADD"
+    )
+
+
+def _retry_unprocessed(operation, send, pending):
+    """
+    Send a batch request, then retry what it leaves unprocessed with
+    exponential backoff, up to ``MAX_BATCH_ATTEMPTS`` attempts in total
+
+    Parameters
+    ----------
+    operation : str
+        Name of the batch operation, for the error
+    send : callable
+        Sends the pending requests, and returns those left unprocessed
+    pending : Any
+        Requests to send
+
+    Raises
+    ------
+    UnprocessedRequests
+        If requests are still unprocessed after the last attempt
+    """
+    for attempt in range(MAX_BATCH_ATTEMPTS):
+        if attempt:
+            time.sleep(min(_BATCH_RETRY_DELAY * 2 ** (attempt - 1), 1.0))
+        pending = send(pending)
+        if not pending:
+            return
+    raise UnprocessedRequests(operation, pending, MAX_BATCH_ATTEMPTS)
+
 
 class DynamoDB:
     """
@@ -18,7 +157,18 @@ class DynamoDB:
     Tables are accessed via data models. See documentation for details.
     """
 
-    def __init__(self, timeout=5.0, max_retries=3):
+    def __init__(
+        self,
+        timeout=5.0,
+        max_retries=3,
+        max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=False,
+        read_timeout=60.0,
+        retry_mode=None,
+        metrics=None,
+        slow_log=None,
+        rate_limiter=None,
+    ):
         """
         Parameters
         ----------
@@ -26,6 +176,27 @@ class DynamoDB:
             Timeout for establishing a connection to DynamoDB (default 5.0)
         max_retries : int, optional
             Max retries for establishing a connection to DynamoDB (default 3)
+        max_pool_connections : int, optional
+            Size of the connection pool (default
+            ``DEFAULT_MAX_POOL_CONNECTIONS``)
+        tcp_keepalive : bool, optional
+            Whether to enable TCP keepalive (default False)
+        read_timeout : float, optional
+            Timeout for reading from a connection (default 60.0)
+        retry_mode : str, optional
+            botocore retry mode: "legacy", "standard" or "adaptive". By default,
+            botocore's configured mode is used: "legacy", unless set by the
+            AWS_RETRY_MODE environment variable or the AWS config file.
+            "standard" retries more errors with jittered backoff, and
+            "adaptive" is recommended for bulk jobs that may be throttled.
+        metrics : MetricsRegistry, optional
+            Registry recording metrics for every request made through tables
+            of this client
+        slow_log : SlowOperationLogger, optional
+            Logger for slow or costly calls made through tables of this client
+        rate_limiter : CapacityRateLimiter, optional
+            Limiter for the capacity consumed by requests spanning tables, and
+            by default through tables of this client
 
         Raises
         ------
@@ -35,12 +206,23 @@ class DynamoDB:
         """
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_pool_connections = max_pool_connections
+        self.tcp_keepalive = tcp_keepalive
+        self.read_timeout = read_timeout
+        self.retry_mode = retry_mode
+        self.metrics = metrics
+        self.slow_log = slow_log
+        self.rate_limiter = rate_limiter
 
         test_endpoint = os.environ.get(TEST_DYNAMODB_ENDPOINT)
         self.config = aws_config(
             timeout=timeout,
             max_retries=max_retries,
             endpoint=test_endpoint,
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=tcp_keepalive,
+            read_timeout=read_timeout,
+            retry_mode=retry_mode,
         )
         self.client = boto3.client("dynamodb", **self.config)
         self.resource = boto3.resource("dynamodb", **self.config)
@@ -54,18 +236,420 @@ class DynamoDB:
         list of str
             Table names
         """
-        response = self.client.list_tables(Limit=_PAGE_SIZE)
+        with trace("dynamodb.list_tables", **{"db.system": "dynamodb"}):
+            response = self.client.list_tables(Limit=_PAGE_SIZE)
         tables = response["TableNames"]
 
         while "LastEvaluatedTableName" in response:
-            response = self.client.list_tables(
-                Limit=_PAGE_SIZE,
-                ExclusiveStartTableName=response["LastEvaluatedTableName"],
-            )
+            with trace("dynamodb.list_tables", **{"db.system": "dynamodb"}):
+                response = self.client.list_tables(
+                    Limit=_PAGE_SIZE,
+                    ExclusiveStartTableName=response["LastEvaluatedTableName"],
+                )
             tables.extend(response["TableNames"])
 
         return tables
 
+    def batch_get(self, keys_by_model):
+        """
+        Get items of several data models with shared BatchGetItem requests.
+
+        Keys of all the models are packed together into requests of up to 100
+        keys, sent concurrently. Unprocessed keys are retried with exponential
+        backoff, and ``UnprocessedRequests`` is raised if some are still
+        unprocessed after ``MAX_BATCH_ATTEMPTS`` attempts.
+
+        ``dynamodb.batch_get({User: ["user-1", "user-2"], Order: [("user-1", 5)]})``
+
+        Parameters
+        ----------
+        keys_by_model : dict of (DynamoModel, list)
+            Primary keys of the items to get for each table data model. Keys
+            are given as for ``Table`` item access: the partition key value,
+            a (partition key, sort key) tuple, or a dict.
+
+        Returns
+        -------
+        dict of (DynamoModel, list of DynamoModel)
+            Items found for each model, in the order of their keys. Keys of
+            missing items are left out.
+
+        Raises
+        ------
+        ValueError
+            If a model represents an index
+        """
+        for model in keys_by_model:
+            if hasattr(model, "_index_name_"):
+                raise ValueError("Items can't be read from an index in a batch")
+
+        tables = {model: self[model] for model in keys_by_model}
+        keys = {
+            tables[model]: list(
+                dict.fromkeys(tables[model]._key_values(key) for key in model_keys)
+            )
+            for model, model_keys in keys_by_model.items()
+        }
+        found = self._get_many(keys)
+        return {
+            model: [found[table][key] for key in keys[table] if key in found[table]]
+            for model, table in tables.items()
+        }
+
+    def _get_many(self, keys_by_table):
+        """
+        Items with the given primary keys, fetched with BatchGetItem requests
+        of up to 100 keys shared between tables
+
+        Parameters
+        ----------
+        keys_by_table : dict of (Table, list of tuple)
+            Distinct primary key values for each table, in the order of its
+            key schema
+
+        Returns
+        -------
+        dict of (Table, dict)
+            Data models found for each table, by primary key values
+        """
+        attributes = {}
+        stored_keys = {}
+        for table, keys in keys_by_table.items():
+            attributes.setdefault(table.name, {}).update(
+                table.data_model._dynamodb_attributes()
+            )
+            key_names = table._primary_key_names()
+            table_keys = stored_keys.setdefault(table.name, {})
+            for key in keys:
+                for stored_key in table._item_keys(
+                    {name: to_decimal(value) for name, value in zip(key_names, key)}
+                ):
+                    identity = tuple(sort_value(stored_key[name]) for name in key_names)
+                    table_keys[identity] = stored_key
+
+        projections = {}
+        for table_name, names in attributes.items():
+            placeholders = {f"#g{i}": name for i, name in enumerate(names)}
+            projections[table_name] = dict(
+                ProjectionExpression=", ".join(placeholders),
+                ExpressionAttributeNames=placeholders,
+            )
+
+        entries = [
+            (table_name, stored_key)
+            for table_name, table_keys in stored_keys.items()
+            for stored_key in table_keys.values()
+        ]
+        requests = []
+        for start in range(0, len(entries), BATCH_GET_SIZE):
+            request_items = {}
+            for table_name, stored_key in entries[start : start + BATCH_GET_SIZE]:
+                if table_name not in request_items:
+                    request_items[table_name] = {
+                        "Keys": [],
+                        **projections[table_name],
+                    }
+                request_items[table_name]["Keys"].append(stored_key)
+            requests.append(request_items)
+
+        responses = []
+        if requests:
+            with ThreadPoolExecutor(
+                max_workers=min(DEFAULT_CONCURRENCY, len(requests))
+            ) as executor:
+                responses = list(executor.map(self._batch_get_items, requests))
+
+        found = {table: {} for table in keys_by_table}
+        for table, keys in keys_by_table.items():
+            wanted = set(keys)
+            model_attrs = table.data_model._dynamodb_attributes()
+            key_names = table._primary_key_names()
+            for response in responses:
+                for data in response.get(table.name, []):
+                    item = table.data_model.deserialize(data)
+                    key = tuple(getattr(item, model_attrs[name]) for name in key_names)
+                    if key in wanted:
+                        found[table][key] = item
+        return found
+
+    def _batch_get_items(self, request_items):
+        """
+        Send a BatchGetItem request, retrying unprocessed keys with
+        exponential backoff
+
+        Parameters
+        ----------
+        request_items : dict
+            ``RequestItems`` of the request
+
+        Returns
+        -------
+        dict of (str, list of dict)
+            Raw items found, by table name
+
+        Raises
+        ------
+        UnprocessedRequests
+            If keys are still unprocessed after ``MAX_BATCH_ATTEMPTS`` attempts
+        """
+        items = {}
+
+        def send(request_items):
+            response = self._client_request(
+                "batch_get_item", READ, request_items, RequestItems=request_items
+            )
+            for table_name, table_items in response["Responses"].items():
+                items.setdefault(table_name, []).extend(table_items)
+            return response.get("UnprocessedKeys")
+
+        _retry_unprocessed("batch_get_item", send, request_items)
+        return items
+
+    def _client_request(self, operation, capacity, table_names, **kwargs):
+        """
+        Make a request spanning tables with the resource's low-level client,
+        rate limited, traced and recorded in the client's metrics
+
+        Parameters
+        ----------
+        operation : str
+            Name of the client method, e.g. "transact_write_items"
+        capacity : str
+            Kind of capacity the request consumes, ``READ`` or ``WRITE``
+        table_names : iterable of str
+            Names of the tables the request reads or writes
+        **kwargs
+            Request parameters
+
+        Returns
+        -------
+        dict
+            The DynamoDB response
+        """
+        limiter = self.rate_limiter
+        if limiter is not None and not limiter.limits(capacity):
+            limiter = None
+        metrics = self.metrics
+
+        if metrics is not None:
+            kwargs["ReturnConsumedCapacity"] = "INDEXES"
+        elif limiter is not None:
+            kwargs["ReturnConsumedCapacity"] = "TOTAL"
+        table_names = ",".join(sorted(set(table_names)))
+
+        if limiter is not None:
+            limiter.acquire(capacity)
+
+        with trace(
+            "dynamodb." + operation,
+            **{
+                "db.system": "dynamodb",
+                "db.operation": operation,
+                "aws.dynamodb.table_names": table_names,
+            },
+        ):
+            start = time.perf_counter()
+            try:
+                response = getattr(self.resource.meta.client, operation)(**kwargs)
+            except ClientError as e:
+                if limiter is not None:
+                    limiter.consume_error(capacity, e)
+                if metrics is not None:
+                    latency = time.perf_counter() - start
+                    metrics.record_error(
+                        table_names, None, operation, capacity, e, latency
+                    )
+                raise
+            latency = time.perf_counter() - start
+
+        if limiter is not None:
+            limiter.consume(capacity, response.get("ConsumedCapacity"))
+        if metrics is not None:
+            metrics.record_response(
+                table_names, None, operation, capacity, response, latency
+            )
+        return response
+
+    def batch_execute(self, statements):
+        """
+        Execute many single-item PartiQL statements with BatchExecuteStatement
+        requests of up to 25 statements, sent concurrently.
+
+        Reads and writes are sent in separate requests, as DynamoDB requires.
+        Statements failing with throttling or internal errors are retried with
+        exponential backoff, up to ``MAX_BATCH_ATTEMPTS`` attempts.
+
+        .. code-block:: python
+
+            movies = dynamodb.batch_execute(
+                [
+                    (Movie, 'SELECT * FROM "movies" WHERE title = ?', [title])
+                    for title in titles
+                ]
+            )
+
+        Parameters
+        ----------
+        statements : iterable of tuple
+            (data model, statement) or (data model, statement, parameters)
+            tuples. Parameters are given as for ``Table.execute``.
+
+        Returns
+        -------
+        list of (DynamoModel or None)
+            For each statement in order, the item it read, or None if it found
+            no item, is a write, or its condition wasn't satisfied
+
+        Raises
+        ------
+        botocore.exceptions.ClientError
+            If a statement fails for another reason. Other statements may have
+            been executed.
+        """
+        from awstin.dynamodb.partiql import BATCH_STATEMENT_SIZE, prepare_statement
+
+        models = []
+        requests = {True: [], False: []}
+        for position, (model, statement, *params) in enumerate(statements):
+            prepared = prepare_statement(statement)
+            models.append(model)
+            requests[prepared.reads].append(
+                (position, prepared.request(params[0] if params else None))
+            )
+
+        chunks = [
+            (capacity, entries[start : start + BATCH_STATEMENT_SIZE])
+            for capacity, entries in ((READ, requests[True]), (WRITE, requests[False]))
+            for start in range(0, len(entries), BATCH_STATEMENT_SIZE)
+        ]
+
+        def execute(chunk):
+            capacity, entries = chunk
+            return self._batch_execute_statements(
+                [models[position]._table_name_ for position, _ in entries],
+                capacity,
+                entries,
+            )
+
+        results = [None] * len(models)
+        if chunks:
+            with ThreadPoolExecutor(
+                max_workers=min(DEFAULT_CONCURRENCY, len(chunks))
+            ) as executor:
+                for responses in executor.map(execute, chunks):
+                    for position, response in responses:
+                        error = response.get("Error")
+                        if error is not None:
+                            if error["Code"] == "ConditionalCheckFailed":
+                                continue
+                            raise ClientError({"Error": error}, "BatchExecuteStatement")
+                        if "Item" in response:
+                            results[position] = models[position].deserialize(
+                                response["Item"]
+                            )
+        return results
+
+    def _batch_execute_statements(self, table_names, capacity, entries):
+        """
+        Send a BatchExecuteStatement request, retrying statements failing with
+        throttling or internal errors with exponential backoff
+
+        Parameters
+        ----------
+        table_names : list of str
+            Names of the tables the statements use
+        capacity : str
+            ``READ`` or ``WRITE``
+        entries : list of (int, dict)
+            Position and request of each statement
+
+        Returns
+        -------
+        list of (int, dict)
+            Position and response of each statement
+
+        Raises
+        ------
+        UnprocessedRequests
+            If statements still fail after ``MAX_BATCH_ATTEMPTS`` attempts.
+            Its ``unprocessed`` are the statement requests.
+        """
+        results = []
+
+        def send(entries):
+            response = self._client_request(
+                "batch_execute_statement",
+                capacity,
+                table_names,
+                Statements=[request for _, request in entries],
+            )
+            retried = []
+            for entry, result in zip(entries, response["Responses"]):
+                if result.get("Error", {}).get("Code") in _RETRIED_STATEMENT_ERRORS:
+                    retried.append(entry)
+                else:
+                    results.append((entry[0], result))
+            return retried
+
+        try:
+            _retry_unprocessed("batch_execute_statement", send, entries)
+        except UnprocessedRequests as e:
+            e.unprocessed = [request for _, request in e.unprocessed]
+            raise
+        return results
+
+    def transact_write(self, client_token=None):
+        """
+        Start an atomic write to items of several data models. See
+        ``TransactWrite``.
+
+        ``with dynamodb.transact_write() as transaction: transaction.put(item)``
+
+        Parameters
+        ----------
+        client_token : str, optional
+            Idempotency token of the transaction. Committing a transaction
+            with the same token again within 10 minutes doesn't repeat its
+            writes. By default, a random token.
+
+        Returns
+        -------
+        TransactWrite
+        """
+        from awstin.dynamodb.transactions import TransactWrite
+
+        return TransactWrite(self, client_token=client_token)
+
+    def transact_get(self, keys):
+        """
+        Get items of several data models atomically with a TransactGetItems
+        request.
+
+        ``user, order = dynamodb.transact_get([(User, "u-1"), (Order, ("u-1", 5))])``
+
+        Parameters
+        ----------
+        keys : iterable of (DynamoModel, Any)
+            Data model and primary key of each item, of up to 100 items. Keys
+            are given as for ``Table`` item access.
+
+        Returns
+        -------
+        list of (DynamoModel or None)
+            The items, in the order of their keys. None for missing items.
+
+        Raises
+        ------
+        ValueError
+            If more than 100 items are requested, a model represents an index,
+            or the shard of a write-sharded key isn't known
+        TransactionCanceled
+            If the read conflicts with a transactional write in progress
+        """
+        from awstin.dynamodb.transactions import transact_get
+
+        return transact_get(self, keys)
+
     def __getitem__(self, data_model):
         """
         Indexed access to DynamoDB tables via Python data models.
@@ -99,7 +683,14 @@ class Table:
 
     """
 
-    def __init__(self, dynamodb_client, data_model):
+    def __init__(
+        self,
+        dynamodb_client,
+        data_model,
+        rate_limiter=None,
+        metrics=None,
+        slow_log=None,
+    ):
         """
         Paramters
         ---------
@@ -107,225 +698,2194 @@ class Table:
             DynamoDB client
         data_model : DynamoDB Table
             Data model for interfacing with the table's contents
+        rate_limiter : CapacityRateLimiter, optional
+            Limiter for the read and write capacity consumed through this
+            table. Defaults to the limiter of the DynamoDB client.
+        metrics : MetricsRegistry, optional
+            Registry recording metrics for this table's requests. Defaults to
+            the registry of the DynamoDB client.
+        slow_log : SlowOperationLogger, optional
+            Logger for slow or costly calls on this table. Defaults to the
+            slow operation logger of the DynamoDB client.
         """
         self.data_model = data_model
         self.name = data_model._table_name_
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else dynamodb_client.rate_limiter
+        )
+        self.metrics = metrics if metrics is not None else dynamodb_client.metrics
+        self.slow_log = slow_log if slow_log is not None else dynamodb_client.slow_log
 
         self._dynamodb = dynamodb_client
-        self._boto3_table = dynamodb_client.resource.Table(self.name)
-
-    def _get_primary_key(self, key):
-        if isinstance(key, dict):
-            key = {k: to_decimal(v) for k, v in key.items()}
-            primary_key = key
-        else:
-            table_description = self._dynamodb.client.describe_table(
-                TableName=self.name,
-            )
-            (partition_key,) = [
-                entry["AttributeName"]
-                for entry in table_description["Table"]["KeySchema"]
-                if entry["KeyType"] == "HASH"
-            ]
-            if isinstance(key, tuple):
-                (sort_key,) = [
-                    entry["AttributeName"]
-                    for entry in table_description["Table"]["KeySchema"]
-                    if entry["KeyType"] == "RANGE"
-                ]
-                primary_key = {
-                    partition_key: to_decimal(key[0]),
-                    sort_key: to_decimal(key[1]),
-                }
-            else:
-                primary_key = {partition_key: to_decimal(key)}
-        return primary_key
+        # Requests are made with the resource's low-level client, which,
+        # unlike boto3 resources, may be shared by the worker threads of
+        # concurrent operations. It serializes Python values like the
+        # resource.
+        self._client = dynamodb_client.resource.meta.client
+        self._description = None
 
-    def __getitem__(self, key):
+    def _operation_record(self, operation, index_name=None, **expressions):
         """
-        Get an item, given either a primary key as a dict, or given simply the
-        value of the partition key if there is no sort key
+        Start recording the cost of a call, if slow operations are logged.
 
         Parameters
         ----------
-        key : Any
-            Primary key, specified as a hash key value, composite key tuple, or
-            a dict
-        """
-        primary_key = self._get_primary_key(key)
-        item = self._boto3_table.get_item(
-            Key=primary_key,
-            **self.data_model._dynamo_projection(),
-        )["Item"]
-        return self.data_model.deserialize(item)
+        operation : str
+            Name of the call, e.g. "scan"
+        index_name : str, optional
+            Index the call reads, if not the data model's
+        **expressions
+            Expressions used by the call, for logging
 
-    def put_item(self, item):
+        Returns
+        -------
+        OperationRecord or None
         """
-        Put an item in the table
+        if self.slow_log is None:
+            return None
+        if index_name is None:
+            index_name = getattr(self.data_model, "_index_name_", None)
+        return OperationRecord(
+            self.name,
+            operation,
+            index=index_name,
+            expressions=expressions,
+        )
 
-        Parameters
-        ----------
-        item : DynamoModel
-            The item to put in the table
+    def _finish(self, record):
         """
-        data = item.serialize()
-        return self._boto3_table.put_item(Item=data)
-
-    def update_item(self, key, update_expression, condition_expression=None):
+        Finish recording a call started with ``_operation_record``
         """
-        Update an item in the table given an awstin update expression.
+        if record is not None:
+            record.finish()
+            self.slow_log.observe(record)
 
-        Can optionally have a condition expression.
+    def _request(self, operation, capacity, record=None, **kwargs):
+        """
+        Make a request for the table with the low-level client.
 
         Parameters
-        ---------
-        key : Any
-            Primary key, specified as a hash key value, composite key tuple, or
-            a dict
-        update_expression : awstin.dynamodb.orm.UpdateOperator
-            Update expression. See docs for construction.
-        condition_expression : Query, optional
-            Optional condition expression
+        ----------
+        operation : str
+            Name of the client method, e.g. "get_item"
+        capacity : str
+            Kind of capacity the request consumes, ``READ`` or ``WRITE``
+        record : OperationRecord, optional
+            Record of the awstin call this request is part of
+        **kwargs
+            Request parameters
 
         Returns
         -------
-        DynamoModel or None
-            Updated model, or None if the condition expression fails
+        dict
+            The DynamoDB response
         """
-        boto_query = dict(
-            Key=self._get_primary_key(key),
-            ReturnValues="ALL_NEW",
-            **update_expression.serialize(),
-        )
+        limiter = self.rate_limiter
+        if limiter is not None and not limiter.limits(capacity):
+            limiter = None
+        metrics = self.metrics
 
-        if condition_expression:
-            boto_query["ConditionExpression"] = condition_expression
+        if metrics is not None:
+            kwargs.setdefault("ReturnConsumedCapacity", "INDEXES")
+        elif limiter is not None or record is not None:
+            kwargs.setdefault("ReturnConsumedCapacity", "TOTAL")
 
-        try:
-            result = self._boto3_table.update_item(**boto_query)
-        except ClientError as e:
-            if "ConditionalCheckFailedException" in str(e):
-                return None
-            else:
-                raise e
+        if limiter is not None:
+            limiter.acquire(capacity)
+
+        index = kwargs.get("IndexName")
+        span_attributes = {
+            "db.system": "dynamodb",
+            "db.operation": operation,
+            "aws.dynamodb.table_name": self.name,
+        }
+        if index is not None:
+            span_attributes["aws.dynamodb.index_name"] = index
+
+        if operation not in _UNNAMED_OPERATIONS:
+            kwargs["TableName"] = self.name
+
+        with trace("dynamodb." + operation, **span_attributes) as span:
+            start = time.perf_counter()
+            try:
+                response = getattr(self._client, operation)(**kwargs)
+            except ClientError as e:
+                if limiter is not None:
+                    limiter.consume_error(capacity, e)
+                if metrics is not None:
+                    latency = time.perf_counter() - start
+                    metrics.record_error(
+                        self.name, index, operation, capacity, e, latency
+                    )
+                raise
+            latency = time.perf_counter() - start
+
+            for key, attribute in _SPAN_RESPONSE_ATTRIBUTES:
+                if key in response:
+                    span.set_attribute(attribute, response[key])
+            units = consumed_capacity_units(response.get("ConsumedCapacity"))
+            if units is not None:
+                span.set_attribute("aws.dynamodb.consumed_capacity", units)
+
+        if limiter is not None:
+            limiter.consume(capacity, response.get("ConsumedCapacity"))
+        if record is not None:
+            record.add_response(response, latency)
+        if metrics is not None:
+            metrics.record_response(
+                self.name, index, operation, capacity, response, latency
+            )
 
-        return self.data_model.deserialize(result["Attributes"])
+        return response
 
-    def delete_item(self, key, condition_expression=None):
+    def _describe(self):
         """
-        Delete an item, given either a primary key as a dict, or given simply
-        the value of the partition key if there is no sort key
+        Description of the table, looked up once per Table
+        """
+        if self._description is None:
+            self._description = self._dynamodb.client.describe_table(
+                TableName=self.name,
+            )["Table"]
+        return self._description
 
-        Parameters
-        ----------
-        key : Any
-            Primary key of the entry to delete, specified as a hash key value,
-            composite key tuple, or a dict
-        condition_expression : Query, optional
-            Optional condition expression for the delete, intended to make the
-            operation idempotent
+    def _primary_key_names(self):
+        """
+        Names of the partition key and sort key (if any) of the table
 
         Returns
         -------
-        deleted : bool
-            True if the delete, False if the condition was not satisfied
-
-        Raises
-        ------
-        botocore.exceptions.ClientError
-            If there's an error in the request.
+        tuple of str
         """
-        primary_key = self._get_primary_key(key)
-        condition_kwargs = (
-            {"ConditionExpression": condition_expression}
-            if condition_expression is not None
-            else {}
-        )
+        return _key_names(self._describe()["KeySchema"])
 
-        try:
-            self._boto3_table.delete_item(
-                Key=primary_key,
-                **condition_kwargs,
-            )
-            return True
-        except ClientError as e:
-            if "ConditionalCheckFailedException" in str(e):
-                return False
-            else:
-                raise e
+    def _model_key_names(self):
+        """
+        Names of the partition key and sort key (if any) of the table or index
+        the data model represents
 
-    def scan(self, scan_filter=None):
+        Returns
+        -------
+        tuple of str
         """
-        Yield items in from the table, optionally matching the given filter
-        expression. Lazily paginates items internally.
+        index_name = getattr(self.data_model, "_index_name_", None)
+        if index_name is None:
+            return self._primary_key_names()
+        return self._index_key_names(index_name)
 
-        Parameters
-        ----------
-        scan_filter : Query
-            An optional query constructed with awstin's query framework
+    def _index_key_names(self, index_name):
+        """
+        Names of the partition key and sort key (if any) of a secondary index
 
-        Yields
-        ------
-        item : DynamoModel
-            An item in the table matching the filter
+        Returns
+        -------
+        tuple of str
         """
-        filter_kwargs = {}
+        return _key_names(self._index_description(index_name)["KeySchema"])
 
-        if scan_filter is not None:
-            filter_kwargs["FilterExpression"] = scan_filter
+    def _projected_attributes(self, index_name):
+        """
+        Names of the attributes a secondary index projects
 
-        results = self._boto3_table.scan(
-            **filter_kwargs,
-            **self.data_model._get_kwargs(),
+        Returns
+        -------
+        frozenset of str or None
+            None if the index projects all attributes
+        """
+        projection = self._index_description(index_name).get("Projection", {})
+        if projection.get("ProjectionType", "ALL") == "ALL":
+            return None
+        return frozenset(
+            self._primary_key_names()
+            + self._index_key_names(index_name)
+            + tuple(projection.get("NonKeyAttributes", ()))
         )
-        items = [self.data_model.deserialize(item) for item in results["Items"]]
-        yield from items
-
-        while "LastEvaluatedKey" in results:
-            results = self._boto3_table.scan(
-                ExclusiveStartKey=results["LastEvaluatedKey"],
-                **filter_kwargs,
-                **self.data_model._get_kwargs(),
-            )
-            items = [self.data_model.deserialize(item) for item in results["Items"]]
-            yield from items
 
-    def query(self, query_expression, filter_expression=None):
+    def _unprojected_attributes(self, index_name=None):
         """
-        Yield items from the table matching some query expression and optional
-        filter expression. Lazily paginates items internally.
+        Names of the data model's top-level attributes that an index doesn't
+        project
 
         Parameters
         ----------
-        query_expression : Query
-            A Key query constructed with awstin's query syntax
-        filter_expression : Query
-            An additional post-query filter expression constructed with
-            awstin's query syntax
+        index_name : str, optional
+            Index, if not the one the data model represents
 
-        Yields
+        Returns
+        -------
+        list of str
+        """
+        if index_name is None:
+            index_name = getattr(self.data_model, "_index_name_", None)
+            if index_name is None:
+                return []
+
+        projected = self._projected_attributes(index_name)
+        if projected is None:
+            return []
+        model_attributes = {
+            parse_attribute_path(name)[0]
+            for name in self.data_model._dynamodb_attributes()
+        }
+        return sorted(model_attributes - projected)
+
+    def _index_descriptions(self):
+        """
+        Descriptions of the table's global and local secondary indexes
+
+        Returns
+        -------
+        list of dict
+        """
+        description = self._describe()
+        return [
+            index
+            for section in ("GlobalSecondaryIndexes", "LocalSecondaryIndexes")
+            for index in description.get(section, [])
+        ]
+
+    def _index_description(self, index_name):
+        """
+        Description of one of the table's secondary indexes
+
+        Raises
+        ------
+        ValueError
+            If the table has no such index
+        """
+        for index in self._index_descriptions():
+            if index["IndexName"] == index_name:
+                return index
+        raise ValueError(f"Table {self.name!r} has no index {index_name!r}")
+
+    def _suffixed_partition_key(self):
+        """
+        The data model's partition key, if it's write-sharded or time-bucketed
+
+        Returns
+        -------
+        (str, Key) or None
+            DynamoDB name and Key attribute
+        """
+        suffixed_keys = self.data_model._suffixed_keys()
+        if not suffixed_keys:
+            return None
+        partition_key = self._model_key_names()[0]
+        if partition_key in suffixed_keys:
+            return partition_key, suffixed_keys[partition_key]
+        return None
+
+    def _randomly_sharded(self):
+        """
+        DynamoDB name of the partition key if it's write-sharded without
+        ``shard_by``, so an item may be in any shard. Otherwise None.
+        """
+        suffixed = self._suffixed_partition_key()
+        if suffixed is None:
+            return None
+        name, key = suffixed
+        if key._shards is None or key._shard_by is not None:
+            return None
+        return name
+
+    def _stored_filter(self, condition):
+        """
+        Filter expression testing the stored values of a write-sharded
+        partition key: tests of the logical value are replaced by tests of
+        each of its shards' values
+
+        Raises
+        ------
+        ValueError
+            If the condition compares a write-sharded partition key other than
+            by equality, or tests a time-bucketed partition key
+        """
+        suffixed = self._suffixed_partition_key()
+        if suffixed is None or not isinstance(condition, ConditionBase):
+            return condition
+        name, key = suffixed
+
+        def stored(condition):
+            values = condition.get_expression()["values"]
+            if not values or not isinstance(values[0], AttributeBase):
+                return type(condition)(
+                    *(
+                        stored(value) if isinstance(value, ConditionBase) else value
+                        for value in values
+                    )
+                )
+            if values[0].name != name or isinstance(
+                condition, (AttributeExists, AttributeNotExists)
+            ):
+                return condition
+
+            if key._bucket is not None:
+                raise ValueError(
+                    f"Can't filter on the time-bucketed key {name!r}. Query its "
+                    f"time buckets with a between condition on {key._bucket_by!r}."
+                )
+            if isinstance(condition, Equals):
+                logical_values = [values[1]]
+            elif isinstance(condition, In):
+                logical_values = values[1]
+            else:
+                raise ValueError(
+                    f"{name!r} is write-sharded, so can only be filtered on by "
+                    "equality"
+                )
+            stored_values = [
+                key._stored_value(value, shard)
+                for value in logical_values
+                for shard in range(key._shards)
+            ]
+            return functools.reduce(
+                operator.or_,
+                [
+                    In(values[0], stored_values[start : start + _MAX_IN_VALUES])
+                    for start in range(0, len(stored_values), _MAX_IN_VALUES)
+                ],
+            )
+
+        return stored(condition)
+
+    def _write_key(self, primary_key, update=None):
+        """
+        Stored primary key to write an item with the given primary key to,
+        picking the shard of write-sharded keys and the time bucket of
+        bucketed keys
+
+        Parameters
+        ----------
+        primary_key : dict
+            Primary key with the logical value of any sharded or bucketed key
+        update : dict, optional
+            Serialized update expression of an unconditional update. Updates
+            made only of ADD actions go to a random shard if the shard isn't
+            known, as they give the same totals whichever shard they're
+            applied to.
+
+        Returns
+        -------
+        dict
+
+        Raises
+        ------
+        ValueError
+            If the shard isn't known and the write isn't an unconditional
+            ADD update
+        """
+        suffixed = self._suffixed_partition_key()
+        if suffixed is None:
+            return primary_key
+
+        name, key = suffixed
+        suffix = self._known_suffix(name, primary_key, key)
+        if suffix is None:
+            if update is None or not _only_adds(update):
+                raise ValueError(
+                    f"The shard of {name!r} isn't known, so only unconditional "
+                    "ADD updates can be written to it. Declare the key with "
+                    "shard_by to write items by primary key."
+                )
+            suffix = random.randrange(key._shards)
+        return {**primary_key, name: key._stored_value(primary_key[name], suffix)}
+
+    def _item_keys(self, primary_key):
+        """
+        Stored primary keys to read a whole item from, see ``_read_keys``
+
+        Raises
+        ------
+        ValueError
+            If the partition key is randomly sharded, so each shard holds part
+            of the item
+        """
+        name = self._randomly_sharded()
+        if name is not None:
+            raise ValueError(
+                f"{name!r} is sharded randomly, so items can't be read by "
+                "primary key. Read counter totals with counter_value, or "
+                "declare the key with shard_by."
+            )
+        return self._read_keys(primary_key)
+
+    def _read_keys(self, primary_key):
+        """
+        Stored primary keys an item with the given primary key may be stored
+        under. All shards of write-sharded keys, unless the shard is known.
+
+        Parameters
+        ----------
+        primary_key : dict
+            Primary key with the logical value of any sharded or bucketed key
+
+        Returns
+        -------
+        list of dict
+        """
+        suffixed = self._suffixed_partition_key()
+        if suffixed is None:
+            return [primary_key]
+
+        name, key = suffixed
+        suffix = self._known_suffix(name, primary_key, key)
+        suffixes = range(key._shards) if suffix is None else [suffix]
+        return [
+            {**primary_key, name: key._stored_value(primary_key[name], suffix)}
+            for suffix in suffixes
+        ]
+
+    def _known_suffix(self, name, primary_key, key):
+        """
+        Suffix of a sharded or bucketed key given the rest of the primary key.
+        None for randomly sharded keys.
+
+        Raises
+        ------
+        ValueError
+            If the attribute picking the suffix isn't part of the primary key
+        """
+        picked_by = key._bucket_by if key._bucket is not None else key._shard_by
+        if picked_by is None:
+            return None
+
+        picked_by_name = getattr(self.data_model, picked_by)._awstin_name
+        if picked_by_name not in primary_key:
+            if key._bucket is None:
+                # Any shard may hold the item
+                return None
+            raise ValueError(
+                f"The value of {picked_by!r} is needed to find the stored value "
+                f"of {name!r}"
+            )
+
+        if key._bucket is not None:
+            return key._bucket_label(primary_key[picked_by_name])
+        return key._hash_shard(primary_key[picked_by_name])
+
+    def _key_values(self, key):
+        """
+        Values of a primary key in the order of the table's key schema, given
+        as for item access: the partition key value, a (partition key, sort
+        key) tuple, or a dict
+
+        Returns
+        -------
+        tuple
+        """
+        key_names = self._primary_key_names()
+        if isinstance(key, dict):
+            values = tuple(key[name] for name in key_names)
+        elif isinstance(key, tuple):
+            values = key
+        else:
+            values = (key,)
+        return tuple(from_decimal(value) for value in values)
+
+    def _get_primary_key(self, key):
+        """
+        Primary key as a dict, given as for item access: the partition key
+        value, a (partition key, sort key) tuple, or a dict
+        """
+        if isinstance(key, dict):
+            return {name: to_decimal(value) for name, value in key.items()}
+        if not isinstance(key, tuple):
+            key = (key,)
+        return {
+            name: to_decimal(value)
+            for name, value in zip(self._primary_key_names(), key)
+        }
+
+    def __getitem__(self, key):
+        """
+        Get an item, given either a primary key as a dict, or given simply the
+        value of the partition key if there is no sort key
+
+        Parameters
+        ----------
+        key : Any
+            Primary key, specified as a hash key value, composite key tuple, or
+            a dict
+        """
+        primary_key = self._get_primary_key(key)
+        record = self._operation_record("get_item")
+        try:
+            responses = self._get_items(
+                self._item_keys(primary_key),
+                record,
+                **self.data_model._dynamo_projection(),
+            )
+        finally:
+            self._finish(record)
+
+        for response in responses:
+            if "Item" in response:
+                return self.data_model.deserialize(response["Item"])
+        raise KeyError(key)
+
+    def _get_items(self, keys, record, **kwargs):
+        """
+        GetItem responses for each of the given keys, requested concurrently
+
+        Parameters
+        ----------
+        keys : list of dict
+            Stored primary keys
+        record : OperationRecord or None
+            Record of the awstin call the requests are part of
+        **kwargs
+            Additional request parameters
+
+        Returns
+        -------
+        list of dict
+        """
+        if len(keys) == 1:
+            return [self._request("get_item", READ, record, Key=keys[0], **kwargs)]
+
+        def get_item(key):
+            return self._request("get_item", READ, record, Key=key, **kwargs)
+
+        with ThreadPoolExecutor(
+            max_workers=min(DEFAULT_CONCURRENCY, len(keys))
+        ) as executor:
+            return list(executor.map(get_item, keys))
+
+    def _batch_get(self, keys, record=None, **kwargs):
+        """
+        Get up to 100 items with BatchGetItem, retrying unprocessed keys with
+        exponential backoff
+
+        Parameters
+        ----------
+        keys : list of dict
+            Distinct stored primary keys
+        record : OperationRecord, optional
+            Record of the awstin call this batch is part of
+        **kwargs
+            Additional parameters for the table, e.g. ``ProjectionExpression``
+
+        Returns
+        -------
+        list of dict
+            The items found, in no particular order
+
+        Raises
+        ------
+        UnprocessedRequests
+            If keys are still unprocessed after ``MAX_BATCH_ATTEMPTS`` attempts
+        """
+        items = []
+
+        def send(request_items):
+            response = self._request(
+                "batch_get_item", READ, record, RequestItems=request_items
+            )
+            items.extend(response["Responses"].get(self.name, []))
+            return response.get("UnprocessedKeys")
+
+        _retry_unprocessed(
+            "batch_get_item", send, {self.name: {"Keys": keys, **kwargs}}
+        )
+        return items
+
+    def counter_value(self, key, attribute):
+        """
+        Value of a numeric attribute summed over every shard of an item with
+        a write-sharded partition key, read concurrently. Shards without the
+        attribute count as 0. For other tables, the attribute's value.
+
+        Parameters
+        ----------
+        key : Any
+            Primary key, specified as a hash key value, composite key tuple, or
+            a dict
+        attribute : Attr
+            Counter attribute of the data model, e.g. ``Movie.views``
+
+        Returns
+        -------
+        int or float
+        """
+        primary_key = self._get_primary_key(key)
+        names = {}
+        projection = []
+        for segment in attribute._path:
+            if isinstance(segment, int):
+                projection[-1] += f"[{segment}]"
+            else:
+                placeholder = f"#p{len(names)}"
+                names[placeholder] = segment
+                projection.append(placeholder)
+
+        record = self._operation_record("counter_value")
+        try:
+            responses = self._get_items(
+                self._read_keys(primary_key),
+                record,
+                ProjectionExpression=".".join(projection),
+                ExpressionAttributeNames=names,
+            )
+        finally:
+            self._finish(record)
+
+        total = 0
+        for response in responses:
+            value = response.get("Item", {})
+            for segment in attribute._path:
+                try:
+                    value = value[segment]
+                except (KeyError, IndexError, TypeError):
+                    value = 0
+                    break
+            total += value
+        return from_decimal(total)
+
+    def put_item(
+        self,
+        item,
+        skip_unchanged=None,
+        condition_expression=None,
+        return_values="NONE",
+        return_values_on_condition_check_failure=None,
+    ):
+        """
+        Put an item in the table
+
+        Parameters
+        ----------
+        item : DynamoModel
+            The item to put in the table
+        skip_unchanged : ContentHashFilter, optional
+            Skip the write if the item is unchanged since it was last written
+            through this filter, or if it matches the hash stored on the item
+        condition_expression : Query or CompiledCondition, optional
+            Optional condition expression on the item being replaced. Can't be
+            combined with ``skip_unchanged``.
+        return_values : str, optional
+            "NONE" (default) or "ALL_OLD" to return the replaced item
+        return_values_on_condition_check_failure : str, optional
+            If given, a failed condition raises ``ConditionCheckFailed``,
+            holding the stored item if "ALL_OLD"
+
+        Returns
+        -------
+        dict or DynamoModel or None
+            The DynamoDB response, or None if the write was skipped or the
+            condition expression fails. With ``return_values="ALL_OLD"``, the
+            replaced item, or None if there was none.
+
+        Raises
+        ------
+        ValueError
+            If the return values are invalid, or a condition expression is
+            given with ``skip_unchanged``
+        ConditionCheckFailed
+            If the condition fails and
+            ``return_values_on_condition_check_failure`` is given
+        """
+        if condition_expression is not None and skip_unchanged is not None:
+            raise ValueError("condition_expression can't be used with skip_unchanged")
+
+        data = item.serialize()
+
+        if skip_unchanged is not None:
+            digest = skip_unchanged.content_hash(data)
+            key = tuple(data.get(name) for name in self._primary_key_names())
+            if skip_unchanged.unchanged(key, digest):
+                return None
+
+            hash_attribute = skip_unchanged.hash_attribute
+            if hash_attribute is not None:
+                data[hash_attribute] = digest
+                stored_hash = BotoAttr(hash_attribute)
+                condition_expression = stored_hash.not_exists() | stored_hash.ne(digest)
+
+        request = dict(Item=data)
+        self._add_return_values(
+            "put_item",
+            request,
+            return_values,
+            return_values_on_condition_check_failure,
+        )
+        add_expressions(request, ConditionExpression=condition_expression)
+
+        record = self._operation_record(
+            "put_item",
+            ConditionExpression=condition_expression,
+        )
+        try:
+            response = self._request("put_item", WRITE, record, **request)
+        except ClientError as e:
+            if (
+                condition_expression is not None
+                and "ConditionalCheckFailedException" in str(e)
+            ):
+                if skip_unchanged is not None:
+                    skip_unchanged.record(key, digest, skipped=True)
+                else:
+                    self._condition_failed(e, return_values_on_condition_check_failure)
+                return None
+            else:
+                raise e
+        finally:
+            self._finish(record)
+
+        if skip_unchanged is not None:
+            skip_unchanged.record(key, digest)
+        if return_values == "ALL_OLD":
+            return self._returned_item(response)
+        return response
+
+    def _add_return_values(self, operation, request, return_values, on_failure):
+        """
+        Add the ReturnValues parameters of a write to its request
+
+        Raises
+        ------
+        ValueError
+            If the operation doesn't accept the return values
+        """
+        if return_values not in _RETURN_VALUES[operation]:
+            raise ValueError(
+                f"Invalid return values for {operation}: {return_values!r}"
+            )
+        if return_values != "NONE":
+            request["ReturnValues"] = return_values
+
+        if on_failure is not None:
+            if on_failure not in ("NONE", "ALL_OLD"):
+                raise ValueError(
+                    f"Invalid return values on condition check failure: {on_failure!r}"
+                )
+            request["ReturnValuesOnConditionCheckFailure"] = on_failure
+
+    def _condition_failed(self, error, on_failure):
+        """
+        Raise ``ConditionCheckFailed`` for a failed condition, if return
+        values on condition check failure were asked for
+        """
+        if on_failure is not None:
+            item = deserialize_error_item(self.data_model, error.response.get("Item"))
+            raise ConditionCheckFailed(error, item) from error
+
+    def _returned_item(self, response):
+        """
+        Data model of the attributes returned by a write, or None
+        """
+        attributes = response.get("Attributes")
+        if attributes is None:
+            return None
+        return self.data_model.deserialize(attributes)
+
+    def put_items(self, items, skip_unchanged=None):
+        """
+        Put many items in the table with BatchWriteItem.
+
+        Items are written in batches of 25 as they're read from ``items``.
+        Items that DynamoDB leaves unprocessed, e.g. when throttled, are
+        retried with exponential backoff, up to ``MAX_BATCH_ATTEMPTS``
+        attempts, after which ``UnprocessedRequests`` is raised. If an item
+        occurs more than once in a batch, only the last is written.
+
+        Parameters
+        ----------
+        items : iterable of DynamoModel
+            The items to put in the table
+        skip_unchanged : ContentHashFilter, optional
+            Skip items unchanged since they were last written through this
+            filter. Batch writes can't be conditional, so a hash attribute is
+            written but not checked.
+
+        Returns
+        -------
+        int
+            Number of items written
+        """
+        key_names = self._primary_key_names()
+        record = self._operation_record("put_items")
+        written = 0
+        batch = {}
+        try:
+            for item in items:
+                data = item.serialize()
+                key = tuple(data.get(name) for name in key_names)
+
+                digest = None
+                if skip_unchanged is not None:
+                    digest = skip_unchanged.content_hash(data)
+                    if skip_unchanged.unchanged(key, digest):
+                        continue
+                    if skip_unchanged.hash_attribute is not None:
+                        data[skip_unchanged.hash_attribute] = digest
+
+                batch.pop(key, None)
+                batch[key] = (data, digest)
+                if len(batch) == BATCH_WRITE_SIZE:
+                    written += self._write_batch(batch, record, skip_unchanged)
+                    batch = {}
+
+            if batch:
+                written += self._write_batch(batch, record, skip_unchanged)
+        finally:
+            self._finish(record)
+
+        return written
+
+    def buffered(self, max_items=BATCH_WRITE_SIZE, max_age=1.0):
+        """
+        Write-behind buffer for this table, keeping only the last write per
+        primary key and writing in batches. See ``BufferedTable``.
+
+        ``with table.buffered() as buffer: buffer.put_item(item)``
+
+        Parameters
+        ----------
+        max_items : int, optional
+            Number of buffered keys triggering a flush (default 25)
+        max_age : float or None, optional
+            Seconds after the first buffered write at which the buffer is
+            flushed (default 1.0). None disables age-based flushes.
+
+        Returns
+        -------
+        BufferedTable
+        """
+        from awstin.dynamodb.buffered import BufferedTable
+
+        return BufferedTable(self, max_items=max_items, max_age=max_age)
+
+    def counters(self, flush_interval=1.0, max_keys=1000):
+        """
+        Aggregator summing counter increments in memory and writing them as
+        one update per key. See ``CounterAggregator``.
+
+        ``with table.counters() as counters: counters.add(key, Movie.views)``
+
+        Parameters
+        ----------
+        flush_interval : float or None, optional
+            Seconds after the first pending increment at which increments are
+            flushed (default 1.0). None disables interval flushes.
+        max_keys : int, optional
+            Maximum number of keys with pending increments (default 1000)
+
+        Returns
+        -------
+        CounterAggregator
+        """
+        from awstin.dynamodb.counters import CounterAggregator
+
+        return CounterAggregator(self, flush_interval=flush_interval, max_keys=max_keys)
+
+    def _write_batch(self, batch, record, skip_unchanged):
+        """
+        Write one batch of ``put_items``, recording the written hashes
+        """
+        self._batch_write(
+            [{"PutRequest": {"Item": data}} for data, _ in batch.values()],
+            record,
+        )
+        if skip_unchanged is not None:
+            for key, (_, digest) in batch.items():
+                skip_unchanged.record(key, digest)
+        return len(batch)
+
+    def _batch_write(self, requests, record=None):
+        """
+        Send up to 25 write requests with BatchWriteItem, retrying unprocessed
+        requests with exponential backoff
+
+        Parameters
+        ----------
+        requests : list of dict
+            PutRequest or DeleteRequest entries
+        record : OperationRecord, optional
+            Record of the awstin call this batch is part of
+
+        Raises
+        ------
+        UnprocessedRequests
+            If requests are still unprocessed after ``MAX_BATCH_ATTEMPTS``
+            attempts
+        """
+
+        def send(request_items):
+            response = self._request(
+                "batch_write_item", WRITE, record, RequestItems=request_items
+            )
+            return response.get("UnprocessedItems")
+
+        _retry_unprocessed("batch_write_item", send, {self.name: requests})
+
+    def update_item(
+        self,
+        key,
+        update_expression,
+        condition_expression=None,
+        split_oversized=False,
+        return_values="ALL_NEW",
+        return_values_on_condition_check_failure=None,
+    ):
+        """
+        Update an item in the table given an awstin update expression.
+
+        Can optionally have a condition expression.
+
+        Parameters
+        ---------
+        key : Any
+            Primary key, specified as a hash key value, composite key tuple, or
+            a dict
+        update_expression : awstin.dynamodb.orm.UpdateOperator
+            Update expression. See docs for construction. Prepared update
+            expressions (see ``UpdateOperator.prepare``) can be passed once
+            their parameters are bound.
+        condition_expression : Query or CompiledCondition, optional
+            Optional condition expression
+        split_oversized : bool, optional
+            If True, an unconditional update whose expression exceeds
+            DynamoDB's expression length limit is split across several
+            UpdateItem calls. The update is then not atomic. Default False.
+        return_values : str, optional
+            Attributes to return: "ALL_NEW" (default), "UPDATED_NEW",
+            "ALL_OLD", "UPDATED_OLD" or "NONE". "NONE" saves reading and
+            deserializing the item when the result isn't needed.
+        return_values_on_condition_check_failure : str, optional
+            If given, a failed condition raises ``ConditionCheckFailed``,
+            holding the stored item if "ALL_OLD"
+
+        Returns
+        -------
+        DynamoModel or bool or None
+            Returned attributes as the data model, with attributes not
+            returned unset. True if no attributes are returned, e.g. with
+            ``return_values="NONE"``. None if the condition expression fails.
+
+        Raises
+        ------
+        ValueError
+            If the return values are invalid, or the partition key is sharded
+            randomly and the update isn't made only of ADD actions, or has a
+            condition
+        ConditionCheckFailed
+            If the condition fails and
+            ``return_values_on_condition_check_failure`` is given
+        """
+        request = {}
+        self._add_return_values(
+            "update_item",
+            request,
+            return_values,
+            return_values_on_condition_check_failure,
+        )
+        serialized_update = update_expression.serialize()
+        primary_key = self._write_key(
+            self._get_primary_key(key),
+            serialized_update if condition_expression is None else None,
+        )
+
+        if (
+            split_oversized
+            and condition_expression is None
+            and isinstance(update_expression, UpdateOperator)
+            and len(serialized_update["UpdateExpression"]) > MAX_EXPRESSION_LENGTH
+        ):
+            result = None
+            for part in update_expression.split():
+                result = self._update_item(
+                    primary_key, part.serialize(), None, request, None
+                )
+            return result
+
+        return self._update_item(
+            primary_key,
+            serialized_update,
+            condition_expression,
+            request,
+            return_values_on_condition_check_failure,
+        )
+
+    def _update_item(
+        self,
+        primary_key,
+        serialized_update,
+        condition_expression,
+        return_kwargs,
+        on_failure,
+    ):
+        """
+        Make an UpdateItem request for ``update_item``, given the stored
+        primary key, serialized update expression and ReturnValues parameters
+        """
+        boto_query = dict(
+            Key=primary_key,
+            **return_kwargs,
+            **serialized_update,
+        )
+        add_expressions(boto_query, ConditionExpression=condition_expression)
+
+        record = self._operation_record(
+            "update_item",
+            UpdateExpression=boto_query["UpdateExpression"],
+            ConditionExpression=condition_expression,
+        )
+        try:
+            result = self._request("update_item", WRITE, record, **boto_query)
+        except ClientError as e:
+            if "ConditionalCheckFailedException" in str(e):
+                self._condition_failed(e, on_failure)
+                return None
+            else:
+                raise e
+        finally:
+            self._finish(record)
+
+        item = self._returned_item(result)
+        return True if item is None else item
+
+    def save(self, item, condition_expression=None):
+        """
+        Write the changes made to an item since it was loaded from the table.
+
+        Only the changed attributes are sent, as a single UpdateItem with SET
+        and REMOVE clauses. No request is made if nothing has changed. Items
+        not loaded from the table are written in full with PutItem. Once saved,
+        the item's changes are reset.
+
+        Parameters
+        ----------
+        item : DynamoModel
+            The item to save
+        condition_expression : Query or CompiledCondition, optional
+            Optional condition expression for the write
+
+        Returns
+        -------
+        saved : bool
+            True if the item was saved or unchanged, False if the condition
+            was not satisfied
+
+        Raises
+        ------
+        ValueError
+            If the data model represents an index, or if a key attribute of
+            a loaded item has changed
+        """
+        if hasattr(self.data_model, "_index_name_"):
+            raise ValueError("Items can't be saved through an index")
+
+        if item._loaded_ is None:
+            request = dict(Item=item.serialize())
+            operation = "put_item"
+        else:
+            changes = item.changed_attributes()
+            if not changes:
+                return True
+
+            key_attributes = type(item)._key_attributes()
+            changed_keys = set(key_attributes.values()) & set(changes)
+            if changed_keys:
+                raise ValueError(
+                    f"Key attributes can't be changed by save: {sorted(changed_keys)}"
+                )
+
+            model = type(item)
+            update_expression = combine_operators(
+                [
+                    (
+                        getattr(model, name).remove()
+                        if value is NOT_SET
+                        else getattr(model, name).set(value)
+                    )
+                    for name, value in changes.items()
+                ]
+            )
+            request = dict(
+                Key={
+                    dynamo_name: item._loaded_[dynamo_name]
+                    for dynamo_name in key_attributes
+                },
+                **update_expression.serialize(),
+            )
+            operation = "update_item"
+
+        add_expressions(request, ConditionExpression=condition_expression)
+
+        record = self._operation_record(
+            operation,
+            UpdateExpression=request.get("UpdateExpression"),
+            ConditionExpression=condition_expression,
+        )
+        try:
+            self._request(operation, WRITE, record, **request)
+        except ClientError as e:
+            if "ConditionalCheckFailedException" in str(e):
+                return False
+            else:
+                raise e
+        finally:
+            self._finish(record)
+
+        item._mark_saved()
+        return True
+
+    def delete_item(
+        self,
+        key,
+        condition_expression=None,
+        return_values="NONE",
+        return_values_on_condition_check_failure=None,
+    ):
+        """
+        Delete an item, given either a primary key as a dict, or given simply
+        the value of the partition key if there is no sort key. Items with a
+        write-sharded partition key are deleted from every shard they may be
+        stored in, in which case no condition or return values can be given.
+
+        Parameters
+        ----------
+        key : Any
+            Primary key of the entry to delete, specified as a hash key value,
+            composite key tuple, or a dict
+        condition_expression : Query or CompiledCondition, optional
+            Optional condition expression for the delete, intended to make the
+            operation idempotent
+        return_values : str, optional
+            "NONE" (default) or "ALL_OLD" to return the deleted item
+        return_values_on_condition_check_failure : str, optional
+            If given, a failed condition raises ``ConditionCheckFailed``,
+            holding the stored item if "ALL_OLD"
+
+        Returns
+        -------
+        deleted : bool or DynamoModel
+            True if the delete, False if the condition was not satisfied. With
+            ``return_values="ALL_OLD"``, the deleted item if there was one.
+
+        Raises
+        ------
+        ValueError
+            If the return values are invalid, or a condition or return values
+            are given for an item that may be in any shard
+        ConditionCheckFailed
+            If the condition fails and
+            ``return_values_on_condition_check_failure`` is given
+        botocore.exceptions.ClientError
+            If there's an error in the request.
+        """
+        request = {}
+        self._add_return_values(
+            "delete_item",
+            request,
+            return_values,
+            return_values_on_condition_check_failure,
+        )
+        add_expressions(request, ConditionExpression=condition_expression)
+        primary_key = self._get_primary_key(key)
+        stored_keys = self._read_keys(primary_key)
+        if len(stored_keys) > 1 and request:
+            # Each shard holds part of the item, so a condition or returned
+            # item would only be about one part
+            raise ValueError(
+                "Conditions and return values can't be used to delete items "
+                "that may be in any shard"
+            )
+
+        record = self._operation_record(
+            "delete_item",
+            ConditionExpression=condition_expression,
+        )
+        deleted = True
+        try:
+            # Items with randomly sharded keys may be stored in any shard
+            for stored_key in stored_keys:
+                try:
+                    response = self._request(
+                        "delete_item",
+                        WRITE,
+                        record,
+                        Key=stored_key,
+                        **request,
+                    )
+                except ClientError as e:
+                    if "ConditionalCheckFailedException" in str(e):
+                        self._condition_failed(
+                            e, return_values_on_condition_check_failure
+                        )
+                        deleted = False
+                    else:
+                        raise e
+                else:
+                    if deleted and "Attributes" in response:
+                        deleted = self._returned_item(response)
+        finally:
+            self._finish(record)
+        return deleted
+
+    def delete_where(
+        self, condition=None, parallelism=DEFAULT_CONCURRENCY, rate_limiter=None
+    ):
+        """
+        Delete every item matching a condition, or every item in the table.
+
+        Only the primary keys of the matching items are read, with a query
+        on the table or the best-matching index if the condition allows one
+        (see ``Table.find``), or else with a parallel scan. The items are
+        deleted with BatchWriteItem in batches of 25 across worker threads as
+        their keys are read.
+
+        ``table.delete_where(Event.device == "device-1")``
+
+        Parameters
+        ----------
+        condition : Query or CompiledCondition, optional
+            Condition constructed with awstin's query syntax. Compiled
+            conditions are scanned for. By default, every item is deleted.
+        parallelism : int, optional
+            Number of segments scanned in parallel, and of threads reading
+            keys and of threads sending deletes (default
+            ``DEFAULT_CONCURRENCY``). Reads and deletes run at the same time,
+            so each has at most half of the client's ``max_pool_connections``
+            threads.
+        rate_limiter : CapacityRateLimiter, optional
+            Limiter for the capacity consumed, in place of the table's
+
+        Returns
+        -------
+        int
+            Number of items deleted
+
+        Raises
         ------
-        item : DynamoModel
-            An item in the table matching thw query
+        ValueError
+            If the data model represents an index, ``parallelism`` is less
+            than 1, or the condition tests a time-bucketed partition key
+            without a time range to pick its buckets (see ``Table.find``)
+        """
+        if hasattr(self.data_model, "_index_name_"):
+            raise ValueError("Items can't be deleted through an index")
+        if parallelism < 1:
+            raise ValueError("parallelism must be at least 1")
+
+        plan = None
+        if isinstance(condition, ConditionBase):
+            plan = QueryPlan(self, condition, backfill=True)
+
+        table = self
+        if rate_limiter is not None:
+            table = copy.copy(self)
+            table.rate_limiter = rate_limiter
+
+        # Keep the reading and deleting threads within the connection pool
+        workers = max(1, min(parallelism, self._dynamodb.max_pool_connections // 2))
+
+        record = self._operation_record("delete_where", FilterExpression=condition)
+        try:
+            return table._delete_keys(
+                table._matching_keys(condition, plan, parallelism, workers, record),
+                workers,
+                record,
+            )
+        finally:
+            self._finish(record)
+
+    def _matching_keys(self, condition, plan, segments, workers, record):
+        """
+        Stored primary keys of the items matching a condition, read with
+        keys-only queries of a query plan or scan segments from ``workers``
+        threads
         """
-        query_kwargs = {}
+        key_names = self._primary_key_names()
+
+        def keys_only():
+            placeholders = {f"#k{i}": name for i, name in enumerate(key_names)}
+            return dict(
+                ProjectionExpression=", ".join(placeholders),
+                ExpressionAttributeNames=placeholders,
+            )
+
+        requests = []
+        if plan is not None and plan.operation == "query":
+            for query_expression in plan._query_expressions():
+                kwargs = keys_only()
+                if plan.index_name is not None:
+                    kwargs["IndexName"] = plan.index_name
+                add_expressions(
+                    kwargs,
+                    KeyConditionExpression=query_expression,
+                    FilterExpression=plan.filter_expression,
+                )
+                requests.append(("query", kwargs))
+        else:
+            condition = self._stored_filter(condition)
+            for segment in range(segments):
+                kwargs = keys_only()
+                if segments > 1:
+                    kwargs.update(Segment=segment, TotalSegments=segments)
+                add_expressions(kwargs, FilterExpression=condition)
+                requests.append(("scan", kwargs))
 
-        query_kwargs["KeyConditionExpression"] = query_expression
-        if filter_expression is not None:
-            query_kwargs["FilterExpression"] = filter_expression
+        def page_fetcher(operation, kwargs):
+            def fetch(start_key):
+                if start_key is None:
+                    return self._request(operation, READ, record, **kwargs)
+                return self._request(
+                    operation,
+                    READ,
+                    record,
+                    ExclusiveStartKey=start_key,
+                    **kwargs,
+                )
 
-        results = self._boto3_table.query(
-            **query_kwargs,
-            **self.data_model._get_kwargs(),
+            return fetch
+
+        items = fan_out(
+            [page_fetcher(operation, kwargs) for operation, kwargs in requests],
+            concurrency=workers,
         )
-        items = [self.data_model.deserialize(item) for item in results["Items"]]
-        yield from items
+        for item in items:
+            yield {name: item[name] for name in key_names}
+
+    def _delete_keys(self, keys, workers, record):
+        """
+        Delete the items with the given stored primary keys with
+        BatchWriteItem, sending batches from ``workers`` threads
+
+        Returns
+        -------
+        int
+            Number of items deleted
+        """
+
+        def delete_batch(batch):
+            self._batch_write(
+                [{"DeleteRequest": {"Key": key}} for key in batch],
+                record,
+            )
+            return len(batch)
+
+        deleted = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            batch = {}
+            for key in keys:
+                batch[tuple(sort_value(value) for value in key.values())] = key
+                if len(batch) < BATCH_WRITE_SIZE:
+                    continue
+                pending.add(executor.submit(delete_batch, list(batch.values())))
+                batch = {}
+                # Bound the batches waiting to be sent
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    deleted += sum(future.result() for future in done)
+
+            if batch:
+                pending.add(executor.submit(delete_batch, list(batch.values())))
+            deleted += sum(future.result() for future in pending)
+        return deleted
+
+    def scan(
+        self,
+        scan_filter=None,
+        segments=None,
+        backfill=False,
+        prefetch_related=None,
+    ):
+        """
+        Yield items in from the table, optionally matching the given filter
+        expression. Lazily paginates items internally.
+
+        Parameters
+        ----------
+        scan_filter : Query or CompiledCondition
+            An optional query constructed with awstin's query framework
+        segments : int, optional
+            Number of segments to scan in parallel. The items of each segment
+            are yielded in turn, with up to ``DEFAULT_CONCURRENCY`` segments
+            read ahead. By default the table is scanned sequentially.
+        backfill : bool, optional
+            Whether to fetch the data model's attributes that its index
+            doesn't project from the table (default False), see
+            ``Table.query``
+        prefetch_related : list of Reference, optional
+            References to load the items of, see ``Table.query``
+
+        Yields
+        ------
+        item : DynamoModel
+            An item in the table matching the filter
+        """
+        scan_filter = self._stored_filter(scan_filter)
+        scan_kwargs = self.data_model._get_kwargs()
+        add_expressions(scan_kwargs, FilterExpression=scan_filter)
+
+        if segments is not None and segments > 1:
+            yield from self._parallel_scan(
+                scan_kwargs,
+                segments,
+                scan_filter,
+                backfill,
+                prefetch_related,
+            )
+            return
+
+        record = self._operation_record("scan", FilterExpression=scan_filter)
+        try:
+            items = self._paginate("scan", record, scan_kwargs)
+            yield from self._deserialized(
+                items,
+                record,
+                backfill,
+                prefetch_related=prefetch_related,
+            )
+        finally:
+            self._finish(record)
+
+    def _paginate(self, operation, record, kwargs):
+        """
+        Items of a paginated query or scan, fetching each page as the
+        previous one is consumed
+
+        Yields
+        ------
+        dict
+            Raw DynamoDB items
+        """
+        results = self._request(operation, READ, record, **kwargs)
+        yield from results["Items"]
 
         while "LastEvaluatedKey" in results:
-            results = self._boto3_table.query(
+            results = self._request(
+                operation,
+                READ,
+                record,
                 ExclusiveStartKey=results["LastEvaluatedKey"],
-                **query_kwargs,
-                **self.data_model._get_kwargs(),
+                **kwargs,
+            )
+            yield from results["Items"]
+
+    def _deserialized(
+        self,
+        items,
+        record,
+        backfill,
+        index_name=None,
+        prefetch_related=None,
+    ):
+        """
+        Data models of raw items read from the table or an index
+
+        Parameters
+        ----------
+        items : iterable of dict
+            Raw DynamoDB items
+        record : OperationRecord or None
+            Record of the awstin call the items were read by
+        backfill : bool
+            Whether to fetch attributes the index doesn't project from the
+            table
+        index_name : str, optional
+            Index the items were read from, if not the data model's
+        prefetch_related : list of Reference, optional
+            References to load the items of
+
+        Yields
+        ------
+        DynamoModel
+        """
+        if backfill:
+            items = self._backfilled(items, record, index_name)
+        items = (self.data_model.deserialize(item) for item in items)
+        if prefetch_related:
+            items = self._prefetched(items, prefetch_related)
+        yield from items
+
+    def _backfilled(self, items, record, index_name=None):
+        """
+        Raw items read from an index, completed with the data model's
+        attributes the index doesn't project. These are fetched from the table
+        with BatchGetItem in chunks, the next chunk's items being read while
+        the previous chunk is fetched. Items no longer in the table are
+        dropped.
+        """
+        missing = self._unprojected_attributes(index_name)
+        if not missing:
+            yield from items
+            return
+
+        key_names = self._primary_key_names()
+        names = {
+            f"#b{i}": name
+            for i, name in enumerate(dict.fromkeys(key_names + tuple(missing)))
+        }
+        projection = dict(
+            ProjectionExpression=", ".join(names),
+            ExpressionAttributeNames=names,
+        )
+
+        def item_key(item):
+            return tuple(sort_value(item[name]) for name in key_names)
+
+        def backfill(chunk):
+            keys = {item_key(item): item for item in chunk}
+            found = self._batch_get(
+                [{name: item[name] for name in key_names} for item in keys.values()],
+                record,
+                **projection,
+            )
+            found = {item_key(item): item for item in found}
+            return [
+                {**item, **found[item_key(item)]}
+                for item in chunk
+                if item_key(item) in found
+            ]
+
+        yield from pipelined(items, backfill, BATCH_GET_SIZE)
+
+    def _prefetched(self, items, references):
+        """
+        Data models with the items referenced by the given Reference
+        attributes attached. Referenced items are fetched for each chunk of up
+        to 100 items, with BatchGetItem requests shared between the referenced
+        tables, while the next chunk is read.
+        """
+        tables = {}
+        for reference in references:
+            if not isinstance(reference, Reference):
+                raise TypeError(f"Expected a Reference, got {reference!r}")
+            model = reference._referenced_model
+            if model not in tables:
+                tables[model] = self._dynamodb[model]
+        names = [(reference._name_on_model, reference) for reference in references]
+
+        def referenced_key(item, name, reference):
+            value = getattr(item, name)
+            if value is NOT_SET or value is None:
+                return None
+            table = tables[reference._referenced_model]
+            return reference._key_values(value, table._primary_key_names())
+
+        def resolve(chunk):
+            wanted = {}
+            for item in chunk:
+                for name, reference in names:
+                    key = referenced_key(item, name, reference)
+                    if key is not None:
+                        table = tables[reference._referenced_model]
+                        wanted.setdefault(table, {})[key] = None
+
+            found = self._dynamodb._get_many(
+                {table: list(keys) for table, keys in wanted.items()}
+            )
+
+            for item in chunk:
+                related = dict(item._related_ or {})
+                for name, reference in names:
+                    key = referenced_key(item, name, reference)
+                    table = tables[reference._referenced_model]
+                    table_found = found.get(table, {})
+                    related[name] = None if key is None else table_found.get(key)
+                item._related_ = related
+            return chunk
+
+        yield from pipelined(items, resolve, BATCH_GET_SIZE)
+
+    def _parallel_scan(
+        self,
+        scan_kwargs,
+        segments,
+        scan_filter,
+        backfill,
+        prefetch_related,
+    ):
+        """
+        Scan the table's segments concurrently, yielding their items
+        """
+        record = self._operation_record("scan", FilterExpression=scan_filter)
+
+        def segment_fetcher(segment):
+            def fetch(start_key):
+                kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=segments)
+                if start_key is not None:
+                    kwargs["ExclusiveStartKey"] = start_key
+                return self._request("scan", READ, record, **kwargs)
+
+            return fetch
+
+        try:
+            items = fan_out([segment_fetcher(i) for i in range(segments)])
+            yield from self._deserialized(
+                items,
+                record,
+                backfill,
+                prefetch_related=prefetch_related,
+            )
+        finally:
+            self._finish(record)
+
+    def query(
+        self,
+        query_expression,
+        filter_expression=None,
+        backfill=False,
+        prefetch_related=None,
+    ):
+        """
+        Yield items from the table matching some query expression and optional
+        filter expression. Lazily paginates items internally.
+
+        Parameters
+        ----------
+        query_expression : Query or CompiledCondition
+            A Key query constructed with awstin's query syntax
+        filter_expression : Query or CompiledCondition
+            An additional post-query filter expression constructed with
+            awstin's query syntax
+        backfill : bool, optional
+            Whether to fetch the data model's attributes that its index
+            doesn't project from the table (default False). Items are fetched
+            with BatchGetItem in chunks of up to 100 read results, each chunk
+            being fetched while the previous one is consumed. Items no longer
+            in the table are skipped.
+        prefetch_related : list of Reference, optional
+            References to load the items of, readable with
+            ``DynamoModel.related``. For each chunk of up to 100 results, the
+            distinct referenced keys of all the referenced tables are packed
+            together into shared BatchGetItem requests, while the next chunk
+            is read.
+
+        Yields
+        ------
+        item : DynamoModel
+            An item in the table matching thw query
+        """
+        if isinstance(query_expression, ConditionBase):
+            query_expressions = self._partition_queries(query_expression)
+            if query_expressions is not None:
+                suffixed = self._suffixed_partition_key()
+                # The time buckets of a single partition are disjoint and in
+                # time order, so needn't be merged
+                merge = (
+                    suffixed is None
+                    or suffixed[1]._bucket is None
+                    or _has_condition(query_expression, In)
+                )
+                yield from self._fan_out_query(
+                    query_expressions,
+                    filter_expression,
+                    merge=merge,
+                    backfill=backfill,
+                    prefetch_related=prefetch_related,
+                )
+                return
+
+        query_kwargs = self.data_model._get_kwargs()
+        add_expressions(
+            query_kwargs,
+            KeyConditionExpression=query_expression,
+            FilterExpression=filter_expression,
+        )
+
+        record = self._operation_record(
+            "query",
+            KeyConditionExpression=query_expression,
+            FilterExpression=filter_expression,
+        )
+        try:
+            items = self._paginate("query", record, query_kwargs)
+            yield from self._deserialized(
+                items,
+                record,
+                backfill,
+                prefetch_related=prefetch_related,
+            )
+        finally:
+            self._finish(record)
+
+    def query_many(
+        self,
+        partition_values,
+        sort_condition=None,
+        filter_expression=None,
+        limit=None,
+    ):
+        """
+        Query several partitions concurrently, yielding their items merged in
+        sort key order. Lazily paginates each query internally.
+
+        ``table.query_many(["device-1", "device-2"], Event.timestamp > 100)``
+
+        Queries with a ``Key.in_`` condition on the partition key are run the
+        same way by ``Table.query``.
+
+        Parameters
+        ----------
+        partition_values : iterable of Any
+            Partition key values to query
+        sort_condition : Query, optional
+            Key condition on the sort key, applied to each partition,
+            constructed with awstin's query syntax
+        filter_expression : Query or CompiledCondition, optional
+            An additional post-query filter expression constructed with
+            awstin's query syntax
+        limit : int, optional
+            Maximum number of items to yield in total. Outstanding queries are
+            stopped once reached.
+
+        Yields
+        ------
+        item : DynamoModel
+            An item in the table matching the queries
+        """
+        partition_key = BotoKey(self._model_key_names()[0])
+        query_expressions = []
+        for value in dict.fromkeys(partition_values):
+            query_expression = partition_key.eq(to_decimal(value))
+            if sort_condition is not None:
+                query_expression = query_expression & sort_condition
+            query_expressions.append(query_expression)
+
+        query_expressions = self._shard_queries(query_expressions)
+        yield from self._fan_out_query(query_expressions, filter_expression, limit)
+
+    def _partition_queries(self, query_expression):
+        """
+        The queries a key condition needs to be split into, or None if it can
+        be run as a single query: one per value of a ``Key.in_`` condition on
+        the partition key, one per shard of a write-sharded partition key, and
+        one per time bucket of a time-bucketed partition key.
+
+        Raises
+        ------
+        ValueError
+            If the partition key is time-bucketed and the time buckets can't
+            be derived from the condition on the sort key
+        """
+        query_expressions = [query_expression]
+        if _has_condition(query_expression, In):
+            partition_key = self._model_key_names()[0]
+
+            def equal_to_each(condition):
+                if isinstance(condition, In):
+                    _, values = condition.get_expression()["values"]
+                    return [BotoKey(partition_key).eq(value) for value in values]
+                return None
+
+            expanded = _expand_key_condition(
+                query_expression,
+                partition_key,
+                equal_to_each,
+            )
+            if expanded is not None:
+                query_expressions = expanded
+
+        query_expressions = self._shard_queries(query_expressions)
+        query_expressions = self._bucket_queries(query_expressions)
+        if query_expressions == [query_expression]:
+            return None
+        return query_expressions
+
+    def _shard_queries(self, query_expressions):
+        """
+        Queries split into one per shard, if the partition key is
+        write-sharded. Otherwise the given queries.
+        """
+        sharded = self._suffixed_partition_key()
+        if sharded is None or sharded[1]._shards is None:
+            return query_expressions
+
+        name, key = sharded
+
+        def each_shard(condition):
+            if isinstance(condition, Equals):
+                attribute, value = condition.get_expression()["values"]
+                return [
+                    Equals(attribute, key._stored_value(value, shard))
+                    for shard in range(key._shards)
+                ]
+            return None
+
+        result = []
+        for query_expression in query_expressions:
+            expanded = _expand_key_condition(query_expression, name, each_shard)
+            result.extend(expanded if expanded is not None else [query_expression])
+        return result
+
+    def _bucket_queries(self, query_expressions):
+        """
+        Queries split into one per time bucket their sort key condition
+        covers, if the partition key is time-bucketed. Otherwise the given
+        queries.
+
+        Raises
+        ------
+        ValueError
+            If a query has no equality or ``between`` condition on the sort
+            key, or the partition key isn't bucketed by the sort key
+        """
+        bucketed = self._suffixed_partition_key()
+        if bucketed is None or bucketed[1]._bucket is None:
+            return query_expressions
+
+        name, key = bucketed
+        time_name = getattr(self.data_model, key._bucket_by)._awstin_name
+        if self._model_key_names()[1:] != (time_name,):
+            raise ValueError(
+                f"{name!r} is time-bucketed by {key._bucket_by!r}, which isn't "
+                "the sort key, so it can't be queried"
+            )
+
+        result = []
+        for query_expression in query_expressions:
+            time_range = _time_range(query_expression, time_name)
+            if time_range is None:
+                raise ValueError(
+                    f"Queries of the time-bucketed key {name!r} need an equality "
+                    f"or between condition on {key._bucket_by!r} to pick the "
+                    "time buckets to read"
+                )
+            labels = bucket_labels(*time_range, key._bucket)
+
+            def each_bucket(condition):
+                if isinstance(condition, Equals):
+                    attribute, value = condition.get_expression()["values"]
+                    return [
+                        Equals(attribute, key._stored_value(value, label))
+                        for label in labels
+                    ]
+                return None
+
+            expanded = _expand_key_condition(query_expression, name, each_bucket)
+            if expanded is None:
+                raise ValueError(
+                    f"Queries of the time-bucketed key {name!r} need an equality "
+                    "condition on it"
+                )
+            result.extend(expanded)
+        return result
+
+    def query_range(self, value, start, end, filter_expression=None, limit=None):
+        """
+        Yield the items of a time-bucketed partition key within a time range,
+        in time order.
+
+        All the time buckets covering the range are queried concurrently, with
+        at most ``DEFAULT_CONCURRENCY`` buckets read ahead of the results
+        being consumed. The data model's partition key must be declared with
+        ``bucket`` and ``bucket_by``, and ``bucket_by`` must be the sort key.
+
+        ``table.query_range("sensor-1", "2021-03-01T00:00", "2021-03-07T12:00")``
+
+        Parameters
+        ----------
+        value : Any
+            Partition key value, without a time bucket
+        start, end : int or float or str
+            Start and end of the time range (inclusive), in the format of the
+            sort key: seconds since the epoch or ISO 8601 strings
+        filter_expression : Query or CompiledCondition, optional
+            An additional post-query filter expression constructed with
+            awstin's query syntax
+        limit : int, optional
+            Maximum number of items to yield. Outstanding queries are stopped
+            once reached.
+
+        Yields
+        ------
+        item : DynamoModel
+            An item in the time range
+
+        Raises
+        ------
+        ValueError
+            If the partition key isn't time-bucketed by the sort key
+        """
+        suffixed = self._suffixed_partition_key()
+        if suffixed is None or suffixed[1]._bucket is None:
+            raise ValueError("query_range requires a time-bucketed partition key")
+        name, key = suffixed
+
+        time_name = getattr(self.data_model, key._bucket_by)._awstin_name
+        if self._model_key_names()[1:] != (time_name,):
+            raise ValueError(
+                f"query_range requires {key._bucket_by!r} to be the sort key"
+            )
+
+        time_condition = BotoKey(time_name).between(to_decimal(start), to_decimal(end))
+        query_expressions = [
+            BotoKey(name).eq(key._stored_value(value, label)) & time_condition
+            for label in bucket_labels(start, end, key._bucket)
+        ]
+        # Buckets are disjoint and in time order, so needn't be merged
+        yield from self._fan_out_query(
+            query_expressions,
+            filter_expression,
+            limit,
+            merge=False,
+        )
+
+    def execute(self, statement, params=None):
+        """
+        Execute a PartiQL statement on the table. The statement is sent right
+        away; items it reads are yielded as data models, fetching further
+        pages lazily.
+
+        Parameters may be positional (``?``), given as a list, or named
+        (``:name``), given as a dict. Statements are prepared once per
+        distinct text, so constant statements with parameters are cheap to
+        execute repeatedly.
+
+        .. code-block:: python
+
+            movies = table.execute(
+                'SELECT * FROM "movies" WHERE year = :year AND rating > :rating',
+                {"year": 1994, "rating": 8},
             )
-            items = [self.data_model.deserialize(item) for item in results["Items"]]
+
+        Parameters
+        ----------
+        statement : str
+            PartiQL statement
+        params : list or dict, optional
+            Values of the statement's parameters
+
+        Returns
+        -------
+        iterator of DynamoModel
+            Items read by the statement
+
+        Raises
+        ------
+        ValueError
+            If the parameters don't match the statement's
+        """
+        from awstin.dynamodb.partiql import prepare_statement
+
+        prepared = prepare_statement(statement)
+        request = prepared.request(params)
+        capacity = READ if prepared.reads else WRITE
+
+        record = self._operation_record("execute_statement", Statement=statement)
+        try:
+            response = self._request("execute_statement", capacity, record, **request)
+            items = [self.data_model.deserialize(data) for data in response["Items"]]
+        except Exception:
+            self._finish(record)
+            raise
+
+        if "NextToken" not in response:
+            self._finish(record)
+            return iter(items)
+        return self._statement_items(items, response, request, capacity, record)
+
+    def _statement_items(self, items, response, request, capacity, record):
+        """
+        Items read by a statement, given its first page, fetching each further
+        page as the previous one is consumed
+        """
+        try:
             yield from items
+            while "NextToken" in response:
+                response = self._request(
+                    "execute_statement",
+                    capacity,
+                    record,
+                    NextToken=response["NextToken"],
+                    **request,
+                )
+                yield from map(self.data_model.deserialize, response["Items"])
+        finally:
+            self._finish(record)
+
+    def find(self, condition, segments=None, backfill=False):
+        """
+        Find the items matching a condition, reading them the cheapest way
+        the table allows.
+
+        The condition's equality tests on partition keys and tests on sort
+        keys are matched against the key schemas of the table and its
+        secondary indexes. The items are queried from the best match, and the
+        rest of the condition is applied as a filter. Indexes that don't
+        project all of the data model's attributes are only used with
+        ``backfill``. Conditions that can't be queried are scanned for.
+
+        ``table.find((User.email == "a@example.com") & (User.active == True))``
+
+        Parameters
+        ----------
+        condition : Query
+            Condition constructed with awstin's query syntax
+        segments : int, optional
+            Number of segments to scan in parallel, if the table has to be
+            scanned
+        backfill : bool, optional
+            Whether to read from indexes that don't project all of the data
+            model's attributes, fetching the missing attributes from the
+            table (default False), see ``Table.query``
+
+        Returns
+        -------
+        QueryPlan
+            Iterable of the matching items. ``explain()`` describes how they
+            are read.
+        """
+        return QueryPlan(self, condition, segments=segments, backfill=backfill)
+
+    def _fan_out_query(
+        self,
+        query_expressions,
+        filter_expression=None,
+        limit=None,
+        merge=True,
+        index_name=None,
+        backfill=False,
+        prefetch_related=None,
+    ):
+        """
+        Run several queries concurrently, yielding their items
+
+        Parameters
+        ----------
+        query_expressions : list of Query or CompiledCondition
+            Key conditions of the queries
+        filter_expression : Query or CompiledCondition, optional
+            Filter expression applied to each query
+        limit : int, optional
+            Maximum number of items to yield. Outstanding queries are stopped
+            once reached.
+        merge : bool, optional
+            Whether to merge the results in sort key order (default True).
+            Otherwise the results of each query are yielded in turn.
+        index_name : str, optional
+            Secondary index to query, instead of the table or index the data
+            model represents
+        backfill : bool, optional
+            Whether to fetch attributes the index doesn't project from the
+            table (default False)
+        prefetch_related : list of Reference, optional
+            References to load the items of
+
+        Yields
+        ------
+        item : DynamoModel
+        """
+        if not query_expressions:
+            return
+
+        if index_name is None:
+            key_names = self._model_key_names()
+        else:
+            key_names = self._index_key_names(index_name)
+        sort_key = key_names[1] if len(key_names) > 1 else None
+
+        record = self._operation_record(
+            "query",
+            index_name=index_name,
+            KeyConditionExpression=query_expressions[0],
+            FilterExpression=filter_expression,
+        )
+
+        def page_fetcher(query_expression):
+            query_kwargs = self.data_model._get_kwargs()
+            if index_name is not None:
+                query_kwargs["IndexName"] = index_name
+            add_expressions(
+                query_kwargs,
+                KeyConditionExpression=query_expression,
+                FilterExpression=filter_expression,
+            )
+
+            def fetch(start_key):
+                if start_key is None:
+                    return self._request("query", READ, record, **query_kwargs)
+                return self._request(
+                    "query",
+                    READ,
+                    record,
+                    ExclusiveStartKey=start_key,
+                    **query_kwargs,
+                )
+
+            return fetch
+
+        try:
+            items = fan_out(
+                [
+                    page_fetcher(query_expression)
+                    for query_expression in query_expressions
+                ],
+                sort_key=sort_key if merge else None,
+                limit=limit,
+            )
+            yield from self._deserialized(
+                items,
+                record,
+                backfill,
+                index_name,
+                prefetch_related,
+            )
+        finally:
+            self._finish(record)
+
+
+def _has_condition(condition, condition_type):
+    """
+    Whether a condition contains a condition of the given type
+    """
+    if isinstance(condition, condition_type):
+        return True
+    return any(
+        _has_condition(value, condition_type)
+        for value in condition.get_expression()["values"]
+        if isinstance(value, ConditionBase)
+    )
+
+
+def _time_range(condition, name):
+    """
+    Start and end of the range a key condition's equality or ``between`` test
+    of the named sort key covers, or None if it has no such test
+    """
+    values = condition.get_expression()["values"]
+
+    if isinstance(values[0], AttributeBase):
+        if values[0].name != name:
+            return None
+        if isinstance(condition, Equals):
+            return values[1], values[1]
+        if isinstance(condition, Between):
+            return values[1], values[2]
+        return None
+
+    if isinstance(condition, And):
+        for value in values:
+            time_range = _time_range(value, name)
+            if time_range is not None:
+                return time_range
+
+    return None
+
+
+def _expand_key_condition(condition, name, expand):
+    """
+    Copies of a key condition with its test of the named key replaced by each
+    of the conditions returned by ``expand(test)``. None if the condition has
+    no test of the key, or ``expand`` returns None.
+    """
+    values = condition.get_expression()["values"]
+
+    if isinstance(values[0], AttributeBase):
+        if values[0].name == name:
+            return expand(condition)
+        return None
+
+    if isinstance(condition, And):
+        for i, value in enumerate(values):
+            expanded = _expand_key_condition(value, name, expand)
+            if expanded is not None:
+                return [
+                    And(*values[:i], expanded_value, *values[i + 1 :])
+                    for expanded_value in expanded
+                ]
+
+    return None
@@ -0,0 +1,175 @@
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import NOT_SET, Attr, DynamoDB, DynamoModel, Key
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Product(DynamoModel):
+    _table_name_ = "temp"
+
+    sku = Key()
+
+    category = Attr()
+
+    price = Attr()
+
+    description = Attr()
+
+
+class ProductsByCategory(DynamoModel):
+    _table_name_ = "temp"
+    _index_name_ = "ByCategory"
+
+    category = Key()
+
+    sku = Key()
+
+    price = Attr()
+
+    description = Attr()
+
+
+class PricedProducts(DynamoModel):
+    _table_name_ = "temp"
+    _index_name_ = "ByCategoryPriced"
+
+    category = Key()
+
+    sku = Key()
+
+    price = Attr()
+
+    description = Attr()
+
+
+def _index(name, projection):
+    return {
+        "IndexName": name,
+        "KeySchema": [
+            {"AttributeName": "category", "KeyType": "HASH"},
+            {"AttributeName": "sku", "KeyType": "RANGE"},
+        ],
+        "Projection": projection,
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 123,
+            "WriteCapacityUnits": 123,
+        },
+    }
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Product,
+            "sku",
+            extra_attributes=[{"AttributeName": "category", "AttributeType": "S"}],
+            GlobalSecondaryIndexes=[
+                _index("ByCategory", {"ProjectionType": "KEYS_ONLY"}),
+                _index(
+                    "ByCategoryPriced",
+                    {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["price"]},
+                ),
+            ],
+        )
+
+    def load(self, table, count):
+        table.put_items(
+            Product(
+                sku=f"p{i:03d}",
+                category="books" if i % 2 else "games",
+                price=i,
+                description=f"item {i}",
+            )
+            for i in range(count)
+        )
+
+    def batch_gets(self, table):
+        client = table._dynamodb.resource.meta.client
+        return mock.patch.object(
+            client,
+            "batch_get_item",
+            wraps=client.batch_get_item,
+        )
+
+    def test_without_backfill(self):
+        with self.temp_table as table:
+            self.load(table, 4)
+            index = DynamoDB()[ProductsByCategory]
+
+            item, _ = index.query(ProductsByCategory.category == "books")
+
+            self.assertEqual(item.sku, "p001")
+            self.assertEqual(item.price, NOT_SET)
+
+    def test_keys_only_query(self):
+        with self.temp_table as table:
+            self.load(table, 250)
+            index = DynamoDB()[ProductsByCategory]
+
+            self.assertEqual(index._unprojected_attributes(), ["description", "price"])
+            with self.batch_gets(index) as batch_get:
+                results = list(
+                    index.query(ProductsByCategory.category == "games", backfill=True)
+                )
+
+            self.assertEqual(len(results), 125)
+            self.assertEqual(batch_get.call_count, 2)
+            self.assertEqual(
+                [(item.sku, item.price, item.description) for item in results[:2]],
+                [("p000", 0, "item 0"), ("p002", 2, "item 2")],
+            )
+            self.assertEqual(results[-1].sku, "p248")
+
+    def test_include_projection(self):
+        with self.temp_table as table:
+            self.load(table, 6)
+            index = DynamoDB()[PricedProducts]
+
+            self.assertEqual(index._unprojected_attributes(), ["description"])
+            with self.batch_gets(index) as batch_get:
+                results = list(index.scan(PricedProducts.price > 2, backfill=True))
+
+            self.assertEqual(batch_get.call_count, 1)
+            request = batch_get.call_args.kwargs["RequestItems"]["temp"]
+            self.assertEqual(
+                sorted(request["ExpressionAttributeNames"].values()),
+                ["description", "sku"],
+            )
+            self.assertEqual(
+                sorted(item.description for item in results),
+                ["item 3", "item 4", "item 5"],
+            )
+
+    def test_deleted_items_dropped(self):
+        with self.temp_table as table:
+            self.load(table, 4)
+            index = DynamoDB()[ProductsByCategory]
+
+            original_batch_get = table._batch_get
+
+            def batch_get(keys, record=None, **kwargs):
+                table.delete_item("p001")
+                return original_batch_get(keys, record, **kwargs)
+
+            with mock.patch.object(index, "_batch_get", side_effect=batch_get):
+                results = list(
+                    index.query(ProductsByCategory.category == "books", backfill=True)
+                )
+
+            self.assertEqual([item.sku for item in results], ["p003"])
+
+    def test_find_uses_index_with_backfill(self):
+        with self.temp_table as table:
+            self.load(table, 10)
+
+            plan = table.find(Product.category == "books")
+            self.assertEqual(plan.operation, "scan")
+
+            plan = table.find(Product.category == "books", backfill=True)
+            self.assertEqual(plan.index_name, "ByCategory")
+            self.assertIn("Backfill 'description', 'price' from table", plan.explain())
+            self.assertEqual(
+                [(item.sku, item.price) for item in plan],
+                [("p001", 1), ("p003", 3), ("p005", 5), ("p007", 7), ("p009", 9)],
+            )
@@ -0,0 +1,161 @@
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import Attr, DynamoDB, DynamoModel, Key, UnprocessedRequests
+from awstin.dynamodb.table import MAX_BATCH_ATTEMPTS
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class User(DynamoModel):
+    _table_name_ = "users"
+
+    user_id = Key()
+
+    name = Attr()
+
+
+class Order(DynamoModel):
+    _table_name_ = "orders"
+
+    user_id = Key()
+
+    order_id = Key()
+
+    total = Attr()
+
+
+class OrderTotal(DynamoModel):
+    _table_name_ = "orders"
+
+    user_id = Key()
+
+    order_id = Key()
+
+
+class UsersByName(DynamoModel):
+    _table_name_ = "users"
+    _index_name_ = "ByName"
+
+    name = Key()
+
+
+class TestBatchGet(unittest.TestCase):
+    def setUp(self):
+        self.users_table = temporary_dynamodb_table(User, "user_id")
+        self.orders_table = temporary_dynamodb_table(
+            Order,
+            "user_id",
+            sortkey_name="order_id",
+            sortkey_type="N",
+        )
+
+    def load(self, users, orders):
+        users.put_items(User(user_id=f"u{i}", name=f"User {i}") for i in range(80))
+        orders.put_items(
+            Order(user_id=f"u{i % 10}", order_id=i, total=i * 1.5) for i in range(80)
+        )
+
+    def test_grouped_by_model_in_key_order(self):
+        with self.users_table as users, self.orders_table as orders:
+            self.load(users, orders)
+            dynamodb = DynamoDB()
+
+            with mock.patch.object(
+                dynamodb.resource.meta.client,
+                "batch_get_item",
+                wraps=dynamodb.resource.meta.client.batch_get_item,
+            ) as batch_get:
+                result = dynamodb.batch_get(
+                    {
+                        User: [f"u{i}" for i in range(79, -1, -1)] + ["missing"],
+                        Order: [("u3", 3), {"user_id": "u4", "order_id": 14}]
+                        + [(f"u{i % 10}", i) for i in range(60)],
+                        OrderTotal: [("u1", 1)],
+                    }
+                )
+
+            self.assertEqual(
+                [user.user_id for user in result[User]],
+                [f"u{i}" for i in range(79, -1, -1)],
+            )
+            self.assertEqual(result[User][0].name, "User 79")
+            self.assertEqual(len(result[Order]), 60)
+            self.assertEqual(
+                [(order.order_id, order.total) for order in result[Order][:2]],
+                [(3, 4.5), (14, 21.0)],
+            )
+            self.assertIsInstance(result[OrderTotal][0], OrderTotal)
+
+            # 81 user keys and 60 distinct order keys in two shared requests
+            self.assertEqual(batch_get.call_count, 2)
+            sizes = sorted(
+                sum(
+                    len(request["Keys"])
+                    for request in call.kwargs["RequestItems"].values()
+                )
+                for call in batch_get.call_args_list
+            )
+            self.assertEqual(sizes, [41, 100])
+
+    def test_retries_unprocessed_keys(self):
+        with self.users_table as users, self.orders_table as orders:
+            self.load(users, orders)
+            dynamodb = DynamoDB()
+            real_batch_get = dynamodb.resource.meta.client.batch_get_item
+            calls = []
+
+            def batch_get_item(RequestItems, **kwargs):
+                calls.append(RequestItems)
+                if len(calls) > 1:
+                    return real_batch_get(RequestItems=RequestItems, **kwargs)
+                request = RequestItems["users"]
+                processed = dict(request, Keys=request["Keys"][:1])
+                unprocessed = dict(request, Keys=request["Keys"][1:])
+                response = real_batch_get(
+                    RequestItems={"users": processed},
+                    **kwargs,
+                )
+                response["UnprocessedKeys"] = {"users": unprocessed}
+                return response
+
+            with mock.patch.object(
+                dynamodb.resource.meta.client,
+                "batch_get_item",
+                side_effect=batch_get_item,
+            ):
+                result = dynamodb.batch_get({User: ["u1", "u2", "u3"]})
+
+            self.assertEqual([u.user_id for u in result[User]], ["u1", "u2", "u3"])
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(len(calls[1]["users"]["Keys"]), 2)
+
+    def test_gives_up_on_unprocessed_keys(self):
+        with self.users_table:
+            dynamodb = DynamoDB()
+
+            def batch_get_item(RequestItems, **kwargs):
+                return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+            with mock.patch(
+                "awstin.dynamodb.table._BATCH_RETRY_DELAY", 0
+            ), mock.patch.object(
+                dynamodb.resource.meta.client,
+                "batch_get_item",
+                side_effect=batch_get_item,
+            ) as batch_get:
+                with self.assertRaises(UnprocessedRequests) as raised:
+                    dynamodb.batch_get({User: ["u1", "u2"]})
+
+            self.assertEqual(batch_get.call_count, MAX_BATCH_ATTEMPTS)
+            self.assertEqual(raised.exception.operation, "batch_get_item")
+            self.assertEqual(
+                raised.exception.unprocessed["users"]["Keys"],
+                [{"user_id": "u1"}, {"user_id": "u2"}],
+            )
+
+    def test_index_model(self):
+        with self.assertRaises(ValueError):
+            DynamoDB().batch_get({UsersByName: ["x"]})
+
+    def test_empty(self):
+        self.assertEqual(DynamoDB().batch_get({}), {})
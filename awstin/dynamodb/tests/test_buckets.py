@@ -0,0 +1,217 @@
+import datetime
+import unittest
+
+from awstin.dynamodb import Attr, DynamoModel, Key
+from awstin.dynamodb.buckets import bucket_label, bucket_labels, parse_iso_datetime
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+HOUR = 3600
+
+
+class Reading(DynamoModel):
+    _table_name_ = "temp"
+
+    sensor = Key(bucket="hour", bucket_by="timestamp")
+
+    timestamp = Key()
+
+    value = Attr()
+
+
+class TestBucketLabels(unittest.TestCase):
+    def test_epoch_and_iso(self):
+        self.assertEqual(bucket_label(0, "hour"), "1970-01-01T00")
+        self.assertEqual(bucket_label(86399.5, "day"), "1970-01-01")
+        self.assertEqual(
+            bucket_label("2021-03-04T05:06:07", "minute"), "2021-03-04T05:06"
+        )
+        self.assertEqual(
+            bucket_label("2021-03-04T01:00:00+02:00", "day"),
+            "2021-03-03",
+        )
+        self.assertEqual(
+            bucket_label(datetime.datetime(2021, 12, 31, 23), "month"),
+            "2021-12",
+        )
+
+    def test_iso_formats(self):
+        utc = datetime.timezone.utc
+        self.assertEqual(
+            parse_iso_datetime("2021-03-04T05:06:07Z"),
+            datetime.datetime(2021, 3, 4, 5, 6, 7, tzinfo=utc),
+        )
+        self.assertEqual(
+            parse_iso_datetime("2021-03-04T05:06:07.25-0130"),
+            datetime.datetime(
+                2021,
+                3,
+                4,
+                5,
+                6,
+                7,
+                250000,
+                tzinfo=datetime.timezone(-datetime.timedelta(hours=1, minutes=30)),
+            ),
+        )
+        self.assertEqual(
+            parse_iso_datetime("2021-03-04 05:06"),
+            datetime.datetime(2021, 3, 4, 5, 6),
+        )
+        self.assertEqual(
+            parse_iso_datetime("2021-03-04"), datetime.datetime(2021, 3, 4)
+        )
+        with self.assertRaises(ValueError):
+            parse_iso_datetime("04/03/2021")
+
+    def test_zulu_and_naive_strings(self):
+        self.assertEqual(bucket_label("2021-03-04T23:59:59Z", "day"), "2021-03-04")
+        self.assertEqual(
+            bucket_label("2021-03-04T23:59:59.999999Z", "minute"),
+            "2021-03-04T23:59",
+        )
+        # Naive times are taken as UTC
+        self.assertEqual(bucket_label("2021-03-04T23:59:59", "day"), "2021-03-04")
+        self.assertEqual(
+            bucket_label("2021-03-04T23:59:59", "hour"),
+            bucket_label("2021-03-04T23:59:59Z", "hour"),
+        )
+        self.assertEqual(
+            bucket_labels("2021-03-04T22:30Z", "2021-03-04T23:10", "hour"),
+            ["2021-03-04T22", "2021-03-04T23"],
+        )
+
+    def test_range(self):
+        self.assertEqual(
+            bucket_labels(HOUR - 1, 3 * HOUR, "hour"),
+            ["1970-01-01T00", "1970-01-01T01", "1970-01-01T02", "1970-01-01T03"],
+        )
+        self.assertEqual(
+            bucket_labels("2021-11-15", "2022-02-01", "month"),
+            ["2021-11", "2021-12", "2022-01", "2022-02"],
+        )
+        self.assertEqual(bucket_labels(10, 5, "day"), [])
+
+    def test_invalid_key(self):
+        with self.assertRaises(ValueError):
+            Key(bucket="week", bucket_by="timestamp")
+        with self.assertRaises(ValueError):
+            Key(bucket="day")
+        with self.assertRaises(ValueError):
+            Key(shards=2, bucket="day", bucket_by="timestamp")
+
+
+class TestBucketedTable(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Reading,
+            "sensor",
+            sortkey_name="timestamp",
+            sortkey_type="N",
+        )
+
+    def test_write_computes_bucket(self):
+        reading = Reading(sensor="s1", timestamp=2 * HOUR + 5)
+
+        self.assertEqual(reading.serialize()["sensor"], "s1#1970-01-01T02")
+
+        with self.assertRaises(ValueError):
+            Reading(sensor="s1").serialize()
+
+    def test_get_update_delete(self):
+        with self.temp_table as table:
+            table.put_item(Reading(sensor="s1", timestamp=HOUR + 1, value=1))
+
+            self.assertEqual(table["s1", HOUR + 1].value, 1)
+            updated = table.update_item(("s1", HOUR + 1), Reading.value.set(2))
+            self.assertEqual((updated.sensor, updated.value), ("s1", 2))
+            self.assertTrue(table.delete_item(("s1", HOUR + 1)))
+            self.assertEqual(list(table.scan()), [])
+
+    def test_query_range_in_time_order(self):
+        with self.temp_table as table:
+            for ts in range(0, 10 * HOUR, 600):
+                table.put_item(Reading(sensor="s1", timestamp=ts, value=ts))
+                table.put_item(Reading(sensor="s2", timestamp=ts, value=ts))
+
+            results = list(table.query_range("s1", 2 * HOUR + 1, 7 * HOUR))
+
+            self.assertEqual(
+                [item.timestamp for item in results],
+                list(range(2 * HOUR + 600, 7 * HOUR + 1, 600)),
+            )
+            self.assertEqual({item.sensor for item in results}, {"s1"})
+
+    def test_query_range_limit_and_filter(self):
+        with self.temp_table as table:
+            for ts in range(0, 10 * HOUR, 600):
+                table.put_item(Reading(sensor="s1", timestamp=ts, value=ts % 1200))
+
+            results = list(
+                table.query_range(
+                    "s1",
+                    0,
+                    10 * HOUR,
+                    filter_expression=Reading.value == 0,
+                    limit=4,
+                )
+            )
+
+            self.assertEqual(
+                [item.timestamp for item in results], [0, 1200, 2400, 3600]
+            )
+
+    def test_find_queries_time_buckets(self):
+        with self.temp_table as table:
+            for ts in range(0, 10 * HOUR, 600):
+                table.put_item(Reading(sensor="s1", timestamp=ts, value=ts % 1200))
+                table.put_item(Reading(sensor="s2", timestamp=ts, value=0))
+
+            plan = table.find(
+                (Reading.sensor == "s1")
+                & Reading.timestamp.between(2 * HOUR + 1, 7 * HOUR)
+            )
+            self.assertEqual(plan.operation, "query")
+            self.assertEqual(
+                [item.timestamp for item in plan],
+                list(range(2 * HOUR + 600, 7 * HOUR + 1, 600)),
+            )
+
+            plan = table.find(
+                (Reading.sensor == "s1")
+                & (Reading.timestamp >= HOUR)
+                & (Reading.timestamp <= 3 * HOUR)
+                & (Reading.value == 0)
+            )
+            self.assertEqual(plan.operation, "query")
+            self.assertEqual(
+                [item.timestamp for item in plan],
+                list(range(HOUR, 3 * HOUR + 1, 1200)),
+            )
+
+            found = table.find((Reading.sensor == "s2") & (Reading.timestamp == HOUR))
+            self.assertEqual(
+                [(item.sensor, item.timestamp) for item in found], [("s2", HOUR)]
+            )
+
+            results = table.query(
+                (Reading.sensor == "s1") & Reading.timestamp.between(0, HOUR)
+            )
+            self.assertEqual(
+                [item.timestamp for item in results], list(range(0, HOUR + 1, 600))
+            )
+
+    def test_find_without_time_range(self):
+        with self.temp_table as table:
+            table.put_item(Reading(sensor="s1", timestamp=HOUR, value=1))
+
+            with self.assertRaises(ValueError):
+                table.find(Reading.sensor == "s1")
+            with self.assertRaises(ValueError):
+                table.find((Reading.sensor == "s1") & (Reading.timestamp >= HOUR))
+            with self.assertRaises(ValueError):
+                list(table.query(Reading.sensor == "s1"))
+
+            # Conditions not on the bucketed key are scanned for
+            self.assertEqual(
+                [item.value for item in table.find(Reading.value == 1)], [1]
+            )
@@ -0,0 +1,140 @@
+import gc
+import time
+import unittest
+import unittest.mock as mock
+import weakref
+
+from awstin.dynamodb import Attr, DynamoModel, Key, UnprocessedRequests
+from awstin.dynamodb.buffered import _flush_open_buffers
+from awstin.dynamodb.table import MAX_BATCH_ATTEMPTS
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class MyModel(DynamoModel):
+    _table_name_ = "temp"
+
+    pkey = Key()
+
+    sortkey = Key()
+
+    an_attr = Attr()
+
+
+class TestBufferedTable(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            MyModel,
+            "pkey",
+            sortkey_name="sortkey",
+        )
+
+    def test_last_write_per_key_wins(self):
+        with self.temp_table as table:
+            table.put_item(MyModel(pkey="a", sortkey="z", an_attr=0))
+
+            with mock.patch.object(
+                table._dynamodb.resource.meta.client,
+                "batch_write_item",
+                wraps=table._dynamodb.resource.meta.client.batch_write_item,
+            ) as batch_write_item:
+                with table.buffered(max_age=None) as buffer:
+                    for i in range(10):
+                        buffer.put_item(MyModel(pkey="a", sortkey="b", an_attr=i))
+                    buffer.put_item(MyModel(pkey="a", sortkey="c", an_attr=1))
+                    buffer.delete_item(("a", "c"))
+                    buffer.delete_item({"pkey": "a", "sortkey": "z"})
+                    self.assertEqual(len(buffer), 3)
+
+            self.assertEqual(batch_write_item.call_count, 1)
+            (item,) = table.scan()
+            self.assertEqual((item.sortkey, item.an_attr), ("b", 9))
+
+    def test_flush_on_size(self):
+        with self.temp_table as table:
+            buffer = table.buffered(max_items=5, max_age=None)
+            for i in range(12):
+                buffer.put_item(MyModel(pkey="a", sortkey=str(i)))
+
+            self.assertEqual(len(buffer), 2)
+            self.assertEqual(len(list(table.scan())), 10)
+
+            self.assertEqual(buffer.flush(), 2)
+            self.assertEqual(len(list(table.scan())), 12)
+            buffer.close()
+
+    def test_flush_on_age(self):
+        with self.temp_table as table:
+            buffer = table.buffered(max_age=0.1)
+            buffer.put_item(MyModel(pkey="a", sortkey="b"))
+
+            for _ in range(50):
+                if not len(buffer):
+                    break
+                time.sleep(0.1)
+
+            self.assertEqual(len(list(table.scan())), 1)
+            buffer.close()
+
+    def test_closed_rejects_writes(self):
+        with self.temp_table as table:
+            with table.buffered() as buffer:
+                pass
+
+            with self.assertRaises(ValueError):
+                buffer.put_item(MyModel(pkey="a", sortkey="b"))
+
+    def test_failed_flush_keeps_writes(self):
+        with self.temp_table as table:
+            buffer = table.buffered(max_age=None)
+            buffer.put_item(MyModel(pkey="a", sortkey="b"))
+
+            with mock.patch.object(
+                table, "_batch_write", side_effect=RuntimeError("boom")
+            ):
+                with self.assertRaises(RuntimeError):
+                    buffer.flush()
+
+            self.assertEqual(len(buffer), 1)
+            buffer.close()
+            self.assertEqual(len(list(table.scan())), 1)
+
+    def test_gives_up_on_unprocessed_writes(self):
+        with self.temp_table as table:
+            buffer = table.buffered(max_age=None)
+            buffer.put_item(MyModel(pkey="a", sortkey="b"))
+            buffer.put_item(MyModel(pkey="a", sortkey="c"))
+
+            def batch_write_item(RequestItems, **kwargs):
+                return {"UnprocessedItems": RequestItems}
+
+            with mock.patch(
+                "awstin.dynamodb.table._BATCH_RETRY_DELAY", 0
+            ), mock.patch.object(
+                table._dynamodb.resource.meta.client,
+                "batch_write_item",
+                side_effect=batch_write_item,
+            ) as batch_write:
+                with self.assertRaises(UnprocessedRequests) as raised:
+                    buffer.flush()
+
+            self.assertEqual(batch_write.call_count, MAX_BATCH_ATTEMPTS)
+            self.assertEqual(len(raised.exception.unprocessed["temp"]), 2)
+            self.assertEqual(len(buffer), 2)
+            buffer.close()
+            self.assertEqual(len(list(table.scan())), 2)
+
+    def test_flushed_at_exit_unless_dropped(self):
+        with self.temp_table as table:
+            buffer = table.buffered(max_age=None)
+            buffer.put_item(MyModel(pkey="a", sortkey="b"))
+
+            _flush_open_buffers()
+            self.assertEqual(len(buffer), 0)
+            self.assertEqual(len(list(table.scan())), 1)
+
+            buffer.put_item(MyModel(pkey="a", sortkey="c"))
+            dropped = weakref.ref(buffer)
+            del buffer
+            gc.collect()
+
+            self.assertIsNone(dropped())
@@ -0,0 +1,180 @@
+import unittest
+
+from awstin.dynamodb import Attr, DynamoModel, Key, compile_condition, param
+from awstin.dynamodb.conditions import add_expressions
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Student(DynamoModel):
+    _table_name_ = "students"
+
+    name = Key()
+
+    year = Key()
+
+    homeroom = Attr()
+
+    details = Attr()
+
+    def __eq__(self, other):
+        if isinstance(other, Student):
+            return (
+                self.name == other.name
+                and self.year == other.year
+                and self.homeroom == other.homeroom
+            )
+        return NotImplemented
+
+
+class TestCompileCondition(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Student,
+            "name",
+            sortkey_name="year",
+            sortkey_type="N",
+        )
+
+    def test_render(self):
+        compiled = compile_condition(
+            (Student.homeroom == "A")
+            & (Student.details.scores[2] > 1.5)
+            & Student.homeroom.in_(["B", "C"])
+        )
+
+        names = {v: k for k, v in compiled.attribute_names.items()}
+        values = {v: k for k, v in compiled.bind().attribute_values.items()}
+        homeroom = names["homeroom"]
+
+        self.assertEqual(
+            compiled.expression,
+            f"(({homeroom} = {values['A']} "
+            f"AND {names['details']}.{names['scores']}[2] > {values[1.5]}) "
+            f"AND {homeroom} IN ({values['B']}, {values['C']}))",
+        )
+        self.assertEqual(compiled.parameters, frozenset())
+
+    def test_placeholders_numbered_per_request(self):
+        first = compile_condition(Student.homeroom == "A")
+        second = compile_condition(Student.homeroom == "A")
+        self.assertEqual(first.expression, second.expression)
+
+        request_kwargs = {}
+        add_expressions(
+            request_kwargs,
+            KeyConditionExpression=first,
+            FilterExpression=second,
+        )
+        add_expressions(request_kwargs, ConditionExpression=first)
+
+        self.assertEqual(request_kwargs["KeyConditionExpression"], "#c0n0 = :c0v0")
+        self.assertEqual(request_kwargs["FilterExpression"], "#c1n0 = :c1v0")
+        self.assertEqual(request_kwargs["ConditionExpression"], "#c2n0 = :c2v0")
+        self.assertEqual(
+            request_kwargs["ExpressionAttributeNames"],
+            {"#c0n0": "homeroom", "#c1n0": "homeroom", "#c2n0": "homeroom"},
+        )
+        self.assertEqual(
+            request_kwargs["ExpressionAttributeValues"],
+            {":c0v0": "A", ":c1v0": "A", ":c2v0": "A"},
+        )
+
+    def test_parameters(self):
+        compiled = compile_condition(Student.year.between(param("low"), param("high")))
+
+        self.assertEqual(compiled.parameters, {"low", "high"})
+        self.assertCountEqual(
+            compiled.bind(low=1, high=5).attribute_values.values(), [1, 5]
+        )
+
+        with self.assertRaises(ValueError):
+            compiled.bind(low=1)
+        with self.assertRaises(ValueError):
+            add_expressions({}, FilterExpression=compiled)
+
+    def test_add_expressions_merges_placeholders(self):
+        compiled = compile_condition(Student.homeroom == param("room"))
+        request_kwargs = {"ExpressionAttributeNames": {"#abc": "name"}}
+        original_names = request_kwargs["ExpressionAttributeNames"]
+
+        add_expressions(
+            request_kwargs,
+            FilterExpression=compiled.bind(room="A"),
+            ConditionExpression=None,
+        )
+
+        self.assertEqual(request_kwargs["FilterExpression"], compiled.expression)
+        self.assertEqual(len(request_kwargs["ExpressionAttributeNames"]), 2)
+        self.assertEqual(
+            list(request_kwargs["ExpressionAttributeValues"].values()), ["A"]
+        )
+        self.assertNotIn("ConditionExpression", request_kwargs)
+        self.assertEqual(original_names, {"#abc": "name"})
+
+    def test_add_expressions_compiles_conditions(self):
+        request_kwargs = {}
+
+        add_expressions(
+            request_kwargs,
+            KeyConditionExpression=Student.name == "x",
+            FilterExpression=Student.homeroom == "A",
+        )
+
+        self.assertIsInstance(request_kwargs["KeyConditionExpression"], str)
+        self.assertIsInstance(request_kwargs["FilterExpression"], str)
+        self.assertEqual(
+            sorted(request_kwargs["ExpressionAttributeNames"].values()),
+            ["homeroom", "name"],
+        )
+        self.assertEqual(
+            sorted(request_kwargs["ExpressionAttributeValues"].values()),
+            ["A", "x"],
+        )
+
+    def test_table_operations(self):
+        by_name = compile_condition(Student.name == param("name"))
+        in_room = compile_condition(Student.homeroom == param("room"))
+        recent = compile_condition(Student.year >= 2)
+
+        with self.temp_table as table:
+            for year, homeroom in [(1, "A"), (2, "A"), (3, "B")]:
+                table.put_item(Student(name="Sam", year=year, homeroom=homeroom))
+            table.put_item(Student(name="Alex", year=1, homeroom="A"))
+
+            queried = list(
+                table.query(
+                    by_name.bind(name="Sam"),
+                    filter_expression=in_room.bind(room="A"),
+                )
+            )
+            self.assertEqual(
+                queried,
+                [
+                    Student(name="Sam", year=1, homeroom="A"),
+                    Student(name="Sam", year=2, homeroom="A"),
+                ],
+            )
+
+            # Compiled and uncompiled conditions can be mixed
+            queried = list(table.query(Student.name == "Sam", filter_expression=recent))
+            self.assertEqual(len(queried), 2)
+
+            scanned = list(table.scan(in_room.bind(room="A")))
+            self.assertEqual(len(scanned), 3)
+
+            result = table.update_item(
+                ("Sam", 3),
+                Student.homeroom.set("C"),
+                condition_expression=in_room.bind(room="A"),
+            )
+            self.assertIsNone(result)
+
+            result = table.update_item(
+                ("Sam", 3),
+                Student.homeroom.set("C"),
+                condition_expression=in_room.bind(room="B"),
+            )
+            self.assertEqual(result, Student(name="Sam", year=3, homeroom="C"))
+
+            self.assertFalse(table.delete_item(("Alex", 1), in_room.bind(room="B")))
+            self.assertTrue(table.delete_item(("Alex", 1), in_room.bind(room="A")))
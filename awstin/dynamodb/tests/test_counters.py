@@ -0,0 +1,176 @@
+import gc
+import threading
+import unittest
+import unittest.mock as mock
+import weakref
+
+from botocore.exceptions import ClientError
+
+from awstin.dynamodb import Attr, DynamoModel, Key
+from awstin.dynamodb.counters import _flush_open_aggregators
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class PageViews(DynamoModel):
+    _table_name_ = "temp"
+
+    page = Key()
+
+    views = Attr()
+
+    visitors = Attr()
+
+
+class TestCounterAggregator(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(PageViews, "page")
+
+    def test_merges_deltas_per_key(self):
+        with self.temp_table as table:
+            table.put_item(PageViews(page="a", views=10))
+
+            with mock.patch.object(
+                table._client,
+                "update_item",
+                wraps=table._client.update_item,
+            ) as update_item:
+                with table.counters(flush_interval=None) as counters:
+                    for _ in range(100):
+                        counters.add("a", PageViews.views)
+                        counters.add({"page": "b"}, PageViews.views, 2)
+                    counters.add("b", PageViews.visitors, 0.5)
+                    counters.add("c", PageViews.views, 1)
+                    counters.add("c", PageViews.views, -1)
+
+            self.assertEqual(update_item.call_count, 2)
+            self.assertEqual(table["a"].views, 110)
+            self.assertEqual(table["b"].views, 200)
+            self.assertEqual(table["b"].visitors, 0.5)
+
+    def test_concurrent_adds(self):
+        with self.temp_table as table:
+            counters = table.counters(flush_interval=None, max_keys=3)
+
+            def increment():
+                for i in range(200):
+                    counters.add(str(i % 5), PageViews.views)
+
+            threads = [threading.Thread(target=increment) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+                self.assertLessEqual(len(counters), 3)
+            counters.close()
+
+            totals = {item.page: item.views for item in table.scan()}
+            self.assertEqual(totals, {str(i): 160 for i in range(5)})
+
+    def test_flush_on_interval(self):
+        with self.temp_table as table:
+            counters = table.counters(flush_interval=0.05)
+            counters.add("a", PageViews.views)
+
+            for _ in range(50):
+                if not len(counters):
+                    break
+                threading.Event().wait(0.1)
+
+            self.assertEqual(table["a"].views, 1)
+            counters.close()
+
+    def test_rejected_update_kept_pending(self):
+        with self.temp_table as table:
+            counters = table.counters(flush_interval=None)
+            counters.add("a", PageViews.views, 3)
+
+            error = ClientError(
+                {"Error": {"Code": "ProvisionedThroughputExceededException"}},
+                "UpdateItem",
+            )
+            with mock.patch.object(table, "_request", side_effect=error):
+                with self.assertRaises(ClientError):
+                    counters.flush()
+
+            counters.add("a", PageViews.views, 2)
+            counters.close()
+            self.assertEqual(table["a"].views, 5)
+
+    def test_failed_update_dropped(self):
+        with self.temp_table as table:
+            table.put_item(PageViews(page="a", views="not a number"))
+            counters = table.counters(flush_interval=None)
+            counters.add("a", PageViews.views, 3)
+
+            with self.assertLogs("awstin.dynamodb.counters", "ERROR"):
+                with self.assertRaises(ClientError):
+                    counters.flush()
+
+            # Permanent errors aren't retried on every flush
+            self.assertEqual(len(counters), 0)
+            self.assertEqual(counters.flush(), 0)
+
+            # Updates that may have been applied aren't retried either
+            counters.add("b", PageViews.views, 3)
+            error = ClientError(
+                {"Error": {"Code": "InternalServerError"}},
+                "UpdateItem",
+            )
+            with mock.patch.object(table, "_request", side_effect=error):
+                with self.assertLogs("awstin.dynamodb.counters", "ERROR"):
+                    with self.assertRaises(ClientError):
+                        counters.flush()
+
+            counters.close()
+            self.assertEqual(table["a"].views, "not a number")
+            with self.assertRaises(KeyError):
+                table["b"]
+
+    def test_requeue_respects_max_keys(self):
+        with self.temp_table as table:
+            counters = table.counters(flush_interval=None, max_keys=2)
+            counters.add("a", PageViews.views, 1)
+            counters.add("b", PageViews.views, 1)
+
+            error = ClientError(
+                {"Error": {"Code": "ThrottlingException"}},
+                "UpdateItem",
+            )
+
+            def throttled(*args, **kwargs):
+                # A new key is added while the flush is in progress
+                counters.add("c", PageViews.views, 1)
+                raise error
+
+            with mock.patch.object(table, "_request", side_effect=throttled):
+                with self.assertLogs("awstin.dynamodb.counters", "ERROR"):
+                    with self.assertRaises(ClientError):
+                        counters.flush()
+
+            self.assertEqual(len(counters), 2)
+            counters.close()
+            self.assertEqual(len(list(table.scan())), 2)
+
+    def test_closed_rejects_adds(self):
+        with self.temp_table as table:
+            with table.counters() as counters:
+                pass
+
+            with self.assertRaises(ValueError):
+                counters.add("a", PageViews.views)
+
+    def test_flushed_at_exit_unless_dropped(self):
+        with self.temp_table as table:
+            counters = table.counters(flush_interval=None)
+            counters.add("a", PageViews.views)
+
+            _flush_open_aggregators()
+            self.assertEqual(len(counters), 0)
+            self.assertEqual(table["a"].views, 1)
+
+            counters.add("a", PageViews.views)
+            dropped = weakref.ref(counters)
+            del counters
+            gc.collect()
+
+            self.assertIsNone(dropped())
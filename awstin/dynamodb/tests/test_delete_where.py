@@ -0,0 +1,259 @@
+import unittest
+import unittest.mock as mock
+from concurrent.futures import ThreadPoolExecutor
+
+from awstin.dynamodb import (
+    Attr,
+    CapacityRateLimiter,
+    DynamoDB,
+    DynamoModel,
+    Key,
+    compile_condition,
+)
+from awstin.dynamodb.fanout import fan_out
+from awstin.dynamodb.ratelimit import READ, WRITE
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Event(DynamoModel):
+    _table_name_ = "temp"
+
+    device = Key()
+
+    timestamp = Key()
+
+    kind = Attr()
+
+    payload = Attr()
+
+
+class ShardedEvent(DynamoModel):
+    _table_name_ = "temp"
+
+    device = Key(shards=4, shard_by="timestamp")
+
+    timestamp = Key()
+
+    kind = Attr()
+
+
+class BucketedEvent(DynamoModel):
+    _table_name_ = "temp"
+
+    device = Key(bucket="hour", bucket_by="timestamp")
+
+    timestamp = Key()
+
+    kind = Attr()
+
+
+class EventsByKind(DynamoModel):
+    _table_name_ = "temp"
+    _index_name_ = "ByKind"
+
+    kind = Key()
+
+    timestamp = Key()
+
+
+class TestDeleteWhere(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Event,
+            "device",
+            sortkey_name="timestamp",
+            sortkey_type="N",
+            extra_attributes=[{"AttributeName": "kind", "AttributeType": "S"}],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "ByKind",
+                    "KeySchema": [
+                        {"AttributeName": "kind", "KeyType": "HASH"},
+                        {"AttributeName": "timestamp", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "KEYS_ONLY"},
+                    "ProvisionedThroughput": {
+                        "ReadCapacityUnits": 123,
+                        "WriteCapacityUnits": 123,
+                    },
+                }
+            ],
+        )
+
+    def load(self, table, count=200):
+        table.put_items(
+            Event(
+                device=f"d{i % 4}",
+                timestamp=i,
+                kind="error" if i % 5 == 0 else "info",
+                payload="x" * 100,
+            )
+            for i in range(count)
+        )
+
+    def requests(self, table, operation):
+        client = table._client
+        return mock.patch.object(
+            client,
+            operation,
+            wraps=getattr(client, operation),
+        )
+
+    def batch_writes(self, table):
+        client = table._dynamodb.resource.meta.client
+        return mock.patch.object(
+            client,
+            "batch_write_item",
+            wraps=client.batch_write_item,
+        )
+
+    def test_delete_partition(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            with self.requests(table, "query") as query, self.requests(
+                table, "scan"
+            ) as scan, self.batch_writes(table) as batch_write:
+                deleted = table.delete_where(
+                    (Event.device == "d1") & (Event.timestamp < 100),
+                    parallelism=3,
+                )
+
+            self.assertEqual(deleted, 25)
+            scan.assert_not_called()
+            self.assertEqual(
+                sorted(
+                    set(query.call_args.kwargs["ExpressionAttributeNames"].values())
+                ),
+                ["device", "timestamp"],
+            )
+            self.assertEqual(batch_write.call_count, 1)
+            self.assertEqual(len(list(table.scan())), 175)
+            self.assertEqual(
+                len(list(table.query(Event.device == "d1"))),
+                25,
+            )
+
+    def test_delete_by_index_query(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            with self.requests(table, "query") as query, self.batch_writes(
+                table
+            ) as batch_write:
+                deleted = table.delete_where(Event.kind == "error")
+
+            self.assertEqual(deleted, 40)
+            self.assertEqual(query.call_args.kwargs["IndexName"], "ByKind")
+            self.assertEqual(
+                sorted(
+                    len(call.kwargs["RequestItems"]["temp"])
+                    for call in batch_write.call_args_list
+                ),
+                [15, 25],
+            )
+            self.assertTrue(all(item.kind == "info" for item in table.scan()))
+
+    def test_delete_scanned(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            self.assertEqual(table.delete_where(Event.timestamp >= 150), 50)
+            self.assertEqual(
+                table.delete_where(compile_condition(Event.timestamp < 10)),
+                10,
+            )
+            self.assertEqual(len(list(table.scan())), 140)
+
+            self.assertEqual(table.delete_where(parallelism=1), 140)
+            self.assertEqual(list(table.scan()), [])
+            self.assertEqual(table.delete_where(), 0)
+
+    def test_workers_within_connection_pool(self):
+        with self.temp_table:
+            table = DynamoDB(max_pool_connections=6)[Event]
+            self.load(table, 60)
+
+            with mock.patch(
+                "awstin.dynamodb.table.fan_out", wraps=fan_out
+            ) as read, mock.patch(
+                "awstin.dynamodb.table.ThreadPoolExecutor",
+                wraps=ThreadPoolExecutor,
+            ) as executor, self.requests(
+                table, "scan"
+            ) as scan:
+                deleted = table.delete_where(parallelism=16)
+
+            self.assertEqual(deleted, 60)
+            # Every segment is scanned, from half of the pool's threads
+            self.assertEqual(scan.call_args.kwargs["TotalSegments"], 16)
+            self.assertEqual(read.call_args.kwargs["concurrency"], 3)
+            executor.assert_called_once_with(max_workers=3)
+
+    def test_sharded_keys(self):
+        with self.temp_table:
+            table = DynamoDB()[ShardedEvent]
+            table.put_items(
+                ShardedEvent(device=f"d{i % 2}", timestamp=i, kind="info")
+                for i in range(40)
+            )
+
+            self.assertEqual(table.delete_where(ShardedEvent.device == "d0"), 20)
+            self.assertEqual(
+                sorted({item.device for item in table.scan()}),
+                ["d1"],
+            )
+
+    def test_bucketed_keys(self):
+        with self.temp_table:
+            table = DynamoDB()[BucketedEvent]
+            table.put_items(
+                BucketedEvent(device=f"d{i % 2}", timestamp=i * 600, kind="info")
+                for i in range(40)
+            )
+
+            with self.assertRaises(ValueError):
+                table.delete_where(BucketedEvent.device == "d0")
+            self.assertEqual(len(list(table.scan())), 40)
+
+            deleted = table.delete_where(
+                (BucketedEvent.device == "d0")
+                & BucketedEvent.timestamp.between(3600, 4 * 3600 - 1)
+            )
+
+            self.assertEqual(deleted, 9)
+            self.assertEqual(
+                sorted(item.timestamp for item in table.scan() if item.device == "d0"),
+                [0, 1200, 2400, *range(4 * 3600, 40 * 600, 1200)],
+            )
+            self.assertEqual(
+                len([item for item in table.scan() if item.device == "d1"]), 20
+            )
+
+    def test_rate_limiter(self):
+        with self.temp_table as table:
+            self.load(table, 60)
+            limiter = CapacityRateLimiter(read_capacity=1000, write_capacity=1000)
+
+            with mock.patch.object(
+                limiter,
+                "acquire",
+                wraps=limiter.acquire,
+            ) as acquire:
+                deleted = table.delete_where(
+                    Event.device == "d0",
+                    rate_limiter=limiter,
+                )
+
+            self.assertEqual(deleted, 15)
+            kinds = [call.args[0] for call in acquire.call_args_list]
+            self.assertIn(READ, kinds)
+            self.assertIn(WRITE, kinds)
+            self.assertIsNone(table.rate_limiter)
+
+    def test_invalid(self):
+        with self.temp_table as table:
+            with self.assertRaises(ValueError):
+                DynamoDB()[EventsByKind].delete_where(EventsByKind.kind == "info")
+            with self.assertRaises(ValueError):
+                table.delete_where(parallelism=0)
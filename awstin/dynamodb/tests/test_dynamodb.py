@@ -121,13 +121,14 @@ class TestDynamoDB(unittest.TestCase):
 
     def test_dynamodb_get_item_attribute_not_in_model(self):
         with self.table_without_sortkey as table:
-            table._boto3_table.put_item(
+            table._client.put_item(
+                TableName=table.name,
                 Item={
                     "hashkey": "abcde",
                     "another_attr": "vvv",
                     "not_in_model": 555,
                     "also_not_in_model": "aaaa",
-                }
+                },
             )
 
             expected = ModelWithoutSortkey(
@@ -329,7 +330,8 @@ class TestDynamoDB(unittest.TestCase):
             table.put_item(test_item)
 
             # Item is serialized with the defined attribute names
-            boto_item = table._boto3_table.get_item(
+            boto_item = table._client.get_item(
+                TableName=table.name,
                 Key={"actual_key_name": "a hash key"},
             )["Item"]
             self.assertEqual(
@@ -1164,3 +1166,20 @@ class TestDynamoDB(unittest.TestCase):
             self.assertTrue(result)
             with self.assertRaises(KeyError):
                 table["123"]
+
+    def test_dynamodb_connection_config(self):
+        dynamodb = DynamoDB(
+            max_pool_connections=50,
+            tcp_keepalive=True,
+            read_timeout=3.0,
+            retry_mode="adaptive",
+        )
+
+        client_config = dynamodb.client.meta.config
+        self.assertEqual(client_config.max_pool_connections, 50)
+        self.assertTrue(client_config.tcp_keepalive)
+        self.assertEqual(client_config.read_timeout, 3.0)
+        self.assertEqual(client_config.retries["mode"], "adaptive")
+
+        resource_config = dynamodb.resource.meta.client.meta.config
+        self.assertEqual(resource_config.max_pool_connections, 50)
@@ -0,0 +1,189 @@
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import Attr, DynamoDB, DynamoModel, Key
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Order(DynamoModel):
+    _table_name_ = "temp"
+
+    customer = Key()
+
+    order_id = Key()
+
+    status = Attr()
+
+    placed = Attr()
+
+    total = Attr()
+
+
+class OrderSummary(DynamoModel):
+    _table_name_ = "temp"
+
+    customer = Key()
+
+    order_id = Key()
+
+    status = Attr()
+
+
+class OrdersByStatus(DynamoModel):
+    _table_name_ = "temp"
+    _index_name_ = "ByStatus"
+
+    status = Key()
+
+    placed = Key()
+
+    customer = Attr()
+
+    order_id = Attr()
+
+
+def _index(name, partition_key, sort_key, projection):
+    return {
+        "IndexName": name,
+        "KeySchema": [
+            {"AttributeName": partition_key, "KeyType": "HASH"},
+            {"AttributeName": sort_key, "KeyType": "RANGE"},
+        ],
+        "Projection": projection,
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 123,
+            "WriteCapacityUnits": 123,
+        },
+    }
+
+
+class TestFind(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Order,
+            "customer",
+            sortkey_name="order_id",
+            extra_attributes=[
+                {"AttributeName": "status", "AttributeType": "S"},
+                {"AttributeName": "placed", "AttributeType": "N"},
+            ],
+            GlobalSecondaryIndexes=[
+                _index("ByStatus", "status", "placed", {"ProjectionType": "ALL"}),
+                _index(
+                    "StatusKeys",
+                    "status",
+                    "order_id",
+                    {"ProjectionType": "KEYS_ONLY"},
+                ),
+            ],
+        )
+
+    def load(self, table):
+        for i in range(20):
+            table.put_item(
+                Order(
+                    customer=f"c{i % 4}",
+                    order_id=f"o{i:02d}",
+                    status="open" if i % 2 else "closed",
+                    placed=i,
+                    total=i * 10,
+                )
+            )
+
+    def test_queries_table(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            plan = table.find(
+                (Order.customer == "c1") & (Order.order_id > "o04") & (Order.total > 0)
+            )
+
+            self.assertEqual((plan.operation, plan.index_name), ("query", None))
+            self.assertEqual(
+                [item.order_id for item in plan], ["o05", "o09", "o13", "o17"]
+            )
+            self.assertIn("Query table on key 'customer', 'order_id'", plan.explain())
+            self.assertIn("Filter on 'total'", plan.explain())
+
+    def test_queries_index(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            with mock.patch.object(
+                table._client,
+                "scan",
+                wraps=table._client.scan,
+            ) as scan:
+                plan = table.find((Order.status == "open") & (Order.placed < 8))
+                results = list(plan)
+
+            scan.assert_not_called()
+            self.assertEqual((plan.operation, plan.index_name), ("query", "ByStatus"))
+            self.assertEqual([item.placed for item in results], [1, 3, 5, 7])
+            self.assertTrue(all(isinstance(item, Order) for item in results))
+            self.assertEqual(results[0].total, 10)
+
+            explanation = plan.explain()
+            self.assertIn(
+                "Query index 'ByStatus' on key 'status', 'placed'", explanation
+            )
+            self.assertIn("table: no equality condition on partition key", explanation)
+            self.assertIn(
+                "index 'StatusKeys': doesn't project 'placed', 'total'", explanation
+            )
+
+    def test_keys_only_index_when_covered(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            plan = DynamoDB()[OrderSummary].find(
+                (OrderSummary.status == "closed") & (OrderSummary.order_id <= "o04")
+            )
+
+            self.assertEqual(plan.index_name, "StatusKeys")
+            self.assertEqual([item.order_id for item in plan], ["o00", "o02", "o04"])
+
+    def test_in_on_index_partition_key(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            plan = table.find(
+                Order.status.in_(["open", "closed"]) & (Order.placed > 15)
+            )
+
+            self.assertEqual(plan.index_name, "ByStatus")
+            self.assertEqual([item.placed for item in plan], [16, 17, 18, 19])
+
+    def test_falls_back_to_scan(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            plan = table.find(Order.total >= 170)
+            self.assertEqual(plan.operation, "scan")
+            self.assertEqual(
+                sorted(item.total for item in plan),
+                [170, 180, 190],
+            )
+
+            plan = table.find(Order.total >= 170, segments=4)
+            self.assertEqual(
+                sorted(item.total for item in plan),
+                [170, 180, 190],
+            )
+            self.assertTrue(
+                plan.explain().startswith("Parallel scan of table in 4 segments")
+            )
+
+    def test_index_model(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            plan = DynamoDB()[OrdersByStatus].find(OrdersByStatus.status == "open")
+
+            self.assertEqual((plan.operation, plan.index_name), ("query", "ByStatus"))
+            self.assertEqual(len(list(plan)), 10)
+
+    def test_invalid_condition(self):
+        with self.temp_table as table:
+            with self.assertRaises(TypeError):
+                table.find("customer = c1")
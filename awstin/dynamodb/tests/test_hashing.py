@@ -0,0 +1,136 @@
+import unittest
+import unittest.mock as mock
+from decimal import Decimal
+
+from awstin.dynamodb import Attr, ContentHashFilter, DynamoModel, Key
+from awstin.dynamodb.hashing import content_hash
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class MyModel(DynamoModel):
+    _table_name_ = "temp"
+
+    pkey = Key()
+
+    an_attr = Attr()
+
+    content = Attr()
+
+
+class TestContentHash(unittest.TestCase):
+    def test_stable_across_orderings(self):
+        first = {"a": 1, "b": {"x": [1, 2], "y": {"c", "d"}}}
+        second = {"b": {"y": {"d", "c"}, "x": [1, 2]}, "a": 1}
+
+        self.assertEqual(content_hash(first), content_hash(second))
+
+    def test_equal_numbers_hash_equal(self):
+        self.assertEqual(
+            content_hash({"a": 1}),
+            content_hash({"a": Decimal("1.00")}),
+        )
+
+    def test_types_distinguished(self):
+        self.assertNotEqual(content_hash({"a": 1}), content_hash({"a": "1"}))
+        self.assertNotEqual(content_hash({"a": [1]}), content_hash({"a": {1}}))
+        self.assertNotEqual(content_hash({"a": True}), content_hash({"a": 1}))
+
+    def test_list_order_matters(self):
+        self.assertNotEqual(
+            content_hash({"a": [1, 2]}),
+            content_hash({"a": [2, 1]}),
+        )
+
+
+class TestContentHashFilter(unittest.TestCase):
+    def test_local_store_bounded(self):
+        hash_filter = ContentHashFilter(max_keys=2)
+        for key in "abc":
+            hash_filter.record((key,), "hash")
+
+        self.assertFalse(hash_filter.unchanged(("a",), "hash"))
+        self.assertTrue(hash_filter.unchanged(("c",), "hash"))
+        self.assertEqual(hash_filter.written, 3)
+        self.assertEqual(hash_filter.skipped, 1)
+
+    def test_requires_some_store(self):
+        with self.assertRaises(ValueError):
+            ContentHashFilter(local=False)
+
+
+class TestSkipUnchanged(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(MyModel, "pkey")
+
+    def test_put_item_local_skip(self):
+        hash_filter = ContentHashFilter()
+
+        with self.temp_table as table:
+            with mock.patch.object(
+                table._client,
+                "put_item",
+                wraps=table._client.put_item,
+            ) as put_item:
+                table.put_item(MyModel(pkey="a", an_attr=1), skip_unchanged=hash_filter)
+                result = table.put_item(
+                    MyModel(pkey="a", an_attr=1.0),
+                    skip_unchanged=hash_filter,
+                )
+                table.put_item(MyModel(pkey="a", an_attr=2), skip_unchanged=hash_filter)
+
+            self.assertIsNone(result)
+            self.assertEqual(put_item.call_count, 2)
+            self.assertEqual(hash_filter.written, 2)
+            self.assertEqual(hash_filter.skipped, 1)
+            self.assertEqual(table["a"].an_attr, 2)
+
+    def test_put_item_stored_hash(self):
+        with self.temp_table as table:
+            table.put_item(
+                MyModel(pkey="a", an_attr=1),
+                skip_unchanged=ContentHashFilter(hash_attribute="content"),
+            )
+            stored = table["a"]
+            self.assertIsInstance(stored.content, str)
+
+            # A fresh filter has no local hashes, so relies on the condition
+            hash_filter = ContentHashFilter(hash_attribute="content", local=False)
+            result = table.put_item(
+                MyModel(pkey="a", an_attr=1),
+                skip_unchanged=hash_filter,
+            )
+            self.assertIsNone(result)
+            self.assertEqual(hash_filter.skipped, 1)
+
+            table.put_item(MyModel(pkey="a", an_attr=3), skip_unchanged=hash_filter)
+            self.assertEqual(hash_filter.written, 1)
+            self.assertEqual(table["a"].an_attr, 3)
+            self.assertNotEqual(table["a"].content, stored.content)
+
+    def test_put_items(self):
+        hash_filter = ContentHashFilter()
+
+        with self.temp_table as table:
+            items = [MyModel(pkey=str(i), an_attr=i) for i in range(60)]
+            written = table.put_items(items, skip_unchanged=hash_filter)
+            self.assertEqual(written, 60)
+            self.assertEqual(len(list(table.scan())), 60)
+
+            items[5].an_attr = "changed"
+            written = table.put_items(items, skip_unchanged=hash_filter)
+            self.assertEqual(written, 1)
+            self.assertEqual(hash_filter.skipped, 59)
+            self.assertEqual(table["5"].an_attr, "changed")
+
+    def test_put_items_duplicate_keys_last_wins(self):
+        with self.temp_table as table:
+            written = table.put_items(
+                [
+                    MyModel(pkey="a", an_attr=1),
+                    MyModel(pkey="b", an_attr=1),
+                    MyModel(pkey="a", an_attr=2),
+                ]
+            )
+
+            self.assertEqual(written, 2)
+            self.assertEqual(table["a"].an_attr, 2)
@@ -0,0 +1,111 @@
+import unittest
+
+from botocore.exceptions import ClientError
+
+from awstin.dynamodb import Attr, DynamoModel, Key, MetricsRegistry, Table
+from awstin.dynamodb.ratelimit import READ, WRITE
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class MeteredModel(DynamoModel):
+    _table_name_ = "metered"
+
+    pkey = Key()
+
+    value = Attr()
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_record_response(self):
+        registry = MetricsRegistry()
+        response = {
+            "Items": [{}, {}],
+            "Count": 2,
+            "ScannedCount": 20,
+            "ConsumedCapacity": {
+                "TableName": "tab",
+                "CapacityUnits": 5.5,
+                "GlobalSecondaryIndexes": {"gsi": {"CapacityUnits": 1.5}},
+            },
+            "ResponseMetadata": {
+                "RetryAttempts": 2,
+                "HTTPHeaders": {"content-length": "1234"},
+            },
+        }
+
+        registry.record_response("tab", None, "scan", READ, response, 0.03)
+
+        snapshot = {
+            (entry["table"], entry["index"], entry["operation"]): entry
+            for entry in registry.snapshot()
+        }
+        scan = snapshot[("tab", None, "scan")]
+        self.assertEqual(scan["calls"], 1)
+        self.assertEqual(scan["items"], 2)
+        self.assertEqual(scan["scanned_count"], 20)
+        self.assertEqual(scan["read_capacity_units"], 5.5)
+        self.assertEqual(scan["write_capacity_units"], 0.0)
+        self.assertEqual(scan["retries"], 2)
+        self.assertEqual(scan["bytes"], 1234)
+        self.assertEqual(scan["latency_histogram"]["0.05"], 1)
+
+        index_scan = snapshot[("tab", "gsi", "scan")]
+        self.assertEqual(index_scan["calls"], 0)
+        self.assertEqual(index_scan["read_capacity_units"], 1.5)
+
+    def test_record_error(self):
+        registry = MetricsRegistry()
+        error = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException"}},
+            "PutItem",
+        )
+
+        registry.record_error("tab", None, "put_item", WRITE, error, 10.0)
+
+        (entry,) = registry.snapshot()
+        self.assertEqual(entry["calls"], 1)
+        self.assertEqual(entry["errors"], 1)
+        self.assertEqual(entry["throttles"], 1)
+        self.assertEqual(entry["latency_histogram"]["+Inf"], 1)
+
+    def test_listeners(self):
+        registry = MetricsRegistry()
+        events = []
+        registry.add_listener(events.append)
+
+        registry.record_response("tab", None, "get_item", READ, {"Item": {}}, 0.01)
+        registry.remove_listener(events.append)
+        registry.record_response("tab", None, "get_item", READ, {"Item": {}}, 0.01)
+
+        (event,) = events
+        self.assertEqual(event.operation, "get_item")
+        self.assertEqual(event.items, 1)
+
+    def test_snapshot_reset(self):
+        registry = MetricsRegistry()
+        registry.record_response("tab", None, "get_item", READ, {}, 0.01)
+
+        self.assertEqual(len(registry.snapshot(reset=True)), 1)
+        self.assertEqual(registry.snapshot(), [])
+
+    def test_table_records_operations(self):
+        registry = MetricsRegistry()
+
+        with temporary_dynamodb_table(MeteredModel, "pkey") as table:
+            metered = Table(table._dynamodb, MeteredModel, metrics=registry)
+
+            metered.put_item(MeteredModel(pkey="a", value=1))
+            metered.put_item(MeteredModel(pkey="b", value=2))
+            metered["a"]
+            list(metered.scan(MeteredModel.value > 1))
+            metered.update_item("a", MeteredModel.value.set(5), MeteredModel.value > 10)
+
+        snapshot = {entry["operation"]: entry for entry in registry.snapshot()}
+
+        self.assertEqual(snapshot["put_item"]["calls"], 2)
+        self.assertGreater(snapshot["put_item"]["write_capacity_units"], 0)
+        self.assertEqual(snapshot["get_item"]["items"], 1)
+        self.assertGreater(snapshot["get_item"]["read_capacity_units"], 0)
+        self.assertEqual(snapshot["scan"]["items"], 1)
+        self.assertEqual(snapshot["scan"]["scanned_count"], 2)
+        self.assertEqual(snapshot["update_item"]["errors"], 1)
@@ -0,0 +1,261 @@
+import unittest
+import unittest.mock as mock
+
+from botocore.exceptions import ClientError
+
+from awstin.dynamodb import Attr, DynamoDB, DynamoModel, Key, UnprocessedRequests
+from awstin.dynamodb.partiql import prepare_statement
+from awstin.dynamodb.table import MAX_BATCH_ATTEMPTS
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Movie(DynamoModel):
+    _table_name_ = "temp"
+
+    year = Key()
+
+    title = Key()
+
+    rating = Attr()
+
+
+class TestPreparedStatement(unittest.TestCase):
+    def test_named_parameters(self):
+        prepared = prepare_statement(
+            "SELECT * FROM \"temp\" WHERE title = ':not' AND year = :year "
+            "AND rating > :rating"
+        )
+
+        self.assertEqual(
+            prepared.statement,
+            "SELECT * FROM \"temp\" WHERE title = ':not' AND year = ? "
+            "AND rating > ?",
+        )
+        self.assertEqual(prepared.parameter_names, ("year", "rating"))
+        self.assertTrue(prepared.reads)
+        self.assertEqual(
+            prepared.parameters({"rating": 7.5, "year": 1994}), [1994, 7.5]
+        )
+        with self.assertRaises(ValueError):
+            prepared.parameters({"year": 1994})
+        with self.assertRaises(ValueError):
+            prepared.parameters([1994, 7.5])
+
+    def test_positional_parameters(self):
+        prepared = prepare_statement('DELETE FROM "temp" WHERE year = ? AND title = ?')
+
+        self.assertIsNone(prepared.parameter_names)
+        self.assertFalse(prepared.reads)
+        self.assertEqual(prepared.parameters((1994, "x")), [1994, "x"])
+        with self.assertRaises(ValueError):
+            prepared.parameters([1994])
+
+        with self.assertRaises(ValueError):
+            prepare_statement('SELECT * FROM "temp" WHERE year = ? AND title = :t')
+
+    def test_cached(self):
+        statement = 'SELECT * FROM "temp" WHERE year = :year'
+        self.assertIs(prepare_statement(statement), prepare_statement(statement))
+
+
+class TestExecute(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Movie,
+            "year",
+            hashkey_type="N",
+            sortkey_name="title",
+        )
+
+    def load(self, table):
+        table.put_items(
+            Movie(year=1990 + i % 3, title=f"Movie {i:02d}", rating=i / 2)
+            for i in range(30)
+        )
+
+    def test_execute(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            movies = list(
+                table.execute(
+                    'SELECT * FROM "temp" WHERE year = :year',
+                    {"year": 1991},
+                )
+            )
+
+            self.assertTrue(all(isinstance(movie, Movie) for movie in movies))
+            self.assertEqual(
+                sorted(movie.rating for movie in movies),
+                [0.5, 2, 3.5, 5, 6.5, 8, 9.5, 11, 12.5, 14],
+            )
+
+            updated = table.execute(
+                'UPDATE "temp" SET rating = ? WHERE year = ? AND title = ?',
+                [1.5, 1990, "Movie 00"],
+            )
+            self.assertEqual(list(updated), [])
+            self.assertEqual(table[1990, "Movie 00"].rating, 1.5)
+
+    def test_pagination(self):
+        with self.temp_table as table:
+            self.load(table)
+            client = table._dynamodb.resource.meta.client
+            real_execute = client.execute_statement
+
+            def execute_statement(**kwargs):
+                # Split the results into pages of 4 items
+                start = int(kwargs.pop("NextToken", 0))
+                response = real_execute(**kwargs)
+                items = response["Items"]
+                response["Items"] = items[start : start + 4]
+                if start + 4 < len(items):
+                    response["NextToken"] = str(start + 4)
+                return response
+
+            with mock.patch.object(
+                client,
+                "execute_statement",
+                side_effect=execute_statement,
+            ) as execute:
+                movies = table.execute('SELECT * FROM "temp" WHERE year = ?', [1992])
+                self.assertEqual(execute.call_count, 1)
+
+                first = [next(movies) for _ in range(4)]
+                self.assertEqual(execute.call_count, 1)
+                rest = list(movies)
+
+            self.assertEqual(execute.call_count, 3)
+            self.assertEqual(len(first + rest), 10)
+            self.assertEqual(execute.call_args.kwargs["NextToken"], "8")
+
+
+class TestBatchExecute(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Movie,
+            "year",
+            hashkey_type="N",
+            sortkey_name="title",
+        )
+
+    def batch_calls(self, dynamodb):
+        client = dynamodb.resource.meta.client
+        return mock.patch.object(
+            client,
+            "batch_execute_statement",
+            wraps=client.batch_execute_statement,
+        )
+
+    def test_batch_execute(self):
+        with self.temp_table as table:
+            table.put_items(
+                Movie(year=2000, title=f"Movie {i:02d}", rating=i) for i in range(40)
+            )
+            dynamodb = DynamoDB()
+            select = "SELECT * FROM temp WHERE year = :year AND title = :title"
+            update = "UPDATE temp SET rating = ? WHERE year = ? AND title = ?"
+
+            statements = [
+                (Movie, select, {"year": 2000, "title": f"Movie {i:02d}"})
+                for i in range(30)
+            ]
+            statements.insert(5, (Movie, update, [99, 2000, "Movie 39"]))
+            statements.append((Movie, select, {"year": 1900, "title": "None"}))
+
+            with self.batch_calls(dynamodb) as batch_execute:
+                results = dynamodb.batch_execute(statements)
+
+            self.assertEqual(len(results), 32)
+            self.assertIsNone(results[5])
+            self.assertIsNone(results[-1])
+            found = results[:5] + results[6:-1]
+            self.assertEqual(
+                [(movie.title, movie.rating) for movie in found],
+                [(f"Movie {i:02d}", i) for i in range(30)],
+            )
+            self.assertEqual(table[2000, "Movie 39"].rating, 99)
+
+            # Reads and writes are sent separately, 25 statements at most
+            sizes = sorted(
+                len(call.kwargs["Statements"]) for call in batch_execute.call_args_list
+            )
+            self.assertEqual(sizes, [1, 6, 25])
+
+    def test_retries_throttled_statements(self):
+        with self.temp_table as table:
+            table.put_item(Movie(year=2000, title="A", rating=1))
+            table.put_item(Movie(year=2000, title="B", rating=2))
+            dynamodb = DynamoDB()
+            client = dynamodb.resource.meta.client
+            real_batch_execute = client.batch_execute_statement
+            calls = []
+
+            def batch_execute_statement(Statements, **kwargs):
+                calls.append(Statements)
+                response = real_batch_execute(Statements=Statements, **kwargs)
+                if len(calls) == 1:
+                    response["Responses"][1] = {
+                        "Error": {"Code": "ThrottlingError", "Message": "Slow down"}
+                    }
+                return response
+
+            select = "SELECT * FROM temp WHERE year = ? AND title = ?"
+            with mock.patch.object(
+                client,
+                "batch_execute_statement",
+                side_effect=batch_execute_statement,
+            ):
+                results = dynamodb.batch_execute(
+                    [(Movie, select, [2000, "A"]), (Movie, select, [2000, "B"])]
+                )
+
+            self.assertEqual([movie.rating for movie in results], [1, 2])
+            self.assertEqual([len(statements) for statements in calls], [2, 1])
+
+    def test_gives_up_on_throttled_statements(self):
+        dynamodb = DynamoDB()
+        client = dynamodb.resource.meta.client
+        throttled = {"Error": {"Code": "ThrottlingError", "Message": "Slow down"}}
+
+        def batch_execute_statement(Statements, **kwargs):
+            return {"Responses": [throttled for _ in Statements]}
+
+        select = "SELECT * FROM temp WHERE year = ? AND title = ?"
+        with mock.patch(
+            "awstin.dynamodb.table._BATCH_RETRY_DELAY", 0
+        ), mock.patch.object(
+            client,
+            "batch_execute_statement",
+            side_effect=batch_execute_statement,
+        ) as batch_execute:
+            with self.assertRaises(UnprocessedRequests) as raised:
+                dynamodb.batch_execute([(Movie, select, [2000, "A"])])
+
+        self.assertEqual(batch_execute.call_count, MAX_BATCH_ATTEMPTS)
+        self.assertEqual(
+            raised.exception.unprocessed,
+            [{"Statement": select, "Parameters": [2000, "A"]}],
+        )
+
+    def test_errors(self):
+        dynamodb = DynamoDB()
+        client = dynamodb.resource.meta.client
+        response = {
+            "Responses": [
+                {"Error": {"Code": "ConditionalCheckFailed", "Message": "No"}},
+                {"Error": {"Code": "ValidationError", "Message": "Bad"}},
+            ]
+        }
+        delete = "DELETE FROM temp WHERE year = ? AND title = ?"
+
+        with mock.patch.object(
+            client, "batch_execute_statement", return_value=response
+        ):
+            with self.assertRaises(ClientError) as raised:
+                dynamodb.batch_execute(
+                    [(Movie, delete, [1, "a"]), (Movie, delete, [1, "b"])]
+                )
+
+        self.assertEqual(raised.exception.response["Error"]["Code"], "ValidationError")
+        self.assertEqual(dynamodb.batch_execute([]), [])
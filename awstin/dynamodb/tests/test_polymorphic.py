@@ -0,0 +1,112 @@
+import unittest
+
+from awstin.dynamodb import Attr, DynamoModel, Key, PolymorphicModel
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Customer(DynamoModel):
+    _table_name_ = "temp"
+
+    pk = Key()
+
+    sk = Key()
+
+    name = Attr()
+
+
+class Order(DynamoModel):
+    _table_name_ = "temp"
+
+    pk = Key()
+
+    sk = Key()
+
+    total = Attr()
+
+
+class Note(DynamoModel):
+    _table_name_ = "temp"
+
+    pk = Key()
+
+    sk = Key()
+
+    kind = Attr()
+
+    text = Attr()
+
+
+class Other(DynamoModel):
+    _table_name_ = "other"
+
+    pk = Key()
+
+
+class Sharded(DynamoModel):
+    _table_name_ = "temp"
+
+    pk = Key(shards=2)
+
+
+ENTITIES = PolymorphicModel(
+    {"CUSTOMER": Customer, "ORDER": Order},
+    discriminator="sk",
+    prefix_separator="#",
+)
+
+
+class TestPolymorphicModel(unittest.TestCase):
+    def test_dispatch(self):
+        self.assertIs(ENTITIES.model_for({"sk": "ORDER#1"}), Order)
+        self.assertIs(ENTITIES.model_for({"sk": "CUSTOMER"}), Customer)
+
+        item = ENTITIES.deserialize({"pk": "c1", "sk": "ORDER#1", "total": 5})
+        self.assertIsInstance(item, Order)
+        self.assertEqual(item.total, 5)
+
+        with self.assertRaises(ValueError):
+            ENTITIES.deserialize({"pk": "c1", "sk": "INVOICE#1"})
+
+    def test_discriminator_attribute_and_default(self):
+        entities = PolymorphicModel(
+            {"note": Note},
+            discriminator="kind",
+            default=Customer,
+        )
+
+        self.assertIsInstance(entities.deserialize({"kind": "note"}), Note)
+        self.assertIsInstance(entities.deserialize({"pk": "c1"}), Customer)
+
+    def test_invalid_models(self):
+        with self.assertRaises(ValueError):
+            PolymorphicModel({"a": Customer, "b": Other}, discriminator="sk")
+        with self.assertRaises(ValueError):
+            PolymorphicModel({"a": Sharded}, discriminator="sk")
+        with self.assertRaises(ValueError):
+            PolymorphicModel({}, discriminator="sk")
+
+
+class TestPolymorphicTable(unittest.TestCase):
+    def test_item_collection_in_one_query(self):
+        with temporary_dynamodb_table(ENTITIES, "pk", sortkey_name="sk") as table:
+            table.put_item(Customer(pk="c1", sk="CUSTOMER", name="Ada"))
+            table.put_item(Order(pk="c1", sk="ORDER#2021-01", total=10))
+            table.put_item(Order(pk="c1", sk="ORDER#2021-02", total=20))
+            table.put_item(Customer(pk="c2", sk="CUSTOMER", name="Bob"))
+
+            results = list(table.query(Customer.pk == "c1"))
+
+            self.assertEqual(
+                [type(item) for item in results],
+                [Customer, Order, Order],
+            )
+            self.assertEqual(results[0].name, "Ada")
+            self.assertEqual([item.total for item in results[1:]], [10, 20])
+
+            orders = list(
+                table.query((Order.pk == "c1") & Order.sk.begins_with("ORDER#"))
+            )
+            self.assertEqual(len(orders), 2)
+
+            self.assertIsInstance(table["c2", "CUSTOMER"], Customer)
+            self.assertEqual(len(list(table.scan())), 4)
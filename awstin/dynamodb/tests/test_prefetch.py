@@ -0,0 +1,124 @@
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import Attr, DynamoModel, Key, Reference
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Author(DynamoModel):
+    _table_name_ = "authors"
+
+    author_id = Key()
+
+    name = Attr()
+
+
+class Publisher(DynamoModel):
+    _table_name_ = "publishers"
+
+    country = Key()
+
+    publisher_id = Key()
+
+    name = Attr()
+
+
+class Book(DynamoModel):
+    _table_name_ = "books"
+
+    book_id = Key()
+
+    shelf = Attr()
+
+    author = Reference(Author)
+
+    publisher = Reference(Publisher)
+
+
+class TestPrefetchRelated(unittest.TestCase):
+    def tables(self):
+        return (
+            temporary_dynamodb_table(Book, "book_id", hashkey_type="N"),
+            temporary_dynamodb_table(Author, "author_id"),
+            temporary_dynamodb_table(Publisher, "country", sortkey_name="publisher_id"),
+        )
+
+    def load(self, books, authors, publishers):
+        for i in range(5):
+            authors.put_item(Author(author_id=f"a{i}", name=f"Author {i}"))
+        publishers.put_item(Publisher(country="uk", publisher_id="p1", name="Pub"))
+
+        for i in range(150):
+            books.put_item(
+                Book(
+                    book_id=i,
+                    shelf=i % 2,
+                    author=f"a{i % 6}",
+                    publisher=["uk", "p1"] if i % 3 == 0 else None,
+                )
+            )
+
+    def test_scan_resolves_references(self):
+        books_table, authors_table, publishers_table = self.tables()
+        with books_table as books, authors_table as authors, publishers_table as pubs:
+            self.load(books, authors, pubs)
+
+            client = books._dynamodb.resource.meta.client
+            with mock.patch.object(
+                client,
+                "batch_get_item",
+                wraps=client.batch_get_item,
+            ) as batch_get:
+                results = list(
+                    books.scan(prefetch_related=[Book.author, Book.publisher])
+                )
+
+            self.assertEqual(len(results), 150)
+            for book in results:
+                author = book.related(Book.author)
+                if book.author == "a5":
+                    self.assertIsNone(author)
+                else:
+                    self.assertEqual(author.name, f"Author {book.author[1:]}")
+
+                publisher = book.related("publisher")
+                if book.book_id % 3 == 0:
+                    self.assertEqual(publisher.name, "Pub")
+                else:
+                    self.assertIsNone(publisher)
+
+            # One request shared by the referenced tables per chunk of 100 items
+            self.assertEqual(batch_get.call_count, 2)
+            for call in batch_get.call_args_list:
+                for request in call.kwargs["RequestItems"].values():
+                    keys = [tuple(key.items()) for key in request["Keys"]]
+                    self.assertEqual(len(keys), len(set(keys)))
+
+    def test_query_prefetch(self):
+        books_table, authors_table, publishers_table = self.tables()
+        with books_table as books, authors_table as authors, publishers_table as pubs:
+            self.load(books, authors, pubs)
+
+            (book,) = books.query(Book.book_id == 7, prefetch_related=[Book.author])
+
+            self.assertEqual(book.related(Book.author).author_id, "a1")
+            with self.assertRaises(ValueError):
+                book.related(Book.publisher)
+
+    def test_not_prefetched(self):
+        with self.assertRaises(ValueError):
+            Book(book_id=1, author="a1").related(Book.author)
+
+    def test_invalid_reference(self):
+        with temporary_dynamodb_table(Book, "book_id", hashkey_type="N") as books:
+            books.put_item(Book(book_id=1))
+            with self.assertRaises(TypeError):
+                list(books.scan(prefetch_related=[Book.shelf]))
+
+    def test_stored_as_key(self):
+        book = Book(book_id=1, author="a1", publisher=["uk", "p1"])
+
+        self.assertEqual(
+            book.serialize(),
+            {"book_id": 1, "author": "a1", "publisher": ["uk", "p1"]},
+        )
@@ -0,0 +1,88 @@
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import Attr, DynamoModel, Key
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Event(DynamoModel):
+    _table_name_ = "temp"
+
+    device = Key()
+
+    timestamp = Key()
+
+    value = Attr()
+
+
+class TestQueryMany(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Event,
+            "device",
+            sortkey_name="timestamp",
+            sortkey_type="N",
+        )
+
+    def load(self, table):
+        for device in range(5):
+            for ts in range(device, 60, 5):
+                table.put_item(Event(device=str(device), timestamp=ts, value=device))
+
+    def test_merged_in_sort_order(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            results = list(table.query_many(["0", "2", "4", "missing"]))
+
+            self.assertEqual(
+                [item.timestamp for item in results],
+                sorted(ts for d in (0, 2, 4) for ts in range(d, 60, 5)),
+            )
+
+    def test_sort_condition_and_filter(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            results = list(
+                table.query_many(
+                    ["1", "3", "1"],
+                    Event.timestamp.between(10, 30),
+                    filter_expression=Event.value == 3,
+                )
+            )
+
+            self.assertEqual([item.timestamp for item in results], [13, 18, 23, 28])
+
+    def test_limit_stops_early(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            with mock.patch.object(
+                table._client,
+                "query",
+                wraps=table._client.query,
+            ) as query:
+                results = list(table.query_many(["0", "1", "2", "3", "4"], limit=7))
+
+            self.assertEqual([item.timestamp for item in results], list(range(7)))
+            self.assertLessEqual(query.call_count, 5)
+
+    def test_in_on_partition_key(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            results = list(
+                table.query(Event.device.in_(["0", "1"]) & (Event.timestamp < 12))
+            )
+
+            self.assertEqual(
+                [(item.device, item.timestamp) for item in results],
+                [("0", 0), ("1", 1), ("0", 5), ("1", 6), ("0", 10), ("1", 11)],
+            )
+
+    def test_empty(self):
+        with self.temp_table as table:
+            self.load(table)
+
+            self.assertEqual(list(table.query_many([])), [])
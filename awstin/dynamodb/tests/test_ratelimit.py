@@ -0,0 +1,198 @@
+import threading
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import (
+    Attr,
+    CapacityRateLimiter,
+    DynamoDB,
+    DynamoModel,
+    Key,
+    Table,
+)
+from awstin.dynamodb.ratelimit import (
+    READ,
+    WRITE,
+    TokenBucket,
+    consumed_capacity_units,
+)
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class LimitedModel(DynamoModel):
+    _table_name_ = "limited"
+
+    pkey = Key()
+
+    value = Attr()
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_acquire_with_tokens_does_not_wait(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+
+        bucket.acquire()
+
+        self.assertEqual(clock.sleeps, [])
+
+    def test_consume_into_debt_waits_for_repayment(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+
+        bucket.consume(30)
+        self.assertEqual(bucket.tokens, -20)
+
+        bucket.acquire()
+
+        # 20 units of debt at 10/s, plus a positive balance
+        self.assertGreaterEqual(clock.now, 2.0)
+        self.assertGreater(bucket.tokens, 0)
+
+    def test_refill_capped_at_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, burst=15, clock=clock, sleep=clock.sleep)
+
+        bucket.consume(15)
+        clock.now += 100
+
+        self.assertEqual(bucket.tokens, 15)
+
+    def test_rate_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_shared_between_threads(self):
+        clock = FakeClock()
+        bucket = TokenBucket(1000, clock=clock, sleep=clock.sleep)
+
+        def worker():
+            for _ in range(100):
+                bucket.consume(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(bucket.tokens, 500)
+
+
+class TestCapacityRateLimiter(unittest.TestCase):
+    def test_consumed_capacity_units(self):
+        self.assertIsNone(consumed_capacity_units(None))
+        self.assertEqual(consumed_capacity_units({"CapacityUnits": 2.5}), 2.5)
+        self.assertEqual(
+            consumed_capacity_units([{"CapacityUnits": 1.0}, {"CapacityUnits": 3}]),
+            4.0,
+        )
+
+    def test_charges_reported_units(self):
+        clock = FakeClock()
+        limiter = CapacityRateLimiter(
+            read_capacity=5,
+            write_capacity=2,
+            clock=clock,
+            sleep=clock.sleep,
+        )
+
+        limiter.consume(READ, {"CapacityUnits": 10.0})
+        limiter.acquire(READ)
+
+        # Debt of 5 RCU repaid at 5 RCU/s
+        self.assertGreaterEqual(clock.now, 1.0)
+
+    def test_missing_capacity_charged_default(self):
+        clock = FakeClock()
+        limiter = CapacityRateLimiter(write_capacity=1, clock=clock, sleep=clock.sleep)
+
+        limiter.consume(WRITE, None)
+        limiter.consume(WRITE, None)
+        limiter.acquire(WRITE)
+
+        self.assertGreaterEqual(clock.now, 1.0)
+
+    def test_unlimited_kind(self):
+        clock = FakeClock()
+        limiter = CapacityRateLimiter(write_capacity=1, clock=clock, sleep=clock.sleep)
+
+        self.assertFalse(limiter.limits(READ))
+        self.assertTrue(limiter.limits(WRITE))
+
+        limiter.consume(READ, {"CapacityUnits": 1000})
+        limiter.acquire(READ)
+        self.assertEqual(clock.sleeps, [])
+
+    def test_table_charges_consumed_capacity(self):
+        clock = FakeClock()
+        limiter = CapacityRateLimiter(
+            read_capacity=100,
+            write_capacity=100,
+            clock=clock,
+            sleep=clock.sleep,
+        )
+
+        with temporary_dynamodb_table(LimitedModel, "pkey") as table:
+            limited_table = Table(table._dynamodb, LimitedModel, rate_limiter=limiter)
+
+            for i in range(10):
+                limited_table.put_item(LimitedModel(pkey=str(i)))
+            items = list(limited_table.scan())
+
+        self.assertEqual(len(items), 10)
+        self.assertLess(limiter._buckets[WRITE].tokens, 100)
+        self.assertLess(limiter._buckets[READ].tokens, 100)
+
+    def test_failed_conditional_write_charged(self):
+        clock = FakeClock()
+        limiter = CapacityRateLimiter(
+            write_capacity=100, clock=clock, sleep=clock.sleep
+        )
+
+        with temporary_dynamodb_table(LimitedModel, "pkey") as table:
+            limited_table = Table(table._dynamodb, LimitedModel, rate_limiter=limiter)
+            limited_table.put_item(LimitedModel(pkey="a", value=1))
+            tokens = limiter._buckets[WRITE].tokens
+
+            self.assertIsNone(
+                limited_table.put_item(
+                    LimitedModel(pkey="a", value=2),
+                    condition_expression=LimitedModel.value == 5,
+                )
+            )
+
+        self.assertLessEqual(limiter._buckets[WRITE].tokens, tokens - 1)
+
+    def test_client_limiter_covers_multi_table_requests(self):
+        limiter = CapacityRateLimiter(read_capacity=1000, write_capacity=1000)
+
+        with temporary_dynamodb_table(LimitedModel, "pkey"):
+            dynamodb = DynamoDB(rate_limiter=limiter)
+            self.assertIs(dynamodb[LimitedModel].rate_limiter, limiter)
+
+            with mock.patch.object(
+                limiter, "consume", wraps=limiter.consume
+            ) as consume:
+                with dynamodb.transact_write() as transaction:
+                    transaction.put(LimitedModel(pkey="a", value=1))
+                    transaction.put(LimitedModel(pkey="b", value=2))
+                found = dynamodb.batch_get({LimitedModel: ["a", "b"]})
+
+        self.assertEqual(len(found[LimitedModel]), 2)
+        self.assertEqual(
+            [call.args[0] for call in consume.call_args_list], [WRITE, READ]
+        )
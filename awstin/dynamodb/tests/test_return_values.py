@@ -0,0 +1,138 @@
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import NOT_SET, Attr, ConditionCheckFailed, DynamoModel, Key
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Counter(DynamoModel):
+    _table_name_ = "temp"
+
+    name = Key()
+
+    value = Attr()
+
+    owner = Attr()
+
+
+class TestReturnValues(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(Counter, "name")
+
+    def requests(self, table, operation):
+        client = table._client
+        return mock.patch.object(
+            client,
+            operation,
+            wraps=getattr(client, operation),
+        )
+
+    def test_update_return_values(self):
+        with self.temp_table as table:
+            table.put_item(Counter(name="a", value=1, owner="x"))
+
+            with self.requests(table, "update_item") as update_item:
+                result = table.update_item(
+                    "a", Counter.value.set(2), return_values="NONE"
+                )
+            self.assertIs(result, True)
+            self.assertNotIn("ReturnValues", update_item.call_args.kwargs)
+
+            result = table.update_item(
+                "a", Counter.value.set(3), return_values="UPDATED_NEW"
+            )
+            self.assertEqual(result.value, 3)
+            self.assertEqual(result.owner, NOT_SET)
+
+            result = table.update_item(
+                "a", Counter.value.set(4), return_values="ALL_OLD"
+            )
+            self.assertEqual((result.value, result.owner), (3, "x"))
+
+            result = table.update_item(
+                "new", Counter.value.set(1), return_values="UPDATED_OLD"
+            )
+            self.assertIs(result, True)
+
+            result = table.update_item("a", Counter.value.set(5))
+            self.assertEqual((result.name, result.value, result.owner), ("a", 5, "x"))
+
+    def test_put_and_delete_return_values(self):
+        with self.temp_table as table:
+            self.assertIsNone(
+                table.put_item(Counter(name="a", value=1), return_values="ALL_OLD")
+            )
+            replaced = table.put_item(
+                Counter(name="a", value=2), return_values="ALL_OLD"
+            )
+            self.assertEqual(replaced.value, 1)
+
+            deleted = table.delete_item("a", return_values="ALL_OLD")
+            self.assertEqual(deleted.value, 2)
+            self.assertIs(table.delete_item("a", return_values="ALL_OLD"), True)
+
+    def test_conditional_put(self):
+        with self.temp_table as table:
+            table.put_item(Counter(name="a", value=1))
+
+            result = table.put_item(
+                Counter(name="a", value=2),
+                condition_expression=Counter.value == 5,
+            )
+            self.assertIsNone(result)
+            self.assertIsNotNone(
+                table.put_item(
+                    Counter(name="a", value=2),
+                    condition_expression=Counter.value == 1,
+                )
+            )
+            self.assertEqual(table["a"].value, 2)
+
+    def test_return_values_on_condition_check_failure(self):
+        with self.temp_table as table:
+            table.put_item(Counter(name="a", value=1, owner="x"))
+
+            self.assertIsNone(
+                table.update_item("a", Counter.value.set(2), Counter.value == 5)
+            )
+
+            with self.assertRaises(ConditionCheckFailed) as raised:
+                table.update_item(
+                    "a",
+                    Counter.value.set(2),
+                    Counter.value == 5,
+                    return_values_on_condition_check_failure="ALL_OLD",
+                )
+            self.assertIsInstance(raised.exception.item, Counter)
+            self.assertEqual(raised.exception.item.value, 1)
+
+            with self.assertRaises(ConditionCheckFailed) as raised:
+                table.delete_item(
+                    "a",
+                    Counter.owner == "y",
+                    return_values_on_condition_check_failure="NONE",
+                )
+            self.assertIsNone(raised.exception.item)
+
+            with self.assertRaises(ConditionCheckFailed) as raised:
+                table.put_item(
+                    Counter(name="a"),
+                    condition_expression=Counter.name.not_exists(),
+                    return_values_on_condition_check_failure="ALL_OLD",
+                )
+            self.assertEqual(raised.exception.item.owner, "x")
+
+            self.assertEqual(table["a"].value, 1)
+
+    def test_invalid_return_values(self):
+        with self.temp_table as table:
+            with self.assertRaises(ValueError):
+                table.put_item(Counter(name="a"), return_values="ALL_NEW")
+            with self.assertRaises(ValueError):
+                table.delete_item("a", return_values="UPDATED_OLD")
+            with self.assertRaises(ValueError):
+                table.update_item(
+                    "a",
+                    Counter.value.set(1),
+                    return_values_on_condition_check_failure="ALL_NEW",
+                )
@@ -0,0 +1,177 @@
+import copy
+import unittest
+import unittest.mock as mock
+
+import awstin.dynamodb.orm as orm
+from awstin.dynamodb import NOT_SET, Attr, DynamoModel, Key
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Movie(DynamoModel):
+    _table_name_ = "Movies"
+
+    year = Key()
+
+    title = Key()
+
+    rating = Attr()
+
+    info = Attr()
+
+    tags = Attr()
+
+
+class TestChangedAttributes(unittest.TestCase):
+    def test_new_model_all_set_attributes(self):
+        movie = Movie(year=1999, title="a", rating=5.5)
+
+        self.assertEqual(
+            movie.changed_attributes(),
+            {"year": 1999, "title": "a", "rating": movie.serialize()["rating"]},
+        )
+
+    def test_loaded_model_unchanged(self):
+        movie = Movie.deserialize({"year": 1999, "title": "a", "info": {"a": [1]}})
+
+        self.assertEqual(movie.changed_attributes(), {})
+
+    def test_reassigned_and_removed(self):
+        movie = Movie.deserialize({"year": 1999, "title": "a", "rating": 3})
+        movie.rating = NOT_SET
+        movie.tags = ["b"]
+
+        self.assertEqual(
+            movie.changed_attributes(),
+            {"rating": NOT_SET, "tags": ["b"]},
+        )
+
+    def test_nested_modification_detected(self):
+        movie = Movie.deserialize(
+            {"year": 1999, "title": "a", "info": {"actors": ["x"]}}
+        )
+        movie.info["actors"].append("y")
+
+        self.assertEqual(
+            movie.changed_attributes(),
+            {"info": {"actors": ["x", "y"]}},
+        )
+
+    def test_reassigned_equal_value_unchanged(self):
+        movie = Movie.deserialize({"year": 1999, "title": "a", "rating": 3})
+        movie.rating = 3.0
+
+        self.assertEqual(movie.changed_attributes(), {})
+
+    def test_reassigned_before_access(self):
+        movie = Movie.deserialize({"year": 1999, "title": "a", "tags": ["x"]})
+        movie.tags = ["y"]
+
+        self.assertEqual(movie.tags, ["y"])
+        self.assertEqual(movie.changed_attributes(), {"tags": ["y"]})
+
+    def test_containers_copied_on_load(self):
+        data = {"year": 1999, "title": "a", "info": {"actors": ["x"]}, "tags": ["t"]}
+
+        movie = Movie.deserialize(data)
+
+        self.assertEqual(vars(movie)["info"], {"actors": ["x"]})
+        self.assertEqual(vars(movie)["tags"], ["t"])
+        movie.info["actors"].append("y")
+        movie.tags.append("u")
+        self.assertEqual(data["info"], {"actors": ["x"]})
+        self.assertEqual(data["tags"], ["t"])
+        self.assertEqual(
+            movie.changed_attributes(),
+            {"info": {"actors": ["x", "y"]}, "tags": ["t", "u"]},
+        )
+
+
+class TestSave(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(
+            Movie,
+            "year",
+            hashkey_type="N",
+            sortkey_name="title",
+        )
+
+    def test_save_new_item_puts(self):
+        with self.temp_table as table:
+            movie = Movie(year=1999, title="a", rating=5.5)
+
+            self.assertTrue(table.save(movie))
+
+            self.assertEqual(table[1999, "a"].rating, 5.5)
+            self.assertEqual(movie.changed_attributes(), {})
+
+    def test_save_sends_only_changes(self):
+        with self.temp_table as table:
+            table.put_item(Movie(year=1999, title="a", rating=5.5, tags=["x"]))
+            movie = table[1999, "a"]
+            movie.rating = 7
+            movie.tags = NOT_SET
+
+            with mock.patch.object(
+                table._client,
+                "update_item",
+                wraps=table._client.update_item,
+            ) as update_item:
+                self.assertTrue(table.save(movie))
+
+            (call,) = update_item.call_args_list
+            kwargs = call[1]
+            self.assertEqual(kwargs["Key"], {"year": 1999, "title": "a"})
+            self.assertEqual(
+                sorted(kwargs["ExpressionAttributeNames"].values()),
+                ["rating", "tags"],
+            )
+            self.assertIn("REMOVE", kwargs["UpdateExpression"])
+            self.assertNotIn("ReturnValues", kwargs)
+
+            stored = table[1999, "a"]
+            self.assertEqual(stored.rating, 7)
+            self.assertIs(stored.tags, NOT_SET)
+            self.assertEqual(movie.changed_attributes(), {})
+
+    def test_save_unchanged_makes_no_request(self):
+        with self.temp_table as table:
+            table.put_item(Movie(year=1999, title="a", rating=5.5))
+            movie = table[1999, "a"]
+
+            with mock.patch.object(table._client, "update_item") as update_item:
+                self.assertTrue(table.save(movie))
+
+            update_item.assert_not_called()
+
+    def test_save_condition_fails(self):
+        with self.temp_table as table:
+            table.put_item(Movie(year=1999, title="a", rating=5.5))
+            movie = table[1999, "a"]
+            movie.rating = 1
+
+            self.assertFalse(table.save(movie, Movie.rating > 6))
+
+            self.assertEqual(table[1999, "a"].rating, 5.5)
+            self.assertEqual(movie.changed_attributes(), {"rating": 1})
+
+    def test_scan_doesnt_deep_copy_flat_containers(self):
+        with self.temp_table as table:
+            table.put_items(
+                Movie(year=1999, title=str(i), info={"rank": i}, tags=["a"])
+                for i in range(20)
+            )
+
+            with mock.patch.object(orm, "copy", wraps=copy) as orm_copy:
+                titles = sorted(movie.title for movie in table.scan())
+
+            self.assertEqual(len(titles), 20)
+            orm_copy.deepcopy.assert_not_called()
+
+    def test_save_changed_key_raises(self):
+        with self.temp_table as table:
+            table.put_item(Movie(year=1999, title="a", rating=5.5))
+            movie = table[1999, "a"]
+            movie.title = "b"
+
+            with self.assertRaises(ValueError):
+                table.save(movie)
@@ -0,0 +1,179 @@
+import unittest
+
+from awstin.dynamodb import Attr, DynamoModel, Key
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Event(DynamoModel):
+    _table_name_ = "temp"
+
+    device = Key(shards=4)
+
+    timestamp = Key()
+
+    value = Attr()
+
+
+class HashedEvent(DynamoModel):
+    _table_name_ = "temp"
+
+    device = Key(shards=4, shard_by="timestamp")
+
+    timestamp = Key()
+
+    value = Attr()
+
+
+class Counter(DynamoModel):
+    _table_name_ = "temp"
+
+    name = Key(shards=8)
+
+    count = Attr()
+
+
+class TestShardedKeySerialization(unittest.TestCase):
+    def test_random_shard_needs_loaded_item(self):
+        with self.assertRaises(ValueError):
+            Event(device="d1", timestamp=1).serialize()
+
+    def test_hash_shard_deterministic(self):
+        shards = {
+            HashedEvent(device="d1", timestamp=ts).serialize()["device"]
+            for ts in range(100)
+        }
+        self.assertEqual(shards, {f"d1#{i}" for i in range(4)})
+
+        self.assertEqual(
+            HashedEvent(device="d1", timestamp=5).serialize(),
+            HashedEvent(device="d1", timestamp=5).serialize(),
+        )
+
+    def test_deserialize_strips_shard(self):
+        event = Event.deserialize({"device": "d1#2", "timestamp": 1})
+
+        self.assertEqual(event.device, "d1")
+        self.assertEqual(event.serialize()["device"], "d1#2")
+        self.assertEqual(event.changed_attributes(), {})
+
+    def test_invalid_shards(self):
+        with self.assertRaises(ValueError):
+            Key(shards=0)
+        with self.assertRaises(ValueError):
+            Key(shard_by="other")
+
+
+class TestShardedTable(unittest.TestCase):
+    def test_query_merges_shards(self):
+        with temporary_dynamodb_table(
+            HashedEvent, "device", sortkey_name="timestamp", sortkey_type="N"
+        ) as table:
+            for ts in range(40):
+                table.put_item(HashedEvent(device="d1", timestamp=ts, value=ts))
+            table.put_item(HashedEvent(device="d2", timestamp=3))
+
+            response = table._client.scan(TableName=table.name)
+            stored = {item["device"] for item in response["Items"]}
+            self.assertGreater(len(stored), 1)
+
+            results = list(table.query(HashedEvent.device == "d1"))
+            self.assertEqual([item.timestamp for item in results], list(range(40)))
+            self.assertEqual({item.device for item in results}, {"d1"})
+
+            results = list(
+                table.query((HashedEvent.device == "d1") & (HashedEvent.timestamp > 30))
+            )
+            self.assertEqual([item.timestamp for item in results], list(range(31, 40)))
+
+    def test_scan_filters_on_every_shard(self):
+        with temporary_dynamodb_table(
+            HashedEvent, "device", sortkey_name="timestamp", sortkey_type="N"
+        ) as table:
+            for ts in range(20):
+                table.put_item(HashedEvent(device=f"d{ts % 3}", timestamp=ts, value=ts))
+
+            results = table.scan(HashedEvent.device == "d1")
+            self.assertEqual(
+                sorted(item.timestamp for item in results), list(range(1, 20, 3))
+            )
+
+            results = table.scan(
+                HashedEvent.device.in_(["d0", "d2"]) & (HashedEvent.value < 6),
+                segments=3,
+            )
+            self.assertEqual(sorted(item.timestamp for item in results), [0, 2, 3, 5])
+
+            with self.assertRaises(ValueError):
+                list(table.scan(HashedEvent.device > "d1"))
+            with self.assertRaises(ValueError):
+                table.find(HashedEvent.device.begins_with("d"))
+
+    def test_random_shards_only_take_adds(self):
+        with temporary_dynamodb_table(
+            Event, "device", sortkey_name="timestamp", sortkey_type="N"
+        ) as table:
+            with self.assertRaises(ValueError):
+                table.put_item(Event(device="d1", timestamp=1, value=1))
+            with self.assertRaises(ValueError):
+                table.put_items([Event(device="d1", timestamp=1, value=1)])
+            with self.assertRaises(ValueError):
+                table.update_item(("d1", 1), Event.value.set(2))
+            with self.assertRaises(ValueError):
+                table.update_item(("d1", 1), Event.value.add(1) & Event.value.remove())
+            with self.assertRaises(ValueError):
+                table.update_item(("d1", 1), Event.value.add(1), Event.value > 0)
+            self.assertEqual(list(table.scan()), [])
+
+            table.update_item(("d1", 1), Event.value.add(2))
+            with self.assertRaises(ValueError):
+                table["d1", 1]
+
+            # An item read from the table is written back to its own shard
+            (event,) = table.query(Event.device == "d1")
+            event.value = 5
+            table.put_item(event)
+            self.assertEqual(
+                [(item.device, item.value) for item in table.scan()], [("d1", 5)]
+            )
+
+    def test_delete_every_shard(self):
+        with temporary_dynamodb_table(Counter, "name") as table:
+            for _ in range(20):
+                table.update_item("views", Counter.count.add(1))
+
+            with self.assertRaises(ValueError):
+                table.delete_item("views", Counter.count > 100)
+            with self.assertRaises(ValueError):
+                table.delete_item("views", return_values="ALL_OLD")
+            self.assertEqual(table.counter_value("views", Counter.count), 20)
+
+            self.assertIs(table.delete_item("views"), True)
+            self.assertEqual(list(table.scan()), [])
+
+    def test_get_and_delete(self):
+        with temporary_dynamodb_table(
+            HashedEvent, "device", sortkey_name="timestamp", sortkey_type="N"
+        ) as table:
+            table.put_item(HashedEvent(device="d1", timestamp=7, value="x"))
+
+            self.assertEqual(table["d1", 7].value, "x")
+            with self.assertRaises(KeyError):
+                table["d1", 8]
+
+            # The shard is known, so the condition is checked on the one item
+            self.assertFalse(table.delete_item(("d1", 7), HashedEvent.value == "y"))
+            self.assertTrue(table.delete_item(("d1", 7), HashedEvent.value == "x"))
+            self.assertEqual(list(table.scan()), [])
+
+    def test_counter_sums_shards(self):
+        with temporary_dynamodb_table(Counter, "name") as table:
+            for _ in range(20):
+                table.update_item("views", Counter.count.add(1))
+
+            with table.counters(flush_interval=None) as counters:
+                for _ in range(5):
+                    counters.add("views", Counter.count, 2)
+
+            self.assertGreater(len(list(table.scan())), 1)
+            self.assertEqual(table.counter_value("views", Counter.count), 30)
+            self.assertEqual(table.counter_value("other", Counter.count), 0)
@@ -0,0 +1,124 @@
+import logging
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import Attr, DynamoModel, Key, SlowOperationLogger, Table
+from awstin.dynamodb.slowlog import OperationRecord, render_expression
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class SlowModel(DynamoModel):
+    _table_name_ = "slow"
+
+    pkey = Key()
+
+    value = Attr()
+
+
+class TestSlowOperationLogger(unittest.TestCase):
+    def test_render_expression(self):
+        condition = (SlowModel.value > 5) & SlowModel.pkey.begins_with("abc")
+
+        self.assertEqual(
+            render_expression(condition),
+            "(value > 5 AND begins_with(pkey, 'abc'))",
+        )
+        self.assertEqual(render_expression("SET #a = :b"), "SET #a = :b")
+
+    def clock(self, *times):
+        clock = mock.patch("awstin.dynamodb.slowlog.time")
+        clock.start().monotonic.side_effect = times
+        self.addCleanup(clock.stop)
+
+    def test_operation_record(self):
+        self.clock(10.0, 10.5)
+        record = OperationRecord("tab", "scan")
+        record.add_response(
+            {"Count": 1, "ScannedCount": 50, "ConsumedCapacity": {"CapacityUnits": 2}},
+            0.5,
+        )
+        record.add_response(
+            {"Count": 0, "ScannedCount": 50, "ConsumedCapacity": {"CapacityUnits": 3}},
+            0.25,
+        )
+
+        self.assertEqual(record.pages, 2)
+        self.assertEqual(record.items, 1)
+        self.assertEqual(record.scanned_count, 100)
+        self.assertEqual(record.capacity_units, 5)
+        self.assertEqual(record.request_time, 0.75)
+        record.finish()
+        self.assertEqual(record.elapsed, 0.5)
+        self.assertEqual(record.scan_ratio, 100)
+
+    def test_reasons(self):
+        slow_log = SlowOperationLogger(latency_threshold=1.0, scan_ratio_threshold=10)
+
+        self.clock(0.0, 0.01, 0.0, 2.0, 0.0, 0.8, 0.0, 0.01, 0.0, 0.01)
+
+        fast = OperationRecord("tab", "get_item")
+        fast.add_response({"Item": {}}, 0.01)
+        fast.finish()
+        self.assertEqual(slow_log.reasons(fast), [])
+
+        slow = OperationRecord("tab", "get_item")
+        slow.add_response({"Item": {}}, 2.0)
+        slow.finish()
+        self.assertEqual(slow_log.reasons(slow), ["latency"])
+
+        # Concurrent requests add up to more than the call took
+        concurrent = OperationRecord("tab", "scan")
+        concurrent.add_response({"Count": 1, "ScannedCount": 1}, 0.7)
+        concurrent.add_response({"Count": 1, "ScannedCount": 1}, 0.7)
+        concurrent.finish()
+        self.assertEqual(slow_log.reasons(concurrent), [])
+
+        costly = OperationRecord("tab", "scan")
+        costly.add_response({"Count": 2, "ScannedCount": 500}, 0.01)
+        costly.finish()
+        self.assertEqual(slow_log.reasons(costly), ["scan_ratio"])
+
+        small = OperationRecord("tab", "scan")
+        small.add_response({"Count": 0, "ScannedCount": 50}, 0.01)
+        small.finish()
+        self.assertEqual(slow_log.reasons(small), [])
+
+    def test_table_logs_costly_scan(self):
+        slow_log = SlowOperationLogger(
+            latency_threshold=None,
+            scan_ratio_threshold=10,
+            min_scanned_count=100,
+        )
+
+        with temporary_dynamodb_table(SlowModel, "pkey") as table:
+            logged = Table(table._dynamodb, SlowModel, slow_log=slow_log)
+            for i in range(120):
+                table.put_item(SlowModel(pkey=str(i), value=i))
+
+            with self.assertLogs("awstin.dynamodb.slow", logging.WARNING) as logs:
+                items = list(logged.scan(SlowModel.value >= 115))
+
+            self.assertEqual(len(items), 5)
+
+        (log_record,) = logs.records
+        details = log_record.awstin_slow_operation
+        self.assertEqual(details["operation"], "scan")
+        self.assertEqual(details["table"], "slow")
+        self.assertEqual(details["reasons"], ["scan_ratio"])
+        self.assertEqual(details["items"], 5)
+        self.assertEqual(details["scanned_count"], 120)
+        self.assertEqual(details["expressions"], {"FilterExpression": "value >= 115"})
+        self.assertIsNotNone(details["capacity_units"])
+
+    def test_table_logs_slow_calls(self):
+        slow_log = SlowOperationLogger(latency_threshold=0.0)
+
+        with temporary_dynamodb_table(SlowModel, "pkey") as table:
+            logged = Table(table._dynamodb, SlowModel, slow_log=slow_log)
+
+            with self.assertLogs("awstin.dynamodb.slow", logging.WARNING) as logs:
+                logged.put_item(SlowModel(pkey="a", value=1))
+                logged.update_item("a", SlowModel.value.set(2))
+
+        operations = [r.awstin_slow_operation["operation"] for r in logs.records]
+        self.assertEqual(operations, ["put_item", "update_item"])
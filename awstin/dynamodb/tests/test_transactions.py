@@ -0,0 +1,213 @@
+import unittest
+import unittest.mock as mock
+
+from awstin.dynamodb import (
+    Attr,
+    DynamoDB,
+    DynamoModel,
+    Key,
+    TransactionCanceled,
+    compile_condition,
+    param,
+)
+from awstin.dynamodb.testing import temporary_dynamodb_table
+
+
+class Account(DynamoModel):
+    _table_name_ = "accounts"
+
+    owner = Key()
+
+    balance = Attr()
+
+
+class Transfer(DynamoModel):
+    _table_name_ = "transfers"
+
+    source = Key()
+
+    transfer_id = Key()
+
+    amount = Attr()
+
+
+class AccountsByBalance(DynamoModel):
+    _table_name_ = "accounts"
+    _index_name_ = "ByBalance"
+
+    balance = Key()
+
+
+class TestTransactions(unittest.TestCase):
+    def setUp(self):
+        self.accounts_table = temporary_dynamodb_table(Account, "owner")
+        self.transfers_table = temporary_dynamodb_table(
+            Transfer,
+            "source",
+            sortkey_name="transfer_id",
+            sortkey_type="N",
+        )
+
+    def transfer(self, dynamodb, transfer_id, amount, client_token=None):
+        with dynamodb.transact_write(client_token=client_token) as transaction:
+            transaction.update(
+                Account,
+                "alice",
+                Account.balance.set(Account.balance - amount),
+                Account.balance >= amount,
+            ).update(Account, "bob", Account.balance.set(Account.balance + amount)).put(
+                Transfer(source="alice", transfer_id=transfer_id, amount=amount),
+                Transfer.transfer_id.not_exists(),
+            )
+
+    def test_transact_write(self):
+        with self.accounts_table as accounts, self.transfers_table as transfers:
+            accounts.put_item(Account(owner="alice", balance=100))
+            accounts.put_item(Account(owner="bob", balance=0))
+            accounts.put_item(Account(owner="carol", balance=0))
+            dynamodb = DynamoDB()
+
+            self.transfer(dynamodb, 1, 30)
+            with dynamodb.transact_write() as transaction:
+                transaction.delete(Account, "carol", Account.balance == 0)
+                transaction.condition_check(
+                    Transfer, ("alice", 1), Transfer.amount == 30
+                )
+
+            self.assertEqual(accounts["alice"].balance, 70)
+            self.assertEqual(accounts["bob"].balance, 30)
+            self.assertEqual(transfers["alice", 1].amount, 30)
+            with self.assertRaises(KeyError):
+                accounts["carol"]
+
+    def test_cancellation_reasons(self):
+        with self.accounts_table as accounts, self.transfers_table as transfers:
+            accounts.put_item(Account(owner="alice", balance=10))
+            accounts.put_item(Account(owner="bob", balance=0))
+            dynamodb = DynamoDB()
+
+            with self.assertRaises(TransactionCanceled) as raised:
+                self.transfer(dynamodb, 1, 30)
+
+            reasons = raised.exception.reasons
+            self.assertEqual(
+                [reason.code for reason in reasons],
+                ["ConditionalCheckFailed", "None", "None"],
+            )
+            self.assertIsInstance(reasons[0].item, Account)
+            self.assertEqual(reasons[0].item.balance, 10)
+            self.assertIsNone(reasons[1].item)
+
+            self.assertEqual(accounts["alice"].balance, 10)
+            self.assertEqual(accounts["bob"].balance, 0)
+            self.assertEqual(list(transfers.scan()), [])
+
+    def test_client_token(self):
+        with self.accounts_table as accounts, self.transfers_table:
+            accounts.put_item(Account(owner="alice", balance=100))
+            accounts.put_item(Account(owner="bob", balance=0))
+            dynamodb = DynamoDB()
+            client = dynamodb.resource.meta.client
+
+            with mock.patch.object(
+                client,
+                "transact_write_items",
+                wraps=client.transact_write_items,
+            ) as transact_write_items:
+                self.transfer(dynamodb, 1, 30, client_token="transfer-1")
+
+            self.assertEqual(
+                transact_write_items.call_args.kwargs["ClientRequestToken"],
+                "transfer-1",
+            )
+
+            transaction = dynamodb.transact_write()
+            self.assertNotEqual(transaction.client_token, "transfer-1")
+            self.assertEqual(len(transaction), 0)
+
+    def test_compiled_condition(self):
+        with self.accounts_table as accounts, self.transfers_table:
+            accounts.put_item(Account(owner="alice", balance=100))
+            dynamodb = DynamoDB()
+            at_least = compile_condition(Account.balance >= param("amount"))
+
+            transaction = dynamodb.transact_write()
+            transaction.update(
+                Account,
+                "alice",
+                Account.balance.set(Account.balance - 60),
+                at_least.bind(amount=60),
+            )
+            transaction.commit()
+
+            with self.assertRaises(TransactionCanceled):
+                dynamodb.transact_write().update(
+                    Account,
+                    "alice",
+                    Account.balance.set(Account.balance - 60),
+                    at_least.bind(amount=60),
+                ).commit()
+
+            self.assertEqual(accounts["alice"].balance, 40)
+
+    def test_transact_get(self):
+        with self.accounts_table as accounts, self.transfers_table as transfers:
+            accounts.put_item(Account(owner="alice", balance=100))
+            transfers.put_item(Transfer(source="alice", transfer_id=1, amount=5))
+
+            alice, transfer, missing = DynamoDB().transact_get(
+                [
+                    (Account, "alice"),
+                    (Transfer, {"source": "alice", "transfer_id": 1}),
+                    (Account, "nobody"),
+                ]
+            )
+
+            self.assertEqual(alice.balance, 100)
+            self.assertEqual(transfer.amount, 5)
+            self.assertIsNone(missing)
+
+    def test_tables_described_once(self):
+        with self.accounts_table as accounts, self.transfers_table:
+            for owner in ["alice", "bob", "carol"]:
+                accounts.put_item(Account(owner=owner, balance=10))
+            dynamodb = DynamoDB()
+
+            with mock.patch.object(
+                dynamodb.client,
+                "describe_table",
+                wraps=dynamodb.client.describe_table,
+            ) as describe_table:
+                with dynamodb.transact_write() as transaction:
+                    transaction.update(
+                        Account, "alice", Account.balance.set(Account.balance - 1)
+                    )
+                    transaction.update(
+                        Account, "bob", Account.balance.set(Account.balance + 1)
+                    )
+                    transaction.delete(Transfer, ("alice", 1))
+                    transaction.condition_check(Account, "carol", Account.balance == 10)
+                dynamodb.transact_get(
+                    [(Account, "alice"), (Account, "bob"), (Account, "carol")]
+                )
+
+            self.assertEqual(
+                [call.kwargs["TableName"] for call in describe_table.call_args_list],
+                ["accounts", "transfers", "accounts"],
+            )
+
+    def test_limits(self):
+        dynamodb = DynamoDB()
+
+        with self.assertRaises(ValueError):
+            dynamodb.transact_get([(Account, f"a{i}") for i in range(101)])
+        with self.assertRaises(ValueError):
+            dynamodb.transact_get([(AccountsByBalance, 5)])
+
+        transaction = dynamodb.transact_write()
+        for i in range(100):
+            transaction.put(Account(owner=f"a{i}", balance=i))
+        with self.assertRaises(ValueError):
+            transaction.put(Account(owner="a100", balance=100))
+
+        self.assertEqual(dynamodb.transact_get([]), [])
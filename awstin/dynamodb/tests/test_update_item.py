@@ -1,6 +1,17 @@
 import unittest
-
-from awstin.dynamodb.orm import Attr, DynamoModel, Key, list_append
+from decimal import Decimal
+
+from awstin.dynamodb.orm import (
+    MAX_EXPRESSION_LENGTH,
+    Attr,
+    DynamoModel,
+    Key,
+    _nested_attribute,
+    combine_operators,
+    list_append,
+    param,
+    parse_attribute_path,
+)
 from awstin.dynamodb.testing import temporary_dynamodb_table
 
 
@@ -722,3 +733,216 @@ class TestUpdateItem(unittest.TestCase):
             )
 
             self.assertEqual(result, expected)
+
+
+class TestPreparedUpdate(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(MyModel, "pkey")
+
+    def test_prepare_compiles_once(self):
+        prepared = (
+            MyModel.an_attr.add(param("delta")) & MyModel.another_attr.set("const")
+        ).prepare()
+
+        self.assertEqual(prepared.parameters, {"delta"})
+
+        first = prepared.bind(delta=1).serialize()
+        second = prepared.bind(delta=2.5).serialize()
+
+        # Expression text and name placeholders are reused
+        self.assertEqual(first["UpdateExpression"], second["UpdateExpression"])
+        self.assertEqual(
+            first["ExpressionAttributeNames"], second["ExpressionAttributeNames"]
+        )
+        self.assertCountEqual(first["ExpressionAttributeValues"].values(), [1, "const"])
+        self.assertCountEqual(
+            second["ExpressionAttributeValues"].values(), [Decimal("2.5"), "const"]
+        )
+
+    def test_bind_missing_parameter(self):
+        prepared = MyModel.an_attr.add(param("delta")).prepare()
+
+        with self.assertRaises(ValueError):
+            prepared.bind()
+
+    def test_bind_unknown_parameter(self):
+        prepared = MyModel.an_attr.add(param("delta")).prepare()
+
+        with self.assertRaises(ValueError):
+            prepared.bind(delta=1, other=2)
+
+    def test_unprepared_parameter(self):
+        with self.assertRaises(ValueError):
+            MyModel.an_attr.add(param("delta")).serialize()
+
+    def test_bound_names_not_shared(self):
+        prepared = MyModel.an_attr.set(param("value")).prepare()
+
+        names = prepared.bind(value=1).serialize()["ExpressionAttributeNames"]
+        names["#extra"] = "extra"
+
+        self.assertNotIn("#extra", prepared.attribute_names)
+
+    def test_update_with_prepared_expression(self):
+        increment = MyModel.an_attr.add(param("delta")).prepare()
+        set_pair = (
+            MyModel.another_attr.set(param("value"))
+            & MyModel.third_attr.set(list_append(MyModel.third_attr, param("extra")))
+        ).prepare()
+
+        with self.temp_table as table:
+            table.put_item(MyModel(pkey="aaa", an_attr=1, third_attr=[1]))
+
+            table.update_item("aaa", increment.bind(delta=5))
+            table.update_item("aaa", increment.bind(delta=2.5))
+            result = table.update_item(
+                "aaa",
+                set_pair.bind(value="v", extra=[2, 3]),
+                condition_expression=MyModel.an_attr > 8,
+            )
+
+        expected = MyModel(
+            pkey="aaa",
+            an_attr=8.5,
+            another_attr="v",
+            third_attr=[1, 2, 3],
+        )
+        self.assertEqual(result, expected)
+
+    def test_prepared_without_parameters(self):
+        prepared = MyModel.an_attr.set(100).prepare()
+
+        with self.temp_table as table:
+            table.put_item(MyModel(pkey="aaa", an_attr=1))
+            result = table.update_item("aaa", prepared)
+
+        self.assertEqual(result, MyModel(pkey="aaa", an_attr=100))
+
+
+class TestUpdateCompilation(unittest.TestCase):
+    def setUp(self):
+        self.temp_table = temporary_dynamodb_table(MyModel, "pkey")
+
+    def test_long_chain_flattened(self):
+        # Deep chains of & compile without recursion
+        update_expression = MyModel.an_attr.set(0)
+        for i in range(1, 5000):
+            update_expression = update_expression & MyModel.an_attr.set(i)
+
+        serialized = update_expression.serialize()
+
+        self.assertEqual(len(update_expression.operators()), 5000)
+        self.assertEqual(len(serialized["ExpressionAttributeValues"]), 5000)
+
+    def test_names_deduplicated(self):
+        update_expression = (
+            MyModel.an_attr.set(MyModel.an_attr + 1)
+            & MyModel.another_attr.an_attr.set(MyModel.an_attr)
+            & MyModel.set_attr.remove()
+        )
+
+        serialized = update_expression.serialize()
+
+        self.assertCountEqual(
+            serialized["ExpressionAttributeNames"].values(),
+            ["an_attr", "another_attr", "set_attr"],
+        )
+        self.assertEqual(
+            serialized["UpdateExpression"],
+            "SET #u0 = #u0 + :u0, #u1.#u0 = #u0 REMOVE #u2",
+        )
+
+    def test_split(self):
+        update_expression = MyModel.an_attr.set(1)
+        for i in range(199):
+            update_expression = update_expression & MyModel.another_attr[i].set(i)
+
+        parts = update_expression.split(max_length=200)
+
+        self.assertGreater(len(parts), 1)
+        for part in parts:
+            self.assertLessEqual(len(part.serialize()["UpdateExpression"]), 200)
+        self.assertEqual(sum(len(part.operators()) for part in parts), 200)
+
+    def test_split_counts_placeholder_length(self):
+        # Placeholders of later actions in a part run into the hundreds
+        update_expression = combine_operators(
+            [getattr(MyModel.an_attr, f"k{i}").set(i) for i in range(2000)]
+        )
+
+        parts = update_expression.split()
+
+        self.assertGreater(len(parts), 1)
+        for part in parts:
+            self.assertLessEqual(
+                len(part.serialize()["UpdateExpression"]), MAX_EXPRESSION_LENGTH
+            )
+        self.assertEqual(sum(len(part.operators()) for part in parts), 2000)
+
+    def test_update_split_oversized(self):
+        # Deeply nested paths give long clauses without too many of them
+        nested = MyModel.an_attr.a.b.c.d.e.f.g
+        update_expression = MyModel.another_attr.set(1)
+        for i in range(150):
+            update_expression = update_expression & getattr(nested, f"k{i}").set(i)
+
+        self.assertGreater(len(update_expression.serialize()["UpdateExpression"]), 4096)
+
+        with self.temp_table as table:
+            table.put_item(
+                MyModel(
+                    pkey="aaa",
+                    an_attr={"a": {"b": {"c": {"d": {"e": {"f": {"g": {}}}}}}}},
+                )
+            )
+            result = table.update_item("aaa", update_expression, split_oversized=True)
+
+        values = {f"k{i}": i for i in range(150)}
+        expected = MyModel(
+            pkey="aaa",
+            an_attr={"a": {"b": {"c": {"d": {"e": {"f": {"g": values}}}}}}},
+            another_attr=1,
+        )
+        self.assertEqual(result, expected)
+
+
+class TestAttributePaths(unittest.TestCase):
+    def test_parse_attribute_path(self):
+        self.assertEqual(parse_attribute_path("an_attr"), ("an_attr",))
+        self.assertEqual(
+            parse_attribute_path("an_attr.info.ratings[3][0].name"),
+            ("an_attr", "info", "ratings", 3, 0, "name"),
+        )
+
+    def test_nested_path_segments(self):
+        self.assertEqual(
+            MyModel.an_attr.info.ratings[3]._path,
+            ("an_attr", "info", "ratings", 3),
+        )
+        self.assertEqual(
+            MyModel.an_attr.info.ratings[3]._awstin_name,
+            "an_attr.info.ratings[3]",
+        )
+
+    def test_nested_attributes_reused(self):
+        first = MyModel.an_attr.info.ratings[3]
+        second = MyModel.an_attr.info.ratings[3]
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, MyModel.an_attr.info.ratings[4])
+        self.assertIsInstance(first, Attr)
+
+    def test_nested_attribute_cache_bounded(self):
+        for i in range(5000):
+            MyModel.an_attr[f"user{i}"]
+
+        self.assertLessEqual(_nested_attribute.cache_info().currsize, 1024)
+        self.assertEqual(MyModel.an_attr["user0"]._path, ("an_attr", "user0"))
+
+    def test_renamed_attribute_path(self):
+        class Renamed(DynamoModel):
+            _table_name_ = "renamed"
+
+            attr = Attr("dynamo.name")
+
+        self.assertEqual(Renamed.attr.nested[1]._path, ("dynamo", "name", "nested", 1))
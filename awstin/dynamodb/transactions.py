@@ -0,0 +1,321 @@
+import uuid
+
+from boto3.dynamodb.conditions import ConditionBase
+from botocore.exceptions import ClientError
+
+from awstin.dynamodb.conditions import add_expressions, compile_condition
+from awstin.dynamodb.errors import (
+    CancellationReason,
+    TransactionCanceled,
+    deserialize_error_item,
+)
+from awstin.dynamodb.ratelimit import READ, WRITE
+
+# Most items a single transaction can read or write
+MAX_TRANSACTION_ITEMS = 100
+
+
+def _add_condition(entry, condition_expression):
+    """
+    Add a condition expression to a transaction action. Conditions are
+    compiled, as the low-level client doesn't build expressions from boto3
+    conditions.
+    """
+    if isinstance(condition_expression, ConditionBase):
+        condition_expression = compile_condition(condition_expression)
+    add_expressions(entry, ConditionExpression=condition_expression)
+    entry["ReturnValuesOnConditionCheckFailure"] = "ALL_OLD"
+
+
+def _stored_key(table, key):
+    """
+    The single stored primary key of an item in a table
+
+    Raises
+    ------
+    ValueError
+        If the data model represents an index, or the item may be stored in
+        any shard of a write-sharded key
+    """
+    if hasattr(table.data_model, "_index_name_"):
+        raise ValueError("Items can't be written or read through an index")
+    stored_keys = table._read_keys(table._get_primary_key(key))
+    if len(stored_keys) != 1:
+        raise ValueError(
+            f"The shard of {key!r} must be known to use it in a transaction"
+        )
+    return stored_keys[0]
+
+
+def _reasons(error, models):
+    """
+    Cancellation reasons of a TransactionCanceledException, with the items
+    returned on condition check failures deserialized into their data models
+    """
+    reasons = []
+    for reason, model in zip(error.response.get("CancellationReasons", []), models):
+        item = deserialize_error_item(model, reason.get("Item"))
+        reasons.append(CancellationReason(reason["Code"], reason.get("Message"), item))
+    return reasons
+
+
+class TransactWrite:
+    """
+    Builder of an atomic write to items of several data models, made with a
+    single TransactWriteItems request.
+
+    Actions are collected with ``put``, ``update``, ``delete`` and
+    ``condition_check`` and written together on ``commit()``, or on leaving a
+    ``with`` block without an error. Either all of them succeed or none do.
+
+    .. code-block:: python
+
+        with dynamodb.transact_write() as transaction:
+            transaction.update(
+                Account,
+                "alice",
+                Account.balance.set(Account.balance - 10),
+                Account.balance >= 10,
+            )
+            transaction.update(
+                Account, "bob", Account.balance.set(Account.balance + 10)
+            )
+            transaction.put(Transfer(id="t-1", amount=10))
+
+    Every transaction has a client token, so committing it again, e.g. after
+    a timeout, within 10 minutes of the first commit doesn't repeat the
+    writes.
+    """
+
+    def __init__(self, dynamodb, client_token=None):
+        """
+        Parameters
+        ----------
+        dynamodb : DynamoDB
+            DynamoDB client
+        client_token : str, optional
+            Idempotency token of the transaction. By default, a random token.
+        """
+        self.dynamodb = dynamodb
+        self.client_token = (
+            client_token if client_token is not None else str(uuid.uuid4())
+        )
+
+        self._actions = []
+        self._models = []
+        self._committed = False
+        # Table of each data model, so each table is described once
+        self._tables = {}
+
+    def __len__(self):
+        """
+        Number of actions in the transaction
+        """
+        return len(self._actions)
+
+    def _table(self, model):
+        table = self._tables.get(model)
+        if table is None:
+            table = self._tables[model] = self.dynamodb[model]
+        return table
+
+    def _add(self, model, action, entry, condition_expression):
+        if self._committed:
+            raise ValueError("Transaction already committed")
+        if len(self._actions) == MAX_TRANSACTION_ITEMS:
+            raise ValueError(
+                f"A transaction can't have more than {MAX_TRANSACTION_ITEMS} actions"
+            )
+        if condition_expression is not None:
+            _add_condition(entry, condition_expression)
+        self._actions.append({action: entry})
+        self._models.append(model)
+        return self
+
+    def put(self, item, condition_expression=None):
+        """
+        Put an item in its table
+
+        Parameters
+        ----------
+        item : DynamoModel
+            The item to put
+        condition_expression : Query or CompiledCondition, optional
+            Condition on the item being replaced
+
+        Returns
+        -------
+        TransactWrite
+            This transaction
+        """
+        model = type(item)
+        if hasattr(model, "_index_name_"):
+            raise ValueError("Items can't be written through an index")
+        entry = dict(TableName=model._table_name_, Item=item.serialize())
+        return self._add(model, "Put", entry, condition_expression)
+
+    def update(self, model, key, update_expression, condition_expression=None):
+        """
+        Update an item given an awstin update expression, as with
+        ``Table.update_item``
+
+        Parameters
+        ----------
+        model : DynamoModel
+            Data model of the item's table
+        key : Any
+            Primary key, specified as a hash key value, composite key tuple, or
+            a dict
+        update_expression : awstin.dynamodb.orm.UpdateOperator
+            Update expression
+        condition_expression : Query or CompiledCondition, optional
+            Condition on the item being updated
+
+        Returns
+        -------
+        TransactWrite
+            This transaction
+        """
+        if hasattr(model, "_index_name_"):
+            raise ValueError("Items can't be written through an index")
+        table = self._table(model)
+        serialized_update = update_expression.serialize()
+        entry = dict(
+            TableName=table.name,
+            Key=table._write_key(
+                table._get_primary_key(key),
+                serialized_update if condition_expression is None else None,
+            ),
+            **serialized_update,
+        )
+        return self._add(model, "Update", entry, condition_expression)
+
+    def delete(self, model, key, condition_expression=None):
+        """
+        Delete an item
+
+        Parameters
+        ----------
+        model : DynamoModel
+            Data model of the item's table
+        key : Any
+            Primary key, specified as a hash key value, composite key tuple, or
+            a dict
+        condition_expression : Query or CompiledCondition, optional
+            Condition on the item being deleted
+
+        Returns
+        -------
+        TransactWrite
+            This transaction
+        """
+        table = self._table(model)
+        entry = dict(TableName=table.name, Key=_stored_key(table, key))
+        return self._add(model, "Delete", entry, condition_expression)
+
+    def condition_check(self, model, key, condition_expression):
+        """
+        Require a condition on an item that isn't written
+
+        Parameters
+        ----------
+        model : DynamoModel
+            Data model of the item's table
+        key : Any
+            Primary key, specified as a hash key value, composite key tuple, or
+            a dict
+        condition_expression : Query or CompiledCondition
+            Condition the item must satisfy for the transaction to succeed
+
+        Returns
+        -------
+        TransactWrite
+            This transaction
+        """
+        table = self._table(model)
+        entry = dict(TableName=table.name, Key=_stored_key(table, key))
+        return self._add(model, "ConditionCheck", entry, condition_expression)
+
+    def commit(self):
+        """
+        Write all the actions atomically. Does nothing if there are none.
+
+        Raises
+        ------
+        TransactionCanceled
+            If the transaction was canceled, e.g. because a condition wasn't
+            satisfied. Its ``reasons`` tell which action failed and why.
+        """
+        if not self._actions:
+            self._committed = True
+            return
+
+        try:
+            self.dynamodb._client_request(
+                "transact_write_items",
+                WRITE,
+                [model._table_name_ for model in self._models],
+                TransactItems=self._actions,
+                ClientRequestToken=self.client_token,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "TransactionCanceledException":
+                raise TransactionCanceled(e, _reasons(e, self._models)) from e
+            raise
+        self._committed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+
+
+def transact_get(dynamodb, keys):
+    """
+    Get items of several data models atomically with a TransactGetItems
+    request. See ``DynamoDB.transact_get``.
+    """
+    keys = list(keys)
+    if len(keys) > MAX_TRANSACTION_ITEMS:
+        raise ValueError(
+            f"A transaction can't read more than {MAX_TRANSACTION_ITEMS} items"
+        )
+    if not keys:
+        return []
+
+    gets = []
+    tables = {}
+    for model, key in keys:
+        table = tables.get(model)
+        if table is None:
+            table = tables[model] = dynamodb[model]
+        gets.append(
+            {
+                "Get": dict(
+                    TableName=table.name,
+                    Key=_stored_key(table, key),
+                    **model._dynamo_projection(),
+                )
+            }
+        )
+
+    try:
+        response = dynamodb._client_request(
+            "transact_get_items",
+            READ,
+            [model._table_name_ for model, _ in keys],
+            TransactItems=gets,
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "TransactionCanceledException":
+            raise TransactionCanceled(
+                e, _reasons(e, [model for model, _ in keys])
+            ) from e
+        raise
+
+    return [
+        model.deserialize(result["Item"]) if "Item" in result else None
+        for (model, _), result in zip(keys, response["Responses"])
+    ]
@@ -3,8 +3,9 @@ import os
 
 import boto3
 
-from awstin.config import aws_config
+from awstin.config import DEFAULT_CONCURRENCY, aws_config
 from awstin.constants import TEST_SNS_ENDPOINT
+from awstin.tracing import trace
 
 
 class SNSTopic:
@@ -12,14 +13,46 @@ class SNSTopic:
     A client for typical use of an SNS topic
     """
 
-    def __init__(self, topic_name):
+    def __init__(
+        self,
+        topic_name,
+        timeout=5.0,
+        max_retries=3,
+        max_pool_connections=DEFAULT_CONCURRENCY,
+        tcp_keepalive=False,
+        read_timeout=60.0,
+        retry_mode=None,
+    ):
         """
         Parameters
         ----------
         topic_name : str
             Name of the topic
+        timeout : float, optional
+            Timeout for establishing a connection to SNS (default 5.0)
+        max_retries : int, optional
+            Max retries for establishing a connection to SNS (default 3)
+        max_pool_connections : int, optional
+            Size of the connection pool (default ``DEFAULT_CONCURRENCY``)
+        tcp_keepalive : bool, optional
+            Whether to enable TCP keepalive (default False)
+        read_timeout : float, optional
+            Timeout for reading from a connection (default 60.0)
+        retry_mode : str, optional
+            botocore retry mode: "legacy", "standard" or "adaptive". By default,
+            botocore's configured mode is used: "legacy", unless set by the
+            AWS_RETRY_MODE environment variable or the AWS config file.
         """
-        config = aws_config(endpoint=os.environ.get(TEST_SNS_ENDPOINT))
+        config = aws_config(
+            timeout=timeout,
+            max_retries=max_retries,
+            endpoint=os.environ.get(TEST_SNS_ENDPOINT),
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=tcp_keepalive,
+            read_timeout=read_timeout,
+            retry_mode=retry_mode,
+        )
+        self.topic_name = topic_name
         self.sns = boto3.resource("sns", **config)
         self.topic = self.sns.create_topic(Name=topic_name)
 
@@ -64,7 +97,14 @@ class SNSTopic:
                     "BinaryValue": bytes(val),
                 }
 
-        return self.topic.publish(
-            Message=message,
-            MessageAttributes=message_attributes,
-        )["MessageId"]
+        with trace(
+            "sns.publish",
+            **{"messaging.system": "sns", "messaging.destination": self.topic_name},
+        ) as span:
+            message_id = self.topic.publish(
+                Message=message,
+                MessageAttributes=message_attributes,
+            )["MessageId"]
+            span.set_attribute("messaging.message_id", message_id)
+
+        return message_id
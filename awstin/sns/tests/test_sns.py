@@ -7,6 +7,7 @@ import boto3
 from awstin.config import aws_config
 from awstin.constants import TEST_SNS_ENDPOINT
 from awstin.sns import SNSTopic
+from awstin.tracing import Tracer, set_tracer
 
 
 class TestSNSTopic(unittest.TestCase):
@@ -82,3 +83,29 @@ class TestSNSTopic(unittest.TestCase):
                 },
             },
         )
+
+    def test_connection_config(self):
+        topic = SNSTopic("configured_topic", max_pool_connections=4)
+
+        config = topic.sns.meta.client.meta.config
+        self.assertEqual(config.max_pool_connections, 4)
+        self.assertEqual(config.retries["mode"], "legacy")
+
+    def test_publish_traced(self):
+        topic = SNSTopic("traced_topic")
+
+        mock_sns = mock.Mock()
+        mock_sns.publish = mock.Mock(return_value={"MessageId": "msg_id"})
+        tracer = mock.Mock(wraps=Tracer())
+        set_tracer(tracer)
+        self.addCleanup(set_tracer, None)
+
+        with mock.patch.object(topic, "topic", mock_sns):
+            topic.publish("a cool message")
+
+        tracer.start_span.assert_called_once_with(
+            "sns.publish",
+            {"messaging.system": "sns", "messaging.destination": "traced_topic"},
+        )
+        _, kwargs = tracer.finish_span.call_args
+        self.assertEqual(kwargs["attributes"], {"messaging.message_id": "msg_id"})
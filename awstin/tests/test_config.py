@@ -1,6 +1,7 @@
 import unittest
 from unittest import mock
 
+from awstin.config import DEFAULT_MAX_POOL_CONNECTIONS
 from awstin.config import __name__ as CONFIG_NAME
 from awstin.config import aws_config
 from awstin.constants import AWS_REGION
@@ -43,5 +44,42 @@ class TestConfig(unittest.TestCase):
             aws_config(timeout=11, max_retries=55, endpoint="123.456")
 
         mock_config.assert_called_once_with(
-            connect_timeout=11, retries={"max_attempts": 55}
+            connect_timeout=11,
+            read_timeout=60.0,
+            max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=False,
+            # The retry mode is left to botocore's configuration
+            retries={"max_attempts": 55},
         )
+
+    def test_aws_config_connection_kwargs(self):
+        with mock.patch(CONFIG_NAME + ".Config") as mock_config:
+            aws_config(
+                endpoint="123.456",
+                max_pool_connections=64,
+                tcp_keepalive=True,
+                read_timeout=2.5,
+                retry_mode="adaptive",
+            )
+
+        mock_config.assert_called_once_with(
+            connect_timeout=5.0,
+            read_timeout=2.5,
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            retries={"max_attempts": 3, "mode": "adaptive"},
+        )
+
+    def test_aws_config_bad_retry_mode(self):
+        with self.assertRaises(ValueError):
+            aws_config(endpoint="123.456", retry_mode="aggressive")
+
+    def test_aws_config_builds_botocore_config(self):
+        config = aws_config(
+            endpoint="123.456",
+            max_pool_connections=32,
+            retry_mode="adaptive",
+        )["config"]
+
+        self.assertEqual(config.max_pool_connections, 32)
+        self.assertEqual(config.retries, {"max_attempts": 3, "mode": "adaptive"})
@@ -0,0 +1,111 @@
+import sys
+import unittest
+from unittest import mock
+
+from awstin.apigateway.websocket import Websocket
+from awstin.apigateway.websocket import __name__ as WS_NAME
+from awstin.dynamodb import DynamoModel, Key
+from awstin.dynamodb.testing import temporary_dynamodb_table
+from awstin.tracing import OpenTelemetryTracer, Tracer, get_tracer, set_tracer, trace
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes):
+        span = {"name": name, "attributes": dict(attributes), "finished": False}
+        self.spans.append(span)
+        return span
+
+    def finish_span(self, span, attributes=None, error=None):
+        span["attributes"].update(attributes or {})
+        span["error"] = error
+        span["finished"] = True
+
+
+class TracedModel(DynamoModel):
+    _table_name_ = "traced"
+
+    pkey = Key()
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.tracer = RecordingTracer()
+        set_tracer(self.tracer)
+        self.addCleanup(set_tracer, None)
+
+    def test_set_tracer(self):
+        self.assertIs(get_tracer(), self.tracer)
+
+        set_tracer(None)
+        self.assertIs(type(get_tracer()), Tracer)
+
+    def test_trace(self):
+        with trace("a.span", attr="value") as span:
+            span.set_attribute("result", 5)
+
+        (span,) = self.tracer.spans
+        self.assertEqual(span["name"], "a.span")
+        self.assertEqual(span["attributes"], {"attr": "value", "result": 5})
+        self.assertTrue(span["finished"])
+        self.assertIsNone(span["error"])
+
+    def test_trace_error(self):
+        error = ValueError("oops")
+        with self.assertRaises(ValueError):
+            with trace("a.span"):
+                raise error
+
+        (span,) = self.tracer.spans
+        self.assertTrue(span["finished"])
+        self.assertIs(span["error"], error)
+
+    def test_table_span_per_page(self):
+        with temporary_dynamodb_table(TracedModel, "pkey") as table:
+            pages = [
+                {"Items": [{"pkey": "a"}], "Count": 1, "LastEvaluatedKey": {}},
+                {"Items": [{"pkey": "b"}], "Count": 1, "ScannedCount": 3},
+            ]
+            with mock.patch.object(table._client, "scan", side_effect=pages):
+                self.tracer.spans.clear()
+                items = list(table.scan())
+
+        self.assertEqual(len(items), 2)
+        self.assertEqual(
+            [span["name"] for span in self.tracer.spans],
+            ["dynamodb.scan", "dynamodb.scan"],
+        )
+        last_span = self.tracer.spans[-1]
+        self.assertEqual(last_span["attributes"]["aws.dynamodb.table_name"], "traced")
+        self.assertEqual(last_span["attributes"]["aws.dynamodb.scanned_count"], 3)
+
+    def test_table_operations_traced(self):
+        with temporary_dynamodb_table(TracedModel, "pkey") as table:
+            self.tracer.spans.clear()
+            table.put_item(TracedModel(pkey="a"))
+            table[{"pkey": "a"}]
+            table._dynamodb.list_tables()
+
+        self.assertEqual(
+            [span["name"] for span in self.tracer.spans],
+            ["dynamodb.put_item", "dynamodb.get_item", "dynamodb.list_tables"],
+        )
+
+    def test_websocket_send_traced(self):
+        mock_aws_client = mock.patch(WS_NAME + ".boto3.client")
+        with mock_aws_client:
+            socket = Websocket("endpointurl", stage="dev")
+            socket.send("callbackurl", "message")
+
+        (span,) = self.tracer.spans
+        self.assertEqual(span["name"], "apigateway.post_to_connection")
+        self.assertEqual(
+            span["attributes"]["server.address"], "https://endpointurl/dev"
+        )
+
+    def test_open_telemetry_not_installed(self):
+        with mock.patch.dict(sys.modules, {"opentelemetry": None}):
+            with self.assertRaises(ImportError):
+                OpenTelemetryTracer()
@@ -0,0 +1,172 @@
+import contextlib
+
+
+class Tracer:
+    """
+    Interface for tracing the AWS requests made by awstin.
+
+    awstin starts a span around every AWS request it makes, including one span
+    per page of paginated calls. The base class does nothing; subclass it to
+    forward spans to a tracing system and install it with ``set_tracer``.
+    """
+
+    def start_span(self, name, attributes):
+        """
+        Start a span
+
+        Parameters
+        ----------
+        name : str
+            Span name, e.g. "dynamodb.query"
+        attributes : dict of (str, Any)
+            Attributes known when the request starts
+
+        Returns
+        -------
+        Any
+            A span object, passed back to ``finish_span``
+        """
+        return None
+
+    def finish_span(self, span, attributes=None, error=None):
+        """
+        Finish a span started with ``start_span``
+
+        Parameters
+        ----------
+        span : Any
+            The span returned by ``start_span``
+        attributes : dict of (str, Any), optional
+            Attributes known once the request has completed
+        error : Exception, optional
+            The error raised by the request, if it failed
+        """
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Tracer forwarding spans to OpenTelemetry.
+
+    Requires the ``opentelemetry-api`` package.
+    """
+
+    def __init__(self, tracer=None):
+        """
+        Parameters
+        ----------
+        tracer : opentelemetry.trace.Tracer, optional
+            OpenTelemetry tracer to create spans with. Defaults to the tracer
+            named "awstin" from the global tracer provider.
+
+        Raises
+        ------
+        ImportError
+            If OpenTelemetry is not installed
+        """
+        try:
+            from opentelemetry import context, trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetryTracer requires the opentelemetry-api package"
+            )
+
+        self._context = context
+        self._trace = trace
+        self._tracer = tracer if tracer is not None else trace.get_tracer("awstin")
+
+    def start_span(self, name, attributes):
+        span = self._tracer.start_span(
+            name,
+            kind=self._trace.SpanKind.CLIENT,
+            attributes=_otel_attributes(attributes),
+        )
+        token = self._context.attach(self._trace.set_span_in_context(span))
+        return span, token
+
+    def finish_span(self, span, attributes=None, error=None):
+        span, token = span
+        self._context.detach(token)
+        if attributes:
+            span.set_attributes(_otel_attributes(attributes))
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end()
+
+
+def _otel_attributes(attributes):
+    # OpenTelemetry only accepts primitive attribute values
+    return {
+        key: value
+        for key, value in attributes.items()
+        if isinstance(value, (str, bool, int, float))
+    }
+
+
+_tracer = Tracer()
+
+
+def set_tracer(tracer):
+    """
+    Install the tracer used for all awstin AWS requests
+
+    Parameters
+    ----------
+    tracer : Tracer or None
+        The tracer to use. None restores the default no-op tracer.
+    """
+    global _tracer
+    _tracer = tracer if tracer is not None else Tracer()
+
+
+def get_tracer():
+    """
+    The tracer used for all awstin AWS requests
+
+    Returns
+    -------
+    Tracer
+    """
+    return _tracer
+
+
+class _SpanScope:
+    """
+    Handle to an in-progress span, allowing attributes to be added before the
+    span finishes
+    """
+
+    def __init__(self):
+        self.attributes = {}
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+@contextlib.contextmanager
+def trace(name, **attributes):
+    """
+    Context manager tracing an AWS request with the installed tracer
+
+    Parameters
+    ----------
+    name : str
+        Span name
+    **attributes
+        Attributes known when the request starts
+
+    Yields
+    ------
+    scope
+        Object with a ``set_attribute(key, value)`` method for attributes
+        known once the request completes
+    """
+    tracer = _tracer
+    span = tracer.start_span(name, attributes)
+    scope = _SpanScope()
+    try:
+        yield scope
+    except BaseException as e:
+        tracer.finish_span(span, attributes=scope.attributes, error=e)
+        raise
+    tracer.finish_span(span, attributes=scope.attributes)
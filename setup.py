@@ -28,4 +28,7 @@ setuptools.setup(
         "boto3",
         "pyyaml",
     ],
+    extras_require={
+        "opentelemetry": ["opentelemetry-api"],
+    },
 )